@@ -1,6 +1,40 @@
 from ._version import __version__  # NOQA
-from .context import acontext  # NOQA
-from .coroutine import just, wait_all, wait_any  # NOQA
-from .event_loop import dispatch, dispatch_coroutine  # NOQA
+from .admission import AdmissionController, OverloadedError  # NOQA
+from .context import TaskScope, TaskScopeError, acontext  # NOQA
+from .coroutine import (  # NOQA
+    amap,
+    as_completed,
+    just,
+    resolved,
+    wait_all,
+    wait_all_partial,
+    wait_any,
+)
+from .event_loop import (  # NOQA
+    LoopBalancer,
+    current_deadline,
+    dispatch,
+    dispatch_balanced,
+    dispatch_coroutine,
+)
+from .hedge import LatencyTracker, hedge, hedged  # NOQA
+from .memoize import AsyncCache, CacheStats, memoize  # NOQA
+from .monitor import LatencyHistogram, LoopMonitor, LoopStats  # NOQA
+from .pool import (  # NOQA
+    ConsistentHashPlacement,
+    EventLoopThreadCache,
+    EventLoopThreadPool,
+    KeyHashPlacement,
+    LeastPendingPlacement,
+    PlacementPolicy,
+    PowerOfTwoChoicesPlacement,
+    RoundRobinPlacement,
+    run_coroutine_in_cached_thread,
+)
+from .process import ProcessLoopPool, dispatch_process  # NOQA
+from .ratelimit import RateLimiter, SlidingWindow, TokenBucket, rate_limited  # NOQA
+from .retry import RetryBudget, retry  # NOQA
 from .shield import shield  # NOQA
-from .thread import EventLoopThread, run_coroutine_in_thread  # NOQA
+from .singleflight import SingleFlight, singleflight  # NOQA
+from .thread import EventLoopThread, ShutdownResult, run_coroutine_in_thread  # NOQA
+from .tracing import HopTiming, set_hop_observer  # NOQA
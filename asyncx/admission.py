@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import concurrent.futures
+import threading
+from typing import Any, Callable, Deque, Dict, List, Tuple
+
+OVERFLOW_POLICIES = ("block", "await", "reject", "shed_oldest")
+
+
+class OverloadedError(RuntimeError):
+    """Raised when a submission is rejected because too many coroutines are in flight."""
+
+
+class AdmissionController:
+    """A thread-safe limit on the number of in-flight submissions.
+
+    A slot is acquired before a coroutine is submitted and released when its
+    :class:`concurrent.futures.Future` is done. When all slots are in use,
+    ``overflow`` decides what happens to a new submission:
+
+    * ``"block"``: the submitting thread blocks until a slot is released.
+    * ``"await"``: :meth:`EventLoopThread.run_coroutine` waits for a slot
+      asynchronously in the caller's event loop. Synchronous submissions block.
+    * ``"reject"``: :class:`OverloadedError` is raised immediately.
+    * ``"shed_oldest"``: the oldest in-flight submission is cancelled and its slot
+      is handed to the new one.
+
+    Slots are handed to waiters in FIFO order, and a batch of submissions is
+    admitted only when all of its slots are free.
+    """
+
+    def __init__(self, max_in_flight: int, overflow: str = "block") -> None:
+        """Creates a new controller.
+
+        Args:
+            max_in_flight:
+                The maximum number of in-flight submissions.
+            overflow:
+                One of ``"block"``, ``"await"``, ``"reject"`` or ``"shed_oldest"``.
+        """
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be positive")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}")
+
+        self._max_in_flight = max_in_flight
+        self._overflow = overflow
+
+        self._lock = threading.Lock()
+        self._slots = 0
+        # Admitted futures in admission order, used to shed the oldest one
+        self._in_flight: Dict[concurrent.futures.Future[Any], None] = {}
+        # Pairs of the number of slots and a callback to grant them
+        self._waiters: Deque[Tuple[int, Callable[[], None]]] = collections.deque()
+
+    @property
+    def max_in_flight(self) -> int:
+        """The maximum number of in-flight submissions."""
+        return self._max_in_flight
+
+    @property
+    def overflow(self) -> str:
+        """The overflow policy."""
+        return self._overflow
+
+    @property
+    def in_flight(self) -> int:
+        """The number of slots in use."""
+        with self._lock:
+            return self._slots
+
+    @property
+    def waiting(self) -> int:
+        """The number of submitters waiting for a slot."""
+        with self._lock:
+            return len(self._waiters)
+
+    def acquire(self, count: int = 1, *, blocking: bool = True) -> List[Any]:
+        """Acquire ``count`` slots according to the overflow policy.
+
+        The slots are acquired all at once, so a batch never holds some slots while
+        waiting for the others.
+
+        Args:
+            count:
+                The number of slots. It must not exceed ``max_in_flight``.
+            blocking:
+                If ``False`` is specified, ``"block"`` and ``"await"`` policies raise
+                :class:`OverloadedError` instead of blocking.
+
+        Returns:
+            Futures evicted by the ``"shed_oldest"`` policy. The caller must cancel them
+            after the new submissions are registered.
+        """
+        if count > self._max_in_flight:
+            raise ValueError("count must not exceed max_in_flight")
+
+        with self._lock:
+            free = self._max_in_flight - self._slots
+            if len(self._waiters) == 0 and free >= count:
+                self._slots += count
+                return []
+            if self._overflow == "shed_oldest" and len(self._in_flight) >= count - free:
+                # Slots of the victims are handed to the new submissions
+                taken = min(free, count)
+                self._slots += taken
+                victims: List[Any] = []
+                for _ in range(count - taken):
+                    victim = next(iter(self._in_flight))
+                    del self._in_flight[victim]
+                    victims.append(victim)
+                return victims
+            if self._overflow == "reject" or not blocking:
+                raise OverloadedError(
+                    f"{self._max_in_flight} coroutines are already in flight"
+                )
+
+            waiter = threading.Lock()
+            waiter.acquire()
+            entry = (count, waiter.release)
+            self._waiters.append(entry)
+
+        try:
+            # The slots are handed over by release()
+            waiter.acquire()
+        except BaseException:
+            with self._lock:
+                granted = entry not in self._waiters
+                if not granted:
+                    self._waiters.remove(entry)
+                    grants = self._pop_grants()
+            if granted:
+                self.release(count)
+            else:
+                for grant in grants:
+                    grant()
+            raise
+
+        return []
+
+    async def acquire_async(self) -> List[Any]:
+        """Acquire a slot without blocking the running event loop.
+
+        Unlike :meth:`acquire`, ``"block"`` and ``"await"`` policies wait asynchronously.
+
+        Returns:
+            Futures evicted by the ``"shed_oldest"`` policy.
+        """
+        if self._overflow in ("reject", "shed_oldest"):
+            return self.acquire(blocking=False)
+
+        loop = asyncio.get_running_loop()
+        granted: asyncio.Future[None] = loop.create_future()
+
+        def on_granted() -> None:
+            if granted.cancelled():
+                # Pass the slot on to the next waiter
+                self.release()
+            else:
+                granted.set_result(None)
+
+        def grant() -> None:
+            try:
+                loop.call_soon_threadsafe(on_granted)
+            except RuntimeError:
+                # The waiting loop is already closed
+                self.release()
+
+        with self._lock:
+            if len(self._waiters) == 0 and self._slots < self._max_in_flight:
+                self._slots += 1
+                return []
+            self._waiters.append((1, grant))
+
+        await granted
+        return []
+
+    def rollback(self, count: int, victims: List[Any]) -> None:
+        """Give back ``count`` slots acquired by :meth:`acquire` that are not used.
+
+        Futures in ``victims`` are put back as in-flight submissions.
+        """
+        for victim in victims:
+            self.register(victim)
+        self.release(count - len(victims))
+
+    def register(self, future: concurrent.futures.Future[Any]) -> None:
+        """Associate an acquired slot with ``future`` to be released on completion."""
+        with self._lock:
+            self._in_flight[future] = None
+        future.add_done_callback(self._on_done)
+
+    def release(self, count: int = 1) -> None:
+        """Release ``count`` slots that are not associated with futures."""
+        with self._lock:
+            self._slots -= count
+            grants = self._pop_grants()
+        for grant in grants:
+            grant()
+
+    def _pop_grants(self) -> List[Callable[[], None]]:
+        # It must be called with the lock held. Waiters are granted in FIFO order,
+        # so a large batch is not starved by smaller ones behind it.
+        grants: List[Callable[[], None]] = []
+        while len(self._waiters) > 0:
+            count, grant = self._waiters[0]
+            if self._slots + count > self._max_in_flight:
+                break
+            self._waiters.popleft()
+            self._slots += count
+            grants.append(grant)
+        return grants
+
+    def _on_done(self, future: concurrent.futures.Future[Any]) -> None:
+        with self._lock:
+            if future not in self._in_flight:
+                # The slot has been handed to another submission by shedding
+                return
+            del self._in_flight[future]
+        self.release()
@@ -2,7 +2,21 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
-from typing import Any, AsyncContextManager, AsyncIterator, Awaitable, TypeVar, overload
+from types import TracebackType
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncIterator,
+    Awaitable,
+    Coroutine,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Type,
+    TypeVar,
+    overload,
+)
 
 TReturn = TypeVar("TReturn")
 TFuture = TypeVar("TFuture", bound="asyncio.Future[Any]")
@@ -48,3 +62,169 @@ async def acontext(
         yield future
     finally:
         future.cancel()
+
+
+class TaskScopeError(Exception):
+    """Raised from :class:`TaskScope` when some of its tasks failed."""
+
+    def __init__(self, exceptions: Sequence[BaseException]) -> None:
+        super().__init__(f"{len(exceptions)} task(s) failed: {exceptions[0]!r}")
+        self.exceptions: List[BaseException] = list(exceptions)
+        """Exceptions raised by the tasks in the order they failed."""
+
+
+class TaskScope:
+    """An async context manager that owns tasks spawned inside its block.
+
+    On exit, the scope waits for all of its tasks. If the block raises an exception
+    or the scope is cancelled, the tasks are cancelled instead, and the scope waits
+    up to ``cancel_timeout`` seconds for them to finish their cleanup. Unlike
+    :func:`acontext`, no task is left running or cancelling after the scope has
+    exited unless the deadline expires.
+
+    When a task fails, the other tasks are cancelled, and :class:`TaskScopeError`
+    with the exceptions of the failed tasks is raised on exit. It works on Python
+    versions without :class:`asyncio.TaskGroup`.
+
+    Example:
+        >>> async with asyncx.TaskScope(limit=10) as scope:
+        ...     tasks = [scope.spawn(fetch(url)) for url in urls]
+        >>> results = [t.result() for t in tasks]
+    """
+
+    def __init__(
+        self,
+        *,
+        limit: Optional[int] = None,
+        cancel_timeout: Optional[float] = None,
+        cancel_on_error: bool = True,
+    ) -> None:
+        """Creates a new scope.
+
+        Args:
+            limit:
+                The maximum number of tasks running at the same time. Spawned tasks
+                beyond the limit wait for a running one to finish. If :obj:`None` is
+                specified, the number is unbounded.
+            cancel_timeout:
+                Seconds to wait for cancelled tasks to finish. If :obj:`None` is
+                specified, the scope waits without a deadline.
+            cancel_on_error:
+                If ``False`` is specified, a failed task does not cancel the others.
+        """
+        if limit is not None and limit < 1:
+            raise ValueError("limit must be positive")
+
+        self._limit = limit
+        self._cancel_timeout = cancel_timeout
+        self._cancel_on_error = cancel_on_error
+
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        # Unfinished tasks in spawn order. Finished ones are dropped so that
+        # a long-lived scope does not keep them.
+        self._tasks: Dict[asyncio.Task[Any], None] = {}
+        self._exceptions: List[BaseException] = []
+        self._entered = False
+        self._closed = False
+
+    @property
+    def tasks(self) -> List[asyncio.Task[Any]]:
+        """Unfinished tasks spawned in the scope.
+
+        Tasks that did not finish until ``cancel_timeout`` expired are still pending
+        after the scope has exited.
+        """
+        return [t for t in self._tasks if not t.done()]
+
+    @property
+    def exceptions(self) -> List[BaseException]:
+        """Exceptions raised by the tasks in the order they failed."""
+        return list(self._exceptions)
+
+    def spawn(self, awaitable: Awaitable[TReturn]) -> asyncio.Task[TReturn]:
+        """Start a task owned by the scope.
+
+        Args:
+            awaitable: An awaitable object to run as a task.
+
+        Returns:
+            An :class:`asyncio.Task` object of ``awaitable``.
+        """
+        if not self._entered or self._closed:
+            if isinstance(awaitable, Coroutine):
+                awaitable.close()
+            raise RuntimeError("TaskScope is not active")
+
+        task = asyncio.ensure_future(self._run(awaitable))
+        self._tasks[task] = None
+        task.add_done_callback(self._on_done)
+        return task
+
+    async def _run(self, awaitable: Awaitable[TReturn]) -> TReturn:
+        if self._semaphore is None:
+            return await awaitable
+
+        try:
+            await self._semaphore.acquire()
+        except BaseException:
+            # Cancelled before it started
+            if isinstance(awaitable, Coroutine):
+                awaitable.close()
+            raise
+        try:
+            return await awaitable
+        finally:
+            self._semaphore.release()
+
+    def _on_done(self, task: asyncio.Task[Any]) -> None:
+        self._tasks.pop(task, None)
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is None:
+            return
+        self._exceptions.append(exc)
+        if self._cancel_on_error:
+            for t in list(self._tasks):
+                t.cancel()
+
+    async def __aenter__(self) -> TaskScope:
+        if self._entered:
+            raise RuntimeError("TaskScope cannot be reused")
+        self._entered = True
+        if self._limit is not None:
+            self._semaphore = asyncio.Semaphore(self._limit)
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        try:
+            if exc is None:
+                try:
+                    # Tasks spawned by other tasks are waited as well
+                    pending = self.tasks
+                    while len(pending) > 0:
+                        await asyncio.wait(pending)
+                        pending = self.tasks
+                except asyncio.CancelledError:
+                    await self._cancel_all()
+                    raise
+            else:
+                await self._cancel_all()
+        finally:
+            self._closed = True
+
+        if exc is None and len(self._exceptions) > 0:
+            raise TaskScopeError(self._exceptions) from self._exceptions[0]
+
+    async def _cancel_all(self) -> None:
+        pending = self.tasks
+        if len(pending) == 0:
+            return
+        for t in pending:
+            t.cancel()
+        await asyncio.wait(pending, timeout=self._cancel_timeout)
@@ -1,6 +1,28 @@
+from __future__ import annotations
+
 import asyncio
-from typing import Any, Awaitable, Sequence, TypeVar
+import collections
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+)
 
+TInput = TypeVar("TInput")
 TReturn = TypeVar("TReturn")
 
 
@@ -21,17 +43,70 @@ async def just(ret: TReturn) -> TReturn:
     return ret
 
 
-async def wait_any(*awaitables: Awaitable[Any]) -> Awaitable[Any]:
+def resolved(
+    ret: TReturn, *, loop: Optional[asyncio.AbstractEventLoop] = None
+) -> asyncio.Future[TReturn]:
+    """Creates a future that is already resolved with a specified result.
+
+    It is meant as an input of :func:`wait_any`, :func:`wait_all` or
+    :func:`asyncio.gather`, which wrap coroutines made by :func:`just` in tasks but
+    take futures as they are. :func:`wait_any` and :func:`wait_all` also return
+    without yielding to the event loop when their inputs are finished futures.
+    To await a value directly, :func:`just` is cheaper.
+
+    Example:
+        >>> await asyncx.resolved(42)
+        42
+
+    Args:
+        ret: The result of a future.
+        loop:
+            The event loop of a future. If :obj:`None` is specified,
+            the running event loop is used.
+
+    Returns:
+        A :class:`asyncio.Future` object resolved with ``ret``.
+    """
+
+    if loop is None:
+        loop = asyncio.get_running_loop()
+    future: asyncio.Future[TReturn] = loop.create_future()
+    future.set_result(ret)
+    return future
+
+
+def _is_done(awaitable: Awaitable[Any]) -> bool:
+    # isfuture() does not narrow the type for the pinned mypy
+    return asyncio.isfuture(awaitable) and cast(Any, awaitable).done()
+
+
+async def wait_any(
+    *awaitables: Awaitable[Any],
+    cancel_pending: bool = False,
+) -> Awaitable[Any]:
     """Creates a coroutine that waits for any of given awaitables to be completed.
 
+    If several awaitables are completed at the same time, the first one in the argument
+    order is returned. If any of them is an already finished future, it is returned
+    without yielding to the event loop.
+
     Example:
         >>> coro1 = asyncio.create_task(asyncio.sleep(1))
         >>> coro2 = asyncio.create_task(asyncio.sleep(2))
         >>> await asyncx.wait_any(coro1, coro2) is coro1
         True
 
+    Example:
+        >>> winner = await asyncx.wait_any(
+        ...     query(replica1), query(replica2), cancel_pending=True
+        ... )
+
     Args:
         awaitables: Awaitable objects to wait.
+        cancel_pending:
+            If ``True`` is specified, the coroutine races the awaitables: the others
+            are cancelled and awaited before returning the first finished one.
+            They are also cancelled if the coroutine itself is cancelled.
 
     Returns:
         A :class:`Coroutine` object that returns first finished :class:`asyncio.Future` object.
@@ -39,17 +114,45 @@ async def wait_any(*awaitables: Awaitable[Any]) -> Awaitable[Any]:
 
     if len(awaitables) == 0:
         raise ValueError("awaitables cannot be empty")
-    completed, pending = await asyncio.wait(
-        awaitables,
-        return_when=asyncio.FIRST_COMPLETED,
-    )
+    futures = [asyncio.ensure_future(a) for a in awaitables]
+    winner = next((f for f in futures if f.done()), None)
+    if winner is not None:
+        # Return an already finished future without yielding to the event loop
+        if cancel_pending:
+            await _cancel_and_wait(futures)
+        return winner
+
+    try:
+        completed, pending = await asyncio.wait(
+            futures,
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+    except asyncio.CancelledError:
+        if cancel_pending:
+            await _cancel_and_wait(futures)
+        raise
+
     assert len(completed) >= 1
-    return list(completed)[0]
+    if cancel_pending and len(pending) > 0:
+        await _cancel_and_wait(pending)
+    return next(f for f in futures if f in completed)
+
+
+async def _cancel_and_wait(futures: Iterable[asyncio.Future[Any]]) -> None:
+    pending = [f for f in futures if not f.done()]
+    if len(pending) == 0:
+        return
+    for f in pending:
+        f.cancel()
+    await asyncio.wait(pending)
 
 
 async def wait_all(*awaitables: Awaitable[Any]) -> Sequence[Awaitable[Any]]:
     """Creates a coroutine that waits for all of given awaitables to be completed.
 
+    If all of them are already finished futures, they are returned without yielding
+    to the event loop.
+
     Example:
         >>> coro1 = asyncio.create_task(asyncio.sleep(1))
         >>> coro2 = asyncio.create_task(asyncio.sleep(2))
@@ -67,9 +170,308 @@ async def wait_all(*awaitables: Awaitable[Any]) -> Sequence[Awaitable[Any]]:
 
     if len(awaitables) == 0:
         raise ValueError("awaitables cannot be empty")
+    if all(_is_done(a) for a in awaitables):
+        # Skip scheduling a wait when every input is already finished
+        return list(dict.fromkeys(cast(Iterable[asyncio.Future[Any]], awaitables)))
+
     completed, pending = await asyncio.wait(
-        awaitables,
+        [asyncio.ensure_future(a) for a in awaitables],
         return_when=asyncio.ALL_COMPLETED,
     )
     assert len(pending) == 0
     return list(completed)
+
+
+async def wait_all_partial(
+    *awaitables: Awaitable[Any],
+    timeout: Optional[float] = None,
+    cancel_pending: bool = False,
+    first_exception: bool = False,
+) -> Tuple[List[asyncio.Future[Any]], List[asyncio.Future[Any]]]:
+    """Creates a coroutine that waits for given awaitables within a deadline.
+
+    Unlike :func:`wait_all`, the coroutine returns partial results when ``timeout``
+    expires or an awaitable fails with ``first_exception``, so a scatter-gather
+    caller can answer within a fixed latency budget.
+
+    Example:
+        >>> done, pending = await asyncx.wait_all_partial(
+        ...     *[query(shard) for shard in shards],
+        ...     timeout=0.1,
+        ...     cancel_pending=True,
+        ... )
+        >>> results = [f.result() for f in done if f.exception() is None]
+
+    Args:
+        awaitables: Awaitable objects to wait.
+        timeout:
+            Seconds to wait for the awaitables. If :obj:`None` is specified,
+            the coroutine waits without a deadline.
+        cancel_pending:
+            If ``True`` is specified, the awaitables that are not finished yet are
+            cancelled and awaited before returning. They are also cancelled
+            if the coroutine itself is cancelled.
+        first_exception:
+            If ``True`` is specified, the coroutine returns as soon as any of
+            the awaitables raises an exception.
+
+    Returns:
+        A :class:`Coroutine` object that returns a tuple of completed and pending
+        :class:`asyncio.Future` objects, each in the argument order.
+        The pending futures are cancelled if ``cancel_pending`` is ``True``.
+    """
+
+    if len(awaitables) == 0:
+        raise ValueError("awaitables cannot be empty")
+    futures: List[asyncio.Future[Any]] = [asyncio.ensure_future(a) for a in awaitables]
+    if all(f.done() for f in futures):
+        return futures, []
+
+    try:
+        completed, _ = await asyncio.wait(
+            futures,
+            timeout=timeout,
+            return_when=(
+                asyncio.FIRST_EXCEPTION if first_exception else asyncio.ALL_COMPLETED
+            ),
+        )
+    except asyncio.CancelledError:
+        if cancel_pending:
+            await _cancel_and_wait(futures)
+        raise
+
+    done = [f for f in futures if f in completed]
+    pending = [f for f in futures if f not in completed]
+    if cancel_pending and len(pending) > 0:
+        await _cancel_and_wait(pending)
+    return done, pending
+
+
+async def as_completed(
+    *awaitables: Awaitable[Any],
+    timeout: Optional[float] = None,
+    item_timeout: Optional[float] = None,
+) -> AsyncGenerator[asyncio.Future[Any], None]:
+    """Creates an async iterator that yields given awaitables in completion order.
+
+    Each awaitable is wrapped in a future with a done callback registered only once,
+    so consuming ``n`` results costs ``O(n)`` instead of calling :func:`wait_any`
+    repeatedly. When the iterator is closed, the futures that are not finished yet are
+    cancelled. It is closed when a timeout occurs, but a consumer that stops early must
+    call ``aclose()`` to cancel them immediately rather than when the iterator is
+    garbage collected.
+
+    Example:
+        >>> async for f in asyncx.as_completed(
+        ...     asyncio.sleep(0.2, "slow"), asyncio.sleep(0.1, "fast")
+        ... ):
+        ...     print(await f)
+        fast
+        slow
+
+    Args:
+        awaitables: Awaitable objects to wait.
+        timeout:
+            Seconds to wait for all of the awaitables. If :obj:`None` is specified,
+            the iterator waits without a deadline.
+        item_timeout:
+            Seconds to wait for each next result. If :obj:`None` is specified,
+            the iterator waits without a per-item timeout.
+
+    Returns:
+        An :class:`AsyncGenerator` object that yields finished
+        :class:`asyncio.Future` objects.
+
+    Raises:
+        asyncio.TimeoutError:
+            If ``timeout`` or ``item_timeout`` expires.
+    """
+
+    if len(awaitables) == 0:
+        raise ValueError("awaitables cannot be empty")
+
+    loop = asyncio.get_running_loop()
+    futures = list(dict.fromkeys(asyncio.ensure_future(a) for a in awaitables))
+    finished: Deque[asyncio.Future[Any]] = collections.deque()
+    waiter: Optional[asyncio.Future[None]] = None
+
+    def on_done(future: asyncio.Future[Any]) -> None:
+        finished.append(future)
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    def on_timeout(target: asyncio.Future[None]) -> None:
+        if not target.done():
+            target.set_exception(asyncio.TimeoutError())
+
+    for future in futures:
+        future.add_done_callback(on_done)
+
+    deadline = None if timeout is None else loop.time() + timeout
+    try:
+        for _ in range(len(futures)):
+            if len(finished) == 0:
+                wait_timeout = item_timeout
+                if deadline is not None:
+                    remaining = deadline - loop.time()
+                    if wait_timeout is None or remaining < wait_timeout:
+                        wait_timeout = remaining
+
+                waiter = loop.create_future()
+                handle = None
+                if wait_timeout is not None:
+                    handle = loop.call_later(max(wait_timeout, 0), on_timeout, waiter)
+                try:
+                    await waiter
+                finally:
+                    waiter = None
+                    if handle is not None:
+                        handle.cancel()
+
+            yield finished.popleft()
+    finally:
+        for future in futures:
+            future.remove_done_callback(on_done)
+            if not future.done():
+                future.cancel()
+
+
+async def amap(
+    func: Callable[[TInput], Awaitable[TReturn]],
+    iterable: Union[Iterable[TInput], AsyncIterable[TInput]],
+    *,
+    limit: int,
+    ordered: bool = True,
+) -> AsyncGenerator[TReturn, None]:
+    """Creates an async iterator that applies an async function to inputs concurrently.
+
+    Inputs are pulled lazily so that at most ``limit`` calls are running or waiting to be
+    yielded at a time. Therefore the memory usage is proportional to ``limit`` rather
+    than the number of inputs. If a call raises an exception, the exception is raised
+    from the iterator when its result would be yielded, and the other calls are
+    cancelled. The calls are also cancelled when the iterator is closed, so a consumer
+    that stops early should call ``aclose()`` to cancel them immediately.
+
+    Example:
+        >>> async def double(x: int) -> int:
+        ...     await asyncio.sleep(0.1)
+        ...     return x * 2
+        ...
+        >>> [x async for x in asyncx.amap(double, range(5), limit=2)]
+        [0, 2, 4, 6, 8]
+
+    Args:
+        func: An async function to apply.
+        iterable: An iterable or an async iterable of inputs.
+        limit: The maximum number of concurrent calls.
+        ordered:
+            If ``True`` is specified, results are yielded in input order.
+            A result that finishes early is buffered until the preceding ones are
+            yielded, and counts towards ``limit``. Otherwise, results are yielded in
+            completion order.
+
+    Returns:
+        An :class:`AsyncGenerator` object that yields results of ``func``.
+    """
+
+    if limit < 1:
+        raise ValueError("limit must be positive")
+
+    async def pull() -> Tuple[bool, Optional[TInput]]:
+        if async_iterator is not None:
+            try:
+                return True, await async_iterator.__anext__()
+            except StopAsyncIteration:
+                return False, None
+        assert sync_iterator is not None
+        try:
+            return True, next(sync_iterator)
+        except StopIteration:
+            return False, None
+
+    async_iterator: Optional[AsyncIterator[TInput]] = None
+    sync_iterator: Optional[Iterator[TInput]] = None
+    if isinstance(iterable, AsyncIterable):
+        async_iterator = iterable.__aiter__()
+    else:
+        sync_iterator = iter(iterable)
+
+    impl = _amap_ordered if ordered else _amap_unordered
+    results = impl(func, pull, limit)
+    try:
+        async for result in results:
+            yield result
+    finally:
+        # Close the inner generator explicitly to cancel pending calls immediately
+        await results.aclose()
+
+
+async def _amap_ordered(
+    func: Callable[[TInput], Awaitable[TReturn]],
+    pull: Callable[[], Awaitable[Tuple[bool, Optional[TInput]]]],
+    limit: int,
+) -> AsyncGenerator[TReturn, None]:
+    window: Deque[asyncio.Future[TReturn]] = collections.deque()
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(window) < limit:
+                ok, item = await pull()
+                if not ok:
+                    exhausted = True
+                    break
+                window.append(asyncio.ensure_future(func(cast(TInput, item))))
+
+            if len(window) == 0:
+                return
+
+            result = await window[0]
+            window.popleft()
+            yield result
+    finally:
+        for future in window:
+            future.cancel()
+
+
+async def _amap_unordered(
+    func: Callable[[TInput], Awaitable[TReturn]],
+    pull: Callable[[], Awaitable[Tuple[bool, Optional[TInput]]]],
+    limit: int,
+) -> AsyncGenerator[TReturn, None]:
+    loop = asyncio.get_running_loop()
+    running: Set[asyncio.Future[TReturn]] = set()
+    finished: Deque[asyncio.Future[TReturn]] = collections.deque()
+    waiter: Optional[asyncio.Future[None]] = None
+    exhausted = False
+
+    def on_done(future: asyncio.Future[TReturn]) -> None:
+        running.discard(future)
+        finished.append(future)
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    try:
+        while True:
+            while not exhausted and len(running) + len(finished) < limit:
+                ok, item = await pull()
+                if not ok:
+                    exhausted = True
+                    break
+                task = asyncio.ensure_future(func(cast(TInput, item)))
+                running.add(task)
+                task.add_done_callback(on_done)
+
+            if len(finished) == 0:
+                if len(running) == 0:
+                    return
+                waiter = loop.create_future()
+                try:
+                    await waiter
+                finally:
+                    waiter = None
+
+            yield finished.popleft().result()
+    finally:
+        for future in running:
+            future.remove_done_callback(on_done)
+            future.cancel()
@@ -1,12 +1,20 @@
 import asyncio
+import contextvars
 import functools
-from typing import Any, Callable, Coroutine, cast
+import threading
+import time
+from typing import Any, Callable, Coroutine, Hashable, List, Optional, Sequence, cast
 
 from ._types import EventLoopSelector, TAsyncCallable, TReturn
+from .pool import LeastPendingPlacement, PlacementPolicy
+from .tracing import _begin_hop
 
 
 def dispatch(
     loop_selector: EventLoopSelector,
+    *,
+    cache: bool = False,
+    timeout: Optional[float] = None,
 ) -> Callable[[TAsyncCallable], TAsyncCallable]:
     """A decorator to dispatch an async function to another event loop.
 
@@ -24,27 +32,54 @@ def dispatch(
         >>> current != dispatched
         True
 
+    Example:
+        >>> @asyncx.dispatch(thread.get_loop, cache=True)
+        ... async def handler(request: bytes) -> bytes:
+        ...     ...
+
     Args:
         loop_selector:
             Target event loop to which a coroutine is dispatched.
             The value must be either an event loop or a callable that returns
             an event loop.
+        cache:
+            If ``True`` is specified, a callable ``loop_selector`` is called only
+            when no event loop is cached or the cached one is closed or not running,
+            instead of on every call.
+        timeout:
+            Seconds to wait for each call. See :func:`dispatch_coroutine`.
     """
 
     def deco(func: TAsyncCallable) -> TAsyncCallable:
+        cached: Optional[asyncio.AbstractEventLoop] = None
+
+        def select() -> asyncio.AbstractEventLoop:
+            nonlocal cached
+            if not callable(loop_selector):
+                return loop_selector
+            if not cache:
+                return loop_selector()
+
+            target_loop = cached
+            if (
+                target_loop is None
+                or target_loop.is_closed()
+                or not target_loop.is_running()
+            ):
+                target_loop = cached = loop_selector()
+            return target_loop
+
         @functools.wraps(func)
         async def wrapper(*args: Any, **kwargs: Any) -> TReturn:
-            target_loop: asyncio.AbstractEventLoop
-            if callable(loop_selector):
-                target_loop = loop_selector()
-            else:
-                target_loop = loop_selector
-
-            coro = func(*args, **kwargs)
-            return await dispatch_coroutine(
-                coro,
-                target_loop=target_loop,
-            )
+            target_loop = select()
+            caller_loop = asyncio.get_running_loop()
+            deadline = _resolve_deadline(timeout)
+            if target_loop is caller_loop:
+                if deadline is None:
+                    return cast(TReturn, await func(*args, **kwargs))
+                return await _run_until(func(*args, **kwargs), deadline)
+
+            return await _hop(func(*args, **kwargs), target_loop, caller_loop, deadline)
 
         return cast(TAsyncCallable, wrapper)
 
@@ -54,9 +89,20 @@ def dispatch(
 async def dispatch_coroutine(
     coro: Coroutine[Any, Any, TReturn],
     target_loop: asyncio.AbstractEventLoop,
+    *,
+    timeout: Optional[float] = None,
 ) -> TReturn:
     """Execute the specified coroutine on the specified event loop.
 
+    A deadline is carried across event loops. If ``timeout`` is specified or
+    the caller itself runs under a deadline of an outer dispatch, ``coro`` runs
+    under the earlier deadline, which is available with :func:`current_deadline` and
+    forwarded to further dispatches from ``coro``. When the deadline expires, both
+    ``coro`` and the caller are cancelled and :class:`asyncio.TimeoutError` is raised.
+
+    Cancellation of the caller cancels ``coro``, and cancellation of ``coro`` on
+    the target loop cancels the caller.
+
     Example:
         >>> async def foo() -> None:
         ...     return threading.get_ident()
@@ -73,10 +119,194 @@ async def dispatch_coroutine(
             A coroutine to be dispatched.
         target_loop:
             An event loop to execute the ``coro``.
+        timeout:
+            Seconds to wait for ``coro``. If :obj:`None` is specified, only
+            the deadline of the caller applies.
     """
     caller_loop = asyncio.get_running_loop()
-    if target_loop == caller_loop:
-        return await coro
+    deadline = _resolve_deadline(timeout)
+    if target_loop is caller_loop:
+        if deadline is None:
+            return await coro
+        return await _run_until(coro, deadline)
+
+    return await _hop(coro, target_loop, caller_loop, deadline)
+
+
+_deadline: "contextvars.ContextVar[Optional[float]]" = contextvars.ContextVar(
+    "asyncx_deadline", default=None
+)
+
+
+def current_deadline() -> Optional[float]:
+    """Returns the deadline of the running dispatched coroutine.
+
+    Example:
+        >>> @asyncx.dispatch(thread.get_loop, timeout=1.0)
+        ... async def handler() -> None:
+        ...     budget = asyncx.current_deadline() - time.monotonic()
+
+    Returns:
+        The deadline in :func:`time.monotonic` seconds, or :obj:`None` if the
+        coroutine is not dispatched with a timeout.
+    """
+    return _deadline.get()
+
+
+def _resolve_deadline(timeout: Optional[float]) -> Optional[float]:
+    deadline = _deadline.get()
+    if timeout is not None:
+        own = time.monotonic() + timeout
+        if deadline is None or own < deadline:
+            deadline = own
+    return deadline
+
+
+async def _hop(
+    coro: Coroutine[Any, Any, TReturn],
+    target_loop: asyncio.AbstractEventLoop,
+    caller_loop: asyncio.AbstractEventLoop,
+    deadline: Optional[float],
+) -> TReturn:
+    hop = _begin_hop(coro)
+    if hop is not None:
+        coro = hop.run(coro)
+    if deadline is not None:
+        coro = _run_until(coro, deadline)
 
     f = asyncio.run_coroutine_threadsafe(coro, target_loop)
-    return await asyncio.wrap_future(f, loop=caller_loop)
+    try:
+        if deadline is None:
+            return await asyncio.wrap_future(f, loop=caller_loop)
+        # The caller also stops waiting in case the target loop is too busy to time out
+        return await asyncio.wait_for(
+            asyncio.wrap_future(f, loop=caller_loop), deadline - time.monotonic()
+        )
+    finally:
+        if hop is not None:
+            hop.report()
+
+
+async def _run_until(coro: Coroutine[Any, Any, TReturn], deadline: float) -> TReturn:
+    # wait_for runs the coroutine in a new task, so the deadline set in it does not
+    # leak into the context of the caller
+    return await asyncio.wait_for(
+        _with_deadline(coro, deadline), deadline - time.monotonic()
+    )
+
+
+async def _with_deadline(
+    coro: Coroutine[Any, Any, TReturn], deadline: float
+) -> TReturn:
+    _deadline.set(deadline)
+    return await coro
+
+
+class LoopBalancer:
+    """Spreads dispatched coroutines across several event loops.
+
+    The balancer counts outstanding coroutines dispatched to each event loop by
+    itself, and ``placement`` selects a loop from the counts for each coroutine.
+    It is thread-safe and can be shared by callers on multiple event loops.
+
+    Example:
+        >>> threads = [asyncx.EventLoopThread(start=True) for _ in range(4)]
+        >>> balancer = asyncx.LoopBalancer(
+        ...     [t.get_loop for t in threads],
+        ...     placement=asyncx.PowerOfTwoChoicesPlacement(),
+        ... )
+        >>> await balancer.run_coroutine(fetch(url))
+    """
+
+    def __init__(
+        self,
+        loop_selectors: Sequence[EventLoopSelector],
+        *,
+        placement: Optional[PlacementPolicy] = None,
+    ) -> None:
+        """Creates a new balancer.
+
+        Args:
+            loop_selectors:
+                Target event loops, each of which is either an event loop or a callable
+                that returns an event loop.
+            placement:
+                A :class:`PlacementPolicy` that selects a loop for each coroutine.
+                :class:`LeastPendingPlacement` is used if :obj:`None` is specified.
+        """
+        if len(loop_selectors) == 0:
+            raise ValueError("loop_selectors cannot be empty")
+
+        self._selectors = list(loop_selectors)
+        self._placement = (
+            placement if placement is not None else LeastPendingPlacement()
+        )
+        self._lock = threading.Lock()
+        self._loads = [0] * len(self._selectors)
+
+    @property
+    def loads(self) -> List[int]:
+        """The number of outstanding coroutines of each event loop."""
+        with self._lock:
+            return list(self._loads)
+
+    async def run_coroutine(
+        self,
+        coro: Coroutine[Any, Any, TReturn],
+        *,
+        key: Optional[Hashable] = None,
+    ) -> TReturn:
+        """Execute a coroutine on an event loop selected by the placement policy.
+
+        Args:
+            coro: A coroutine to be dispatched.
+            key: An optional key passed to the placement policy.
+        """
+        with self._lock:
+            index = self._placement.select(self._loads, key)
+            self._loads[index] += 1
+        try:
+            selector = self._selectors[index]
+            target_loop = selector() if callable(selector) else selector
+            return await dispatch_coroutine(coro, target_loop)
+        finally:
+            with self._lock:
+                self._loads[index] -= 1
+
+
+def dispatch_balanced(
+    balancer: LoopBalancer,
+    *,
+    key: Optional[Callable[..., Hashable]] = None,
+) -> Callable[[TAsyncCallable], TAsyncCallable]:
+    """A decorator to dispatch an async function across event loops of a balancer.
+
+    Example:
+        >>> @asyncx.dispatch_balanced(
+        ...     asyncx.LoopBalancer(
+        ...         [t.get_loop for t in threads],
+        ...         placement=asyncx.ConsistentHashPlacement(),
+        ...     ),
+        ...     key=lambda user_id, *_: user_id,
+        ... )
+        ... async def handle(user_id: str, request: bytes) -> bytes:
+        ...     ...
+
+    Args:
+        balancer:
+            A :class:`LoopBalancer` that selects an event loop for each call. It can
+            be shared among functions to balance their calls together.
+        key:
+            A callable that takes the arguments of a call and returns a key for
+            the placement policy, e.g. for :class:`ConsistentHashPlacement`.
+    """
+
+    def deco(func: TAsyncCallable) -> TAsyncCallable:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            k = key(*args, **kwargs) if key is not None else None
+            return await balancer.run_coroutine(func(*args, **kwargs), key=k)
+
+        return cast(TAsyncCallable, wrapper)
+
+    return deco
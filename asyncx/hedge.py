@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import functools
+import math
+import threading
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, TypeVar, Union, cast
+
+from ._types import TAsyncCallable
+
+TReturn = TypeVar("TReturn")
+
+
+class LatencyTracker:
+    """Tracks recent latencies to derive a hedging delay from a percentile.
+
+    Example:
+        >>> tracker = LatencyTracker(percentile=95.0, initial=0.05)
+        >>> await asyncx.hedge(lambda: query(), delay=tracker)
+
+    The tracker is thread-safe, so it can be shared among event loops.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        *,
+        initial: float = 0.1,
+        window: int = 1000,
+        min_samples: int = 10,
+        refresh: int = 16,
+    ) -> None:
+        """Creates a new tracker.
+
+        Args:
+            percentile:
+                The percentile in ``[0, 100]`` of recorded latencies used as the delay.
+            initial:
+                The delay in seconds used until ``min_samples`` latencies are recorded.
+            window:
+                The number of the most recent latencies to keep.
+            min_samples:
+                The number of latencies required to compute the percentile.
+            refresh:
+                The percentile is recomputed after this number of new latencies.
+        """
+        if not 0 <= percentile <= 100:
+            raise ValueError("percentile must be in [0, 100]")
+        if window < 1:
+            raise ValueError("window must be positive")
+
+        self._percentile = percentile
+        self._initial = initial
+        self._min_samples = min(min_samples, window)
+        self._refresh = max(refresh, 1)
+
+        self._lock = threading.Lock()
+        self._samples: Deque[float] = collections.deque(maxlen=window)
+        self._dirty = 0
+        self._delay: Optional[float] = None
+
+    def record(self, latency: float) -> None:
+        """Record a latency in seconds."""
+        with self._lock:
+            self._samples.append(latency)
+            self._dirty += 1
+
+    def delay(self) -> float:
+        """Returns the current delay in seconds."""
+        with self._lock:
+            if len(self._samples) < self._min_samples:
+                return self._initial
+            if self._delay is None or self._dirty >= self._refresh:
+                ordered = sorted(self._samples)
+                index = math.ceil(self._percentile / 100.0 * len(ordered)) - 1
+                self._delay = ordered[min(max(index, 0), len(ordered) - 1)]
+                self._dirty = 0
+            return self._delay
+
+
+async def hedge(
+    factory: Callable[[], Awaitable[TReturn]],
+    *,
+    delay: Union[float, LatencyTracker],
+    max_attempts: int = 2,
+) -> TReturn:
+    """Run an awaitable with hedged requests.
+
+    The first attempt is started immediately. If no attempt succeeds within ``delay``
+    seconds, another attempt is started, up to ``max_attempts`` attempts in total.
+    An attempt that fails starts the next one immediately. The first successful
+    attempt wins, and the other attempts are cancelled and awaited. If the coroutine
+    is cancelled, all attempts are cancelled as well.
+
+    Example:
+        >>> async def query() -> bytes:
+        ...     return await client.get(random.choice(replicas))
+        ...
+        >>> await asyncx.hedge(query, delay=0.05)
+
+    Args:
+        factory:
+            A callable that creates an awaitable for each attempt.
+        delay:
+            Seconds to wait before starting the next attempt, or a
+            :class:`LatencyTracker` object. A tracker provides the delay from
+            a percentile of the latencies of winning attempts, which are recorded
+            to the tracker.
+        max_attempts:
+            The maximum number of attempts.
+
+    Returns:
+        The result of the first successful attempt.
+
+    Raises:
+        Exception:
+            The exception of the last attempt if all attempts fail.
+    """
+    if max_attempts < 1:
+        raise ValueError("max_attempts must be positive")
+
+    loop = asyncio.get_running_loop()
+    tracker = delay if isinstance(delay, LatencyTracker) else None
+    # Running attempts and their start times in launch order
+    attempts: Dict[asyncio.Future[TReturn], float] = {}
+    launched = 0
+
+    def launch() -> None:
+        nonlocal launched
+        attempts[asyncio.ensure_future(factory())] = loop.time()
+        launched += 1
+
+    last_exc: Optional[BaseException] = None
+    try:
+        launch()
+        while len(attempts) > 0:
+            timeout: Optional[float] = None
+            if launched < max_attempts:
+                timeout = tracker.delay() if tracker is not None else cast(float, delay)
+
+            done, _ = await asyncio.wait(
+                attempts.keys(),
+                timeout=timeout,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if len(done) == 0:
+                launch()
+                continue
+
+            for attempt in [a for a in attempts if a in done]:
+                started = attempts.pop(attempt)
+                if attempt.cancelled():
+                    last_exc = asyncio.CancelledError()
+                    continue
+                exc = attempt.exception()
+                if exc is None:
+                    if tracker is not None:
+                        tracker.record(loop.time() - started)
+                    return attempt.result()
+                last_exc = exc
+
+            if launched < max_attempts:
+                launch()
+
+        assert last_exc is not None
+        raise last_exc
+    finally:
+        if len(attempts) > 0:
+            for attempt in attempts:
+                attempt.cancel()
+            await asyncio.wait(attempts.keys())
+
+
+def hedged(
+    *,
+    delay: Union[float, LatencyTracker],
+    max_attempts: int = 2,
+) -> Callable[[TAsyncCallable], TAsyncCallable]:
+    """A decorator to call an async function with hedged requests.
+
+    Each call runs :func:`hedge` with attempts that call the function with the same
+    arguments.
+
+    Example:
+        >>> @asyncx.hedged(delay=asyncx.LatencyTracker(percentile=95.0))
+        ... async def query(key: str) -> bytes:
+        ...     return await client.get(random.choice(replicas), key)
+
+    Args:
+        delay:
+            Seconds to wait before starting the next attempt, or a
+            :class:`LatencyTracker` object.
+        max_attempts:
+            The maximum number of attempts.
+    """
+    if max_attempts < 1:
+        raise ValueError("max_attempts must be positive")
+
+    def deco(func: TAsyncCallable) -> TAsyncCallable:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            return await hedge(
+                lambda: func(*args, **kwargs),
+                delay=delay,
+                max_attempts=max_attempts,
+            )
+
+        return cast(TAsyncCallable, wrapper)
+
+    return deco
@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import threading
+import time
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    NamedTuple,
+    Optional,
+    Set,
+    TypeVar,
+    cast,
+)
+
+from ._types import TAsyncCallable
+from .singleflight import SingleFlight
+
+TReturn = TypeVar("TReturn")
+
+EVICTION_POLICIES = ("lru", "lfu")
+
+
+class CacheStats(NamedTuple):
+    """A snapshot of counters of :class:`AsyncCache`."""
+
+    hits: int
+    """The number of lookups served from the cache, including stale entries."""
+    misses: int
+    """The number of lookups that awaited a computation."""
+    evictions: int
+    """The number of entries evicted to keep the size bound."""
+    size: int
+    """The current number of entries."""
+
+
+class _Entry:
+    __slots__ = ("value", "expiry", "stale_expiry", "frequency", "refreshing")
+
+    def __init__(self, value: Any, expiry: float, stale_expiry: float) -> None:
+        self.value = value
+        self.expiry = expiry
+        self.stale_expiry = stale_expiry
+        self.frequency = 1
+        self.refreshing = False
+
+
+class AsyncCache:
+    """A thread-safe cache of results of async computations.
+
+    Concurrent lookups of a missing key share one computation with
+    :class:`SingleFlight`, so the computation survives the cancellation of any
+    single awaiter. Only successful results are cached.
+
+    An entry expires ``ttl`` seconds after it is computed. With
+    ``stale_while_revalidate``, an expired entry is still returned for that many more
+    seconds while a background task on the caller's event loop recomputes it.
+
+    Example:
+        >>> cache = asyncx.AsyncCache(maxsize=1024, ttl=60.0)
+        >>> await cache.get_or_compute("foo", lambda: backend.get("foo"))
+        >>> cache.stats()
+        CacheStats(hits=0, misses=1, evictions=0, size=1)
+    """
+
+    def __init__(
+        self,
+        maxsize: Optional[int] = 128,
+        *,
+        ttl: Optional[float] = None,
+        stale_while_revalidate: Optional[float] = None,
+        policy: str = "lru",
+    ) -> None:
+        """Creates a new empty cache.
+
+        Args:
+            maxsize:
+                The maximum number of entries. If :obj:`None` is specified,
+                the cache is unbounded.
+            ttl:
+                Seconds for which an entry is fresh. If :obj:`None` is specified,
+                entries never expire.
+            stale_while_revalidate:
+                Seconds after the expiry for which a stale entry is returned while
+                it is recomputed in the background.
+            policy:
+                The eviction policy, ``"lru"`` (least recently used) or
+                ``"lfu"`` (least frequently used). Both evict an entry in ``O(1)``.
+        """
+        if maxsize is not None and maxsize < 1:
+            raise ValueError("maxsize must be positive")
+        if policy not in EVICTION_POLICIES:
+            raise ValueError(f"policy must be one of {EVICTION_POLICIES}")
+
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._stale = stale_while_revalidate or 0.0
+        self._policy = policy
+
+        self._lock = threading.Lock()
+        # Entries in recency order for LRU, or in insertion order for LFU
+        self._entries: Dict[Hashable, _Entry] = {}
+        # Keys by frequency for LFU, each in the order they reached the frequency,
+        # so that the least frequently used key is found in O(1)
+        self._frequencies: Dict[int, Dict[Hashable, None]] = {}
+        self._min_frequency = 0
+        self._flight = SingleFlight()
+        self._refreshes: Set[asyncio.Task[Any]] = set()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> CacheStats:
+        """Returns the current counters."""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._entries),
+            )
+
+    def clear(self) -> None:
+        """Drop all entries. Counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._frequencies.clear()
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop the entry with ``key``."""
+        with self._lock:
+            self._remove(key)
+
+    async def get_or_compute(
+        self, key: Hashable, factory: Callable[[], Awaitable[TReturn]]
+    ) -> TReturn:
+        """Returns the cached result of ``key``, or computes it by ``factory``.
+
+        Args:
+            key: A hashable key of the result.
+            factory:
+                A callable that creates an awaitable to compute the result.
+
+        Returns:
+            The cached or computed result.
+        """
+        now = time.monotonic()
+        refresh = False
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now >= entry.stale_expiry:
+                self._remove(key)
+                entry = None
+
+            if entry is not None:
+                self._hits += 1
+                if self._policy == "lru":
+                    self._entries[key] = self._entries.pop(key)
+                else:
+                    self._count_use(key, entry)
+                if now >= entry.expiry and not entry.refreshing:
+                    entry.refreshing = refresh = True
+            else:
+                self._misses += 1
+
+        if entry is None:
+            return await self._flight.do(key, lambda: self._compute(key, factory))
+
+        if refresh:
+            self._start_refresh(key, entry, factory)
+        return cast(TReturn, entry.value)
+
+    async def _compute(
+        self, key: Hashable, factory: Callable[[], Awaitable[TReturn]]
+    ) -> TReturn:
+        value = await factory()
+        now = time.monotonic()
+        expiry = now + self._ttl if self._ttl is not None else float("inf")
+        with self._lock:
+            self._remove(key)
+            if self._maxsize is not None and len(self._entries) >= self._maxsize:
+                self._evict()
+            self._entries[key] = _Entry(value, expiry, expiry + self._stale)
+            if self._policy == "lfu":
+                self._frequencies.setdefault(1, {})[key] = None
+                self._min_frequency = 1
+        return value
+
+    # The methods below must be called with the lock held
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None or self._policy != "lfu":
+            return
+        keys = self._frequencies[entry.frequency]
+        del keys[key]
+        if len(keys) == 0:
+            # _min_frequency may be left stale, which _evict() corrects
+            del self._frequencies[entry.frequency]
+
+    def _count_use(self, key: Hashable, entry: _Entry) -> None:
+        keys = self._frequencies[entry.frequency]
+        del keys[key]
+        if len(keys) == 0:
+            del self._frequencies[entry.frequency]
+            if self._min_frequency == entry.frequency:
+                self._min_frequency += 1
+        entry.frequency += 1
+        self._frequencies.setdefault(entry.frequency, {})[key] = None
+
+    def _evict(self) -> None:
+        if self._policy == "lru":
+            victim = next(iter(self._entries))
+        else:
+            if self._min_frequency not in self._frequencies:
+                # Only after the least frequently used keys are removed explicitly
+                self._min_frequency = min(self._frequencies)
+            victim = next(iter(self._frequencies[self._min_frequency]))
+        self._remove(victim)
+        self._evictions += 1
+
+    def _start_refresh(
+        self,
+        key: Hashable,
+        entry: _Entry,
+        factory: Callable[[], Awaitable[Any]],
+    ) -> None:
+        task = asyncio.ensure_future(
+            self._flight.do(key, lambda: self._compute(key, factory))
+        )
+        self._refreshes.add(task)
+
+        def on_done(task: asyncio.Task[Any]) -> None:
+            self._refreshes.discard(task)
+            # A failed refresh keeps serving the stale entry until it is dropped
+            entry.refreshing = False
+            if not task.cancelled():
+                task.exception()
+
+        task.add_done_callback(on_done)
+
+
+def memoize(
+    cache: Optional[AsyncCache] = None,
+    *,
+    key: Optional[Callable[..., Hashable]] = None,
+) -> Callable[[TAsyncCallable], TAsyncCallable]:
+    """A decorator to cache results of an async function.
+
+    Results are cached in ``cache`` keyed by the arguments of calls, and concurrent
+    calls with the same arguments share one call of the function.
+
+    Example:
+        >>> cache = asyncx.AsyncCache(maxsize=1024, ttl=10.0, stale_while_revalidate=5.0)
+        >>> @asyncx.memoize(cache)
+        ... async def fetch(url: str) -> bytes:
+        ...     return await client.get(url)
+        >>> cache.stats().hits
+        0
+
+    Args:
+        cache:
+            A cache to store results. If :obj:`None` is specified, a new
+            :class:`AsyncCache` object with the default parameters is used.
+            A cache should not be shared among functions, as keys are made
+            from arguments only.
+        key:
+            A callable that takes the arguments of a call and returns its key. If
+            :obj:`None` is specified, the arguments themselves are used as the key,
+            so they must be hashable.
+    """
+
+    def deco(func: TAsyncCallable) -> TAsyncCallable:
+        store = cache if cache is not None else AsyncCache()
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if key is not None:
+                k = key(*args, **kwargs)
+            else:
+                k = (args, tuple(sorted(kwargs.items())))
+            return await store.get_or_compute(k, lambda: func(*args, **kwargs))
+
+        return cast(TAsyncCallable, wrapper)
+
+    return deco
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import asyncio
+import bisect
+import threading
+import time
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+
+def _default_bounds() -> Tuple[float, ...]:
+    # 50us to ~1.6s in powers of two
+    return tuple(50e-6 * (2**i) for i in range(16))
+
+
+class LatencyHistogram:
+    """A histogram of latencies with fixed bucket boundaries.
+
+    The histogram itself is not thread-safe. :class:`LoopMonitor` updates it
+    under its own lock and hands out copies with :meth:`LoopMonitor.snapshot`.
+    """
+
+    def __init__(self, bounds: Optional[Sequence[float]] = None) -> None:
+        """Creates a new empty histogram.
+
+        Args:
+            bounds:
+                Ascending upper bounds of buckets in seconds. Values larger than
+                the last bound are counted in an extra overflow bucket.
+        """
+        self.bounds: Tuple[float, ...] = (
+            tuple(bounds) if bounds is not None else _default_bounds()
+        )
+        self.counts: List[int] = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, value: float) -> None:
+        """Record a latency in seconds."""
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def mean(self) -> float:
+        """The mean of recorded latencies, or ``0.0`` if nothing is recorded."""
+        return self.total / self.count if self.count > 0 else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Estimate the ``q``-th percentile by the upper bound of its bucket.
+
+        Args:
+            q: A percentile in ``[0, 100]``.
+
+        Returns:
+            The upper bound of the bucket, or the maximum recorded value
+            if the percentile falls in the overflow bucket.
+        """
+        if self.count == 0:
+            return 0.0
+        rank = q / 100.0 * self.count
+        accumulated = 0
+        for bound, count in zip(self.bounds, self.counts):
+            accumulated += count
+            if accumulated >= rank and accumulated > 0:
+                return min(bound, self.max)
+        return self.max
+
+    def copy(self) -> LatencyHistogram:
+        """Returns a copy of the histogram."""
+        ret = LatencyHistogram(self.bounds)
+        ret.counts = list(self.counts)
+        ret.count = self.count
+        ret.total = self.total
+        ret.max = self.max
+        return ret
+
+
+class LoopStats(NamedTuple):
+    """A snapshot of :class:`LoopMonitor`."""
+
+    lag: float
+    """The scheduling lag in seconds sampled by the latest probe."""
+    max_lag: float
+    """The maximum scheduling lag in seconds observed so far."""
+    queued: int
+    """The number of submissions that the event loop has not picked up yet."""
+    tasks: int
+    """The number of live tasks sampled by the latest probe."""
+    slow_callbacks: int
+    """The number of probes delayed by more than ``slow_callback_duration``."""
+    start_latency: LatencyHistogram
+    """Latencies from submissions to the event loop picking them up."""
+
+
+class LoopMonitor:
+    """Collects health metrics of an event loop run by :class:`EventLoopThread`.
+
+    A probe callback is scheduled on the loop every ``interval`` seconds to sample
+    the scheduling lag and the number of live tasks. A probe delayed by more than
+    ``slow_callback_duration`` indicates that a callback blocked the loop and is
+    counted as a slow callback.
+
+    Example:
+        >>> monitor = LoopMonitor(interval=0.05)
+        >>> with EventLoopThread(monitor=monitor) as thread:
+        ...     await thread.run_coroutine(asyncio.sleep(0.1))
+        ...     stats = monitor.snapshot()
+        >>> stats.start_latency.count
+        1
+
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.1,
+        *,
+        slow_callback_duration: Optional[float] = None,
+        bounds: Optional[Sequence[float]] = None,
+    ) -> None:
+        """Creates a new monitor.
+
+        Args:
+            interval:
+                Seconds between probes.
+            slow_callback_duration:
+                The lag in seconds above which a probe is counted as a slow callback.
+                If :obj:`None` is specified, ``slow_callback_duration`` of the loop
+                is used.
+            bounds:
+                Bucket boundaries of :attr:`LoopStats.start_latency`.
+        """
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+
+        self._interval = interval
+        self._slow_callback_duration = slow_callback_duration
+
+        self._lock = threading.Lock()
+        self._lag = 0.0
+        self._max_lag = 0.0
+        self._queued = 0
+        self._tasks = 0
+        self._slow_callbacks = 0
+        self._start_latency = LatencyHistogram(bounds)
+
+    def attach(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Start probing ``loop``. It must be called on the thread of ``loop``."""
+        if self._slow_callback_duration is None:
+            self._slow_callback_duration = loop.slow_callback_duration
+        expected = loop.time() + self._interval
+        loop.call_at(expected, self._probe, loop, expected)
+
+    def snapshot(self) -> LoopStats:
+        """Returns the current metrics. The method is thread-safe."""
+        with self._lock:
+            return LoopStats(
+                lag=self._lag,
+                max_lag=self._max_lag,
+                queued=self._queued,
+                tasks=self._tasks,
+                slow_callbacks=self._slow_callbacks,
+                start_latency=self._start_latency.copy(),
+            )
+
+    def on_submitted(self, count: int = 1) -> float:
+        """Record submissions and return a timestamp passed to :meth:`on_started`."""
+        with self._lock:
+            self._queued += count
+        return time.perf_counter()
+
+    def on_started(self, stamps: Sequence[float]) -> None:
+        """Record that the event loop picked up submissions made at ``stamps``."""
+        now = time.perf_counter()
+        with self._lock:
+            self._queued -= len(stamps)
+            for stamp in stamps:
+                self._start_latency.record(now - stamp)
+
+    def on_dropped(self, count: int) -> None:
+        """Record submissions discarded without being picked up."""
+        with self._lock:
+            self._queued -= count
+
+    def _probe(self, loop: asyncio.AbstractEventLoop, expected: float) -> None:
+        now = loop.time()
+        lag = max(0.0, now - expected)
+        tasks = len(asyncio.all_tasks(loop))
+        threshold = self._slow_callback_duration
+        with self._lock:
+            self._lag = lag
+            if lag > self._max_lag:
+                self._max_lag = lag
+            self._tasks = tasks
+            if threshold is not None and lag > threshold:
+                self._slow_callbacks += 1
+
+        expected = now + self._interval
+        loop.call_at(expected, self._probe, loop, expected)
@@ -0,0 +1,717 @@
+from __future__ import annotations
+
+import abc
+import asyncio
+import bisect
+import concurrent.futures
+import hashlib
+import itertools
+import os
+import random
+import threading
+import time
+from typing import (
+    Any,
+    Callable,
+    Coroutine,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    TypeVar,
+)
+
+from .thread import EventLoopThread, ShutdownResult
+
+TReturn = TypeVar("TReturn")
+TSelf = TypeVar("TSelf", bound="EventLoopThreadPool")
+
+
+class PlacementPolicy(abc.ABC):
+    """A policy that decides which event loop thread runs a submitted coroutine.
+
+    Subclasses implement :meth:`select` and may keep their own state.
+    The method is called with the lock of the owner held, so implementations
+    do not need to be thread-safe by themselves.
+    """
+
+    @abc.abstractmethod
+    def select(self, loads: Sequence[int], key: Optional[Hashable]) -> int:
+        """Select an index of the target.
+
+        Args:
+            loads:
+                The number of outstanding coroutines of each target.
+            key:
+                An optional key given by the caller.
+
+        Returns:
+            An index in ``range(len(loads))``.
+        """
+
+
+class RoundRobinPlacement(PlacementPolicy):
+    """Place coroutines on each target in turn."""
+
+    def __init__(self) -> None:
+        self._counter = itertools.count()
+
+    def select(self, loads: Sequence[int], key: Optional[Hashable]) -> int:
+        return next(self._counter) % len(loads)
+
+
+class LeastPendingPlacement(PlacementPolicy):
+    """Place coroutines on the target with the fewest outstanding coroutines.
+
+    Ties are broken in favor of the lowest index.
+    """
+
+    def select(self, loads: Sequence[int], key: Optional[Hashable]) -> int:
+        return min(range(len(loads)), key=loads.__getitem__)
+
+
+class KeyHashPlacement(PlacementPolicy):
+    """Place coroutines sharing the same key on the same target.
+
+    Submissions without a key are delegated to ``fallback``.
+    """
+
+    def __init__(self, fallback: Optional[PlacementPolicy] = None) -> None:
+        """Creates a new policy.
+
+        Args:
+            fallback:
+                A policy used for submissions without a key.
+                :class:`RoundRobinPlacement` is used if :obj:`None` is specified.
+        """
+        self._fallback = fallback if fallback is not None else RoundRobinPlacement()
+
+    def select(self, loads: Sequence[int], key: Optional[Hashable]) -> int:
+        if key is None:
+            return self._fallback.select(loads, key)
+        return hash(key) % len(loads)
+
+
+class PowerOfTwoChoicesPlacement(PlacementPolicy):
+    """Place coroutines on the less loaded of two randomly chosen targets.
+
+    It balances loads nearly as well as :class:`LeastPendingPlacement` while
+    avoiding herding onto the same target when loads are stale or tied.
+    """
+
+    def __init__(self, seed: Optional[int] = None) -> None:
+        """Creates a new policy.
+
+        Args:
+            seed: A seed of the random number generator.
+        """
+        self._random = random.Random(seed)
+
+    def select(self, loads: Sequence[int], key: Optional[Hashable]) -> int:
+        if len(loads) == 1:
+            return 0
+        a, b = self._random.sample(range(len(loads)), 2)
+        return a if loads[a] <= loads[b] else b
+
+
+class ConsistentHashPlacement(PlacementPolicy):
+    """Place coroutines sharing the same key on the same target with a hash ring.
+
+    Unlike :class:`KeyHashPlacement`, only about ``1 / n`` of keys move to another
+    target when the number of targets changes to ``n``, which keeps per-target
+    caches warm. Submissions without a key are delegated to ``fallback``.
+    """
+
+    def __init__(
+        self, replicas: int = 128, fallback: Optional[PlacementPolicy] = None
+    ) -> None:
+        """Creates a new policy.
+
+        Args:
+            replicas:
+                The number of points of each target on the ring. More points spread
+                keys more evenly.
+            fallback:
+                A policy used for submissions without a key.
+                :class:`RoundRobinPlacement` is used if :obj:`None` is specified.
+        """
+        if replicas < 1:
+            raise ValueError("replicas must be positive")
+
+        self._replicas = replicas
+        self._fallback = fallback if fallback is not None else RoundRobinPlacement()
+        self._points: List[int] = []
+        self._targets: List[int] = []
+        self._size = 0
+
+    def select(self, loads: Sequence[int], key: Optional[Hashable]) -> int:
+        if key is None:
+            return self._fallback.select(loads, key)
+        if self._size != len(loads):
+            self._build(len(loads))
+
+        i = bisect.bisect(self._points, _hash64(key))
+        return self._targets[i % len(self._targets)]
+
+    def _build(self, size: int) -> None:
+        ring = sorted(
+            (_hash64((target, replica)), target)
+            for target in range(size)
+            for replica in range(self._replicas)
+        )
+        self._points = [point for point, _ in ring]
+        self._targets = [target for _, target in ring]
+        self._size = size
+
+
+def _hash64(key: Hashable) -> int:
+    # Mix bits so that consecutive integer keys are spread over the ring
+    return int.from_bytes(
+        hashlib.blake2b(repr(hash(key)).encode(), digest_size=8).digest(), "little"
+    )
+
+
+class EventLoopThreadPool:
+    """A pool of :class:`EventLoopThread` that spreads coroutines across threads.
+
+    Example:
+        >>> async def _get_ident() -> int:
+        ...     return threading.get_ident()
+        ...
+        >>> with EventLoopThreadPool(4, placement=LeastPendingPlacement()) as pool:
+        ...     idents = await asyncio.gather(
+        ...         *(pool.run_coroutine(_get_ident()) for _ in range(8))
+        ...     )
+        >>> len(set(idents)) > 1
+        True
+
+    """
+
+    def __init__(
+        self,
+        size: Optional[int] = None,
+        *,
+        placement: Optional[PlacementPolicy] = None,
+        loop_policy: Optional[asyncio.AbstractEventLoopPolicy] = None,
+        loop_factory: Optional[Callable[[], asyncio.AbstractEventLoop]] = None,
+        on_loop_ready: Optional[Callable[[asyncio.AbstractEventLoop], None]] = None,
+        daemon: bool = False,
+        start: bool = False,
+        thread_name_prefix: Optional[str] = None,
+        cpu_affinity: Optional[Sequence[Iterable[int]]] = None,
+        thread_factory: Optional[Callable[[int], EventLoopThread]] = None,
+    ) -> None:
+        """Creates a new pool of event loop threads.
+
+        Args:
+            size:
+                The number of threads. If :obj:`None` is specified,
+                ``os.cpu_count()`` is used.
+            placement:
+                A :class:`PlacementPolicy` that selects a thread for each submission.
+                :class:`RoundRobinPlacement` is used if :obj:`None` is specified.
+            loop_policy:
+                Passed to :class:`EventLoopThread` of each thread.
+            loop_factory:
+                Passed to :class:`EventLoopThread` of each thread.
+            on_loop_ready:
+                Passed to :class:`EventLoopThread` of each thread.
+            daemon:
+                Passed to :class:`EventLoopThread` of each thread.
+            start:
+                If ``True`` is specified, all threads are started immediately.
+            thread_name_prefix:
+                If specified, the thread of index ``i`` is named
+                ``f"{thread_name_prefix}-{i}"``.
+            cpu_affinity:
+                A sequence of CPU sets. The thread of index ``i`` is pinned to
+                ``cpu_affinity[i % len(cpu_affinity)]``. See
+                :class:`EventLoopThread` for further details.
+            thread_factory:
+                A callable that creates a thread from its index. If specified,
+                ``loop_policy``, ``loop_factory``, ``on_loop_ready``, ``daemon``,
+                ``thread_name_prefix`` and ``cpu_affinity`` are ignored.
+        """
+        if size is None:
+            size = os.cpu_count() or 1
+        if size < 1:
+            raise ValueError("size must be positive")
+        affinities = None if cpu_affinity is None else [set(c) for c in cpu_affinity]
+        if affinities is not None and len(affinities) == 0:
+            raise ValueError("cpu_affinity cannot be empty")
+
+        def default_thread_factory(index: int) -> EventLoopThread:
+            return EventLoopThread(
+                loop_policy=loop_policy,
+                daemon=daemon,
+                loop_factory=loop_factory,
+                on_loop_ready=on_loop_ready,
+                name=(
+                    None
+                    if thread_name_prefix is None
+                    else f"{thread_name_prefix}-{index}"
+                ),
+                cpu_affinity=(
+                    None if affinities is None else affinities[index % len(affinities)]
+                ),
+            )
+
+        factory = (
+            thread_factory if thread_factory is not None else default_thread_factory
+        )
+        self._placement = placement if placement is not None else RoundRobinPlacement()
+        self._threads: List[EventLoopThread] = [factory(i) for i in range(size)]
+        self._loads: List[int] = [0] * size
+        self._lock = threading.Lock()
+
+        if start:
+            self.start()
+
+    @property
+    def threads(self) -> Sequence[EventLoopThread]:
+        """Threads owned by the pool."""
+        return tuple(self._threads)
+
+    @property
+    def loads(self) -> Sequence[int]:
+        """The number of outstanding coroutines of each thread."""
+        with self._lock:
+            return tuple(self._loads)
+
+    def __len__(self) -> int:
+        return len(self._threads)
+
+    def __iter__(self) -> Iterator[EventLoopThread]:
+        return iter(self._threads)
+
+    def start(self) -> None:
+        """Start all threads and wait for their event loops to be ready.
+
+        Raises:
+            RuntimeError:
+                If any of the threads is already terminated.
+        """
+        for thread in self._threads:
+            thread.start()
+
+    def shutdown(self, join: bool = True) -> None:
+        """Shutdown the event loops of all threads.
+
+        Args:
+            join:
+                If `True` is specified, the method waits for all threads to be terminated.
+        """
+        for thread in self._threads:
+            thread.shutdown(join=False)
+        if join:
+            for thread in self._threads:
+                if thread.is_alive():
+                    thread.join()
+
+    def drain(
+        self,
+        timeout: Optional[float] = None,
+        *,
+        cancel_timeout: Optional[float] = 1.0,
+    ) -> List[ShutdownResult]:
+        """Gracefully shutdown the event loops of all threads concurrently.
+
+        See :meth:`EventLoopThread.drain` for further details.
+
+        Args:
+            timeout:
+                Seconds to wait for pending tasks.
+            cancel_timeout:
+                Seconds to wait for the cancelled tasks.
+
+        Returns:
+            A list of :class:`ShutdownResult` objects of each thread.
+        """
+        futures = [
+            thread.begin_drain(timeout, cancel_timeout=cancel_timeout)
+            for thread in self._threads
+        ]
+        results = [
+            ShutdownResult(0, 0, 0) if future is None else future.result()
+            for future in futures
+        ]
+        for thread in self._threads:
+            if thread.is_alive():
+                thread.join()
+        return results
+
+    def __enter__(self: TSelf) -> TSelf:
+        """Start all threads."""
+        self.start()
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        """Shutdown all threads."""
+        self.shutdown()
+
+    def select_thread(self, key: Optional[Hashable] = None) -> EventLoopThread:
+        """Select a thread with the placement policy without submitting anything.
+
+        Args:
+            key: An optional key passed to the placement policy.
+        """
+        with self._lock:
+            index = self._placement.select(self._loads, key)
+        return self._threads[index]
+
+    def run_coroutine_concurrent(
+        self,
+        coro: Coroutine[Any, Any, TReturn],
+        *,
+        key: Optional[Hashable] = None,
+    ) -> concurrent.futures.Future[TReturn]:
+        """Submit a coroutine in one of the event loops.
+
+        Args:
+            coro: A `Coroutine` object to run.
+            key: An optional key passed to the placement policy.
+
+        Returns:
+            A :class:`concurrent.future.Future` object that returns the execution result of
+            a given coroutine.
+        """
+        with self._lock:
+            index = self._placement.select(self._loads, key)
+            self._loads[index] += 1
+
+        try:
+            future = self._threads[index].run_coroutine_concurrent(coro)
+        except BaseException:
+            self._release(index)
+            raise
+
+        future.add_done_callback(lambda _: self._release(index))
+        return future
+
+    def run_coroutine(
+        self,
+        coro: Coroutine[Any, Any, TReturn],
+        *,
+        key: Optional[Hashable] = None,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ) -> asyncio.Future[TReturn]:
+        """Submit a coroutine in one of the event loops and waits for its completion
+        in a given ``loop``.
+
+        Args:
+            coro: A `Coroutine` object to run.
+            key: An optional key passed to the placement policy.
+            loop: An event loop to wait for the completion of ``coro``.
+
+        Returns:
+            A :class:`asyncio.Future` object that returns the execution result of a given
+            coroutine.
+        """
+        future = self.run_coroutine_concurrent(coro, key=key)
+        return asyncio.wrap_future(future, loop=loop)
+
+    def _release(self, index: int) -> None:
+        with self._lock:
+            self._loads[index] -= 1
+
+
+class _CachedThread:
+    __slots__ = ("thread", "active", "idle_since", "reaping")
+
+    def __init__(self, thread: EventLoopThread) -> None:
+        self.thread = thread
+        self.active = 0
+        self.idle_since = 0.0
+        # Whether a timer to reap the thread is scheduled on its loop
+        self.reaping = False
+
+
+class EventLoopThreadCache:
+    """A bounded cache of :class:`EventLoopThread` reused across submissions.
+
+    Threads are created lazily up to ``max_threads``. Once a thread has no running
+    coroutine for ``idle_timeout`` seconds, it is shut down and removed from the cache.
+    A coroutine is never placed on the thread of the caller, so the
+    "runs on a different thread" guarantee of :func:`run_coroutine_in_thread` holds.
+
+    Example:
+        >>> cache = EventLoopThreadCache(max_threads=4, idle_timeout=10.0)
+        >>> main, sub = await asyncio.gather(
+        ...     _get_ident(),
+        ...     cache.run_coroutine(_get_ident()),
+        ... )
+        >>> main == sub
+        False
+        >>> cache.shutdown()
+
+    """
+
+    def __init__(
+        self,
+        max_threads: Optional[int] = None,
+        *,
+        idle_timeout: float = 60.0,
+        loop_policy: Optional[asyncio.AbstractEventLoopPolicy] = None,
+        loop_factory: Optional[Callable[[], asyncio.AbstractEventLoop]] = None,
+        on_loop_ready: Optional[Callable[[asyncio.AbstractEventLoop], None]] = None,
+        daemon: bool = True,
+        thread_name_prefix: Optional[str] = None,
+    ) -> None:
+        """Creates a new cache of event loop threads.
+
+        Args:
+            max_threads:
+                The maximum number of threads. If :obj:`None` is specified,
+                ``min(32, os.cpu_count() + 4)`` is used. When all threads are busy,
+                a coroutine is placed on the thread with the fewest running coroutines.
+            idle_timeout:
+                Seconds after which an idle thread is shut down.
+            loop_policy:
+                Passed to :class:`EventLoopThread` of each thread.
+            loop_factory:
+                Passed to :class:`EventLoopThread` of each thread.
+            on_loop_ready:
+                Passed to :class:`EventLoopThread` of each thread.
+            daemon:
+                Passed to :class:`EventLoopThread` of each thread.
+            thread_name_prefix:
+                If specified, threads are named ``f"{thread_name_prefix}-{n}"``
+                where ``n`` is a sequence number.
+        """
+        if max_threads is None:
+            max_threads = min(32, (os.cpu_count() or 1) + 4)
+        if max_threads < 1:
+            raise ValueError("max_threads must be positive")
+
+        self._max_threads = max_threads
+        self._idle_timeout = idle_timeout
+        self._loop_policy = loop_policy
+        self._loop_factory = loop_factory
+        self._on_loop_ready = on_loop_ready
+        self._daemon = daemon
+        self._thread_name_prefix = thread_name_prefix
+        self._counter = itertools.count()
+
+        self._lock = threading.Lock()
+        self._started = threading.Condition(self._lock)
+        self._entries: List[_CachedThread] = []
+        # The number of threads being started outside the lock
+        self._starting = 0
+        self._closed = False
+
+    @property
+    def threads(self) -> Sequence[EventLoopThread]:
+        """Threads currently held by the cache."""
+        with self._lock:
+            return tuple(e.thread for e in self._entries)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def shutdown(self, join: bool = True) -> None:
+        """Shutdown all cached threads. The cache cannot be used afterwards.
+
+        Args:
+            join:
+                If `True` is specified, the method waits for all threads to be terminated.
+        """
+        with self._lock:
+            self._closed = True
+            entries, self._entries = self._entries, []
+
+        for entry in entries:
+            entry.thread.shutdown(join=False)
+        if join:
+            for entry in entries:
+                if entry.thread.is_alive():
+                    entry.thread.join()
+
+    def run_coroutine_concurrent(
+        self, coro: Coroutine[Any, Any, TReturn]
+    ) -> concurrent.futures.Future[TReturn]:
+        """Submit a coroutine in one of the cached threads.
+
+        Args:
+            coro: A `Coroutine` object to run.
+
+        Returns:
+            A :class:`concurrent.future.Future` object that returns the execution result of
+            a given coroutine.
+        """
+        entry = self._acquire()
+        try:
+            future = entry.thread.run_coroutine_concurrent(coro)
+        except BaseException:
+            self._release(entry)
+            raise
+
+        future.add_done_callback(lambda _: self._release(entry))
+        return future
+
+    def run_coroutine(
+        self,
+        coro: Coroutine[Any, Any, TReturn],
+        *,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ) -> asyncio.Future[TReturn]:
+        """Submit a coroutine in one of the cached threads and waits for its completion
+        in a given ``loop``.
+
+        Args:
+            coro: A `Coroutine` object to run.
+            loop: An event loop to wait for the completion of ``coro``.
+
+        Returns:
+            A :class:`asyncio.Future` object that returns the execution result of a given
+            coroutine.
+        """
+        future = self.run_coroutine_concurrent(coro)
+        return asyncio.wrap_future(future, loop=loop)
+
+    def _acquire(self) -> _CachedThread:
+        caller = threading.get_ident()
+        with self._lock:
+            while True:
+                self._check_open()
+
+                candidates = [e for e in self._entries if e.thread.ident != caller]
+                idle = [e for e in candidates if e.active == 0]
+                if len(idle) > 0:
+                    # Prefer the most recently used thread so that others can be reaped
+                    return self._use(idle[-1])
+                if len(self._entries) + self._starting < self._max_threads:
+                    break
+                if len(candidates) > 0:
+                    return self._use(min(candidates, key=lambda e: e.active))
+                if self._starting == 0:
+                    # Only the thread of the caller is cached
+                    break
+                # Wait for a thread started by another caller not to exceed the bound
+                self._started.wait()
+
+            # Reserve a slot and start the thread outside the lock, as starting it
+            # waits for the loop and on_loop_ready
+            self._starting += 1
+            name = (
+                None
+                if self._thread_name_prefix is None
+                else f"{self._thread_name_prefix}-{next(self._counter)}"
+            )
+
+        try:
+            thread = EventLoopThread(
+                loop_policy=self._loop_policy,
+                daemon=self._daemon,
+                start=True,
+                loop_factory=self._loop_factory,
+                on_loop_ready=self._on_loop_ready,
+                name=name,
+            )
+        except BaseException:
+            with self._lock:
+                self._starting -= 1
+                self._started.notify_all()
+            raise
+
+        entry = _CachedThread(thread)
+        with self._lock:
+            self._starting -= 1
+            self._started.notify_all()
+            try:
+                self._check_open()
+            except RuntimeError:
+                thread.shutdown(join=False)
+                raise
+            self._entries.append(entry)
+            return self._use(entry)
+
+    def _check_open(self) -> None:
+        # It must be called with the lock held
+        if self._closed:
+            raise RuntimeError("Cache is already shut down")
+
+    def _use(self, entry: _CachedThread) -> _CachedThread:
+        # It must be called with the lock held
+        self._entries.remove(entry)
+        self._entries.append(entry)
+        entry.active += 1
+        return entry
+
+    def _release(self, entry: _CachedThread) -> None:
+        with self._lock:
+            entry.active -= 1
+            if entry.active > 0 or self._closed:
+                return
+            entry.idle_since = time.monotonic()
+            if entry.reaping:
+                # The scheduled timer checks the new idle time when it fires
+                return
+            entry.reaping = True
+
+        try:
+            loop = entry.thread.get_loop()
+            loop.call_soon_threadsafe(
+                loop.call_later, self._idle_timeout, self._reap, entry
+            )
+        except RuntimeError:
+            # The thread or its loop is already terminated
+            pass
+
+    def _reap(self, entry: _CachedThread) -> None:
+        with self._lock:
+            if entry.active > 0 or entry not in self._entries:
+                entry.reaping = False
+                return
+            remaining = entry.idle_since + self._idle_timeout - time.monotonic()
+            if remaining > 0:
+                # The thread was used again after the timer was scheduled
+                asyncio.get_running_loop().call_later(remaining, self._reap, entry)
+                return
+            self._entries.remove(entry)
+
+        entry.thread.shutdown(join=False)
+
+
+_default_cache: Optional[EventLoopThreadCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def _get_default_cache() -> EventLoopThreadCache:
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = EventLoopThreadCache()
+        return _default_cache
+
+
+def run_coroutine_in_cached_thread(
+    coro: Coroutine[Any, Any, TReturn],
+    *,
+    loop: Optional[asyncio.AbstractEventLoop] = None,
+) -> asyncio.Future[TReturn]:
+    """Submit a coroutine in a cached thread and waits for its completion in a given ``loop``.
+
+    Unlike :func:`run_coroutine_in_thread`, the thread and its event loop are drawn from
+    a process-wide :class:`EventLoopThreadCache` of daemon threads, so the startup cost
+    is paid only once.
+
+    Example:
+        >>> main, sub = await asyncio.gather(
+        ...     _get_ident(),
+        ...     asyncx.run_coroutine_in_cached_thread(_get_ident()),
+        ... )
+        >>> main == sub
+        False
+
+    Args:
+        coro: A coroutine to run in a cached thread.
+        loop: An event loop to wait for the completion of ``coro``.
+
+    Returns:
+        A :class:`asyncio.Future` object that returns the execution result of
+        a given coroutine.
+    """
+    return _get_default_cache().run_coroutine(coro, loop=loop)
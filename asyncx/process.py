@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import functools
+import importlib
+import multiprocessing.context
+from typing import (
+    Any,
+    Callable,
+    Coroutine,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    cast,
+)
+
+from ._types import TAsyncCallable
+from .thread import EventLoopThread
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    # Python 3.7
+    shared_memory = None  # type: ignore[assignment]
+
+TReturn = TypeVar("TReturn")
+TSelf = TypeVar("TSelf", bound="ProcessLoopPool")
+
+# Set on wrappers of dispatch_process, which workers unwrap to the original function
+_DISPATCHED = "__asyncx_dispatch_process__"
+
+# The event loop thread of a worker process
+_worker_thread: Optional[EventLoopThread] = None
+
+
+class _FunctionRef:
+    __slots__ = ("module", "qualname")
+
+    def __init__(self, func: Callable[..., Any]) -> None:
+        self.module: str = func.__module__
+        self.qualname: str = func.__qualname__
+        if "<" in self.qualname:
+            raise ValueError(
+                f"{self.qualname} must be defined at the top level of a module"
+            )
+
+    def __getstate__(self) -> Tuple[str, str]:
+        return self.module, self.qualname
+
+    def __setstate__(self, state: Tuple[str, str]) -> None:
+        self.module, self.qualname = state
+
+    def resolve(self) -> Callable[..., Coroutine[Any, Any, Any]]:
+        obj: Any = importlib.import_module(self.module)
+        for name in self.qualname.split("."):
+            obj = getattr(obj, name)
+        while getattr(obj, _DISPATCHED, False):
+            obj = obj.__wrapped__
+        return cast(Callable[..., Coroutine[Any, Any, Any]], obj)
+
+
+class _SharedBytes:
+    __slots__ = ("name", "size")
+
+    def __init__(self, name: str, size: int) -> None:
+        self.name = name
+        self.size = size
+
+    def __getstate__(self) -> Tuple[str, int]:
+        return self.name, self.size
+
+    def __setstate__(self, state: Tuple[str, int]) -> None:
+        self.name, self.size = state
+
+    def load(self, unlink: bool) -> bytes:
+        shm = shared_memory.SharedMemory(name=self.name)
+        try:
+            buf = shm.buf
+            assert buf is not None
+            return bytes(buf[: self.size])
+        finally:
+            shm.close()
+            if unlink:
+                shm.unlink()
+
+    def unlink(self) -> None:
+        shm = shared_memory.SharedMemory(name=self.name)
+        shm.close()
+        shm.unlink()
+
+
+def _share(value: Any, threshold: Optional[int], owned: List[Any]) -> Any:
+    if threshold is None or not isinstance(value, (bytes, bytearray, memoryview)):
+        return value
+    size = memoryview(value).nbytes
+    if size < threshold:
+        return value
+
+    shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    buf = shm.buf
+    assert buf is not None
+    buf[:size] = memoryview(value).cast("B")
+    owned.append(shm)
+    return _SharedBytes(shm.name, size)
+
+
+def _init_worker(
+    initializer: Optional[Callable[..., Any]], initargs: Tuple[Any, ...]
+) -> None:
+    global _worker_thread
+    _worker_thread = EventLoopThread(daemon=True, start=True)
+    if initializer is None:
+        return
+    if asyncio.iscoroutinefunction(initializer):
+        _worker_thread.run_coroutine_sync(initializer(*initargs))
+    else:
+        initializer(*initargs)
+
+
+def _call_in_worker(
+    ref: _FunctionRef,
+    args: Tuple[Any, ...],
+    kwargs: Dict[str, Any],
+    threshold: Optional[int],
+) -> Any:
+    assert _worker_thread is not None
+    func = ref.resolve()
+    args = tuple(a.load(False) if isinstance(a, _SharedBytes) else a for a in args)
+    kwargs = {
+        k: v.load(False) if isinstance(v, _SharedBytes) else v
+        for k, v in kwargs.items()
+    }
+    result = _worker_thread.run_coroutine_sync(func(*args, **kwargs))
+
+    owned: List[Any] = []
+    ret = _share(result, threshold, owned)
+    for shm in owned:
+        # The caller reads and unlinks the segment
+        shm.close()
+    return ret
+
+
+def _discard_result(future: concurrent.futures.Future[Any]) -> None:
+    if future.cancelled() or future.exception() is not None:
+        return
+    result = future.result()
+    if isinstance(result, _SharedBytes):
+        result.unlink()
+
+
+class ProcessLoopPool:
+    """A pool of worker processes, each of which runs an event loop.
+
+    Coroutine functions run on the event loop of a worker process, so CPU-heavy work
+    between awaits is not limited by the GIL of the caller. Each worker runs one call
+    at a time. Functions are sent to workers by reference of their module and
+    qualified name, so they must be defined at the top level of a module, and
+    arguments and results must be picklable.
+
+    ``bytes``, ``bytearray`` and ``memoryview`` arguments and results of at least
+    ``shared_memory_threshold`` bytes are passed through shared memory instead of
+    the pipe to the workers. Such values are received as ``bytes``.
+
+    Example:
+        >>> async def parse(payload: bytes) -> int:
+        ...     return len(json.loads(payload))
+        ...
+        >>> with asyncx.ProcessLoopPool(4) as pool:
+        ...     await pool.run(parse, payload)
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        *,
+        initializer: Optional[Callable[..., Any]] = None,
+        initargs: Sequence[Any] = (),
+        mp_context: Optional[multiprocessing.context.BaseContext] = None,
+        shared_memory_threshold: Optional[int] = 1 << 20,
+    ) -> None:
+        """Creates a new pool.
+
+        Args:
+            max_workers:
+                The number of worker processes. If :obj:`None` is specified,
+                the default of :class:`concurrent.futures.ProcessPoolExecutor` is used.
+            initializer:
+                A function called in each worker with ``initargs`` to warm it up,
+                e.g. to open connections. A coroutine function is run on the event
+                loop of the worker.
+            initargs:
+                Arguments passed to ``initializer``.
+            mp_context:
+                A multiprocessing context to start workers.
+            shared_memory_threshold:
+                The minimum size in bytes of values passed through shared memory.
+                If :obj:`None` is specified, or shared memory is not available
+                before Python 3.8, all values are pickled.
+        """
+        self._threshold = shared_memory_threshold if shared_memory else None
+        self._executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers,
+            mp_context=mp_context,
+            initializer=_init_worker,
+            initargs=(initializer, tuple(initargs)),
+        )
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down the worker processes.
+
+        Args:
+            wait: If ``True`` is specified, wait for running calls to finish.
+        """
+        self._executor.shutdown(wait)
+
+    def __enter__(self: TSelf) -> TSelf:
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        self.shutdown()
+
+    async def run(
+        self,
+        func: Callable[..., Coroutine[Any, Any, TReturn]],
+        *args: Any,
+        **kwargs: Any,
+    ) -> TReturn:
+        """Run a coroutine function on the event loop of a worker process.
+
+        Args:
+            func: A coroutine function defined at the top level of a module.
+            args: Positional arguments for ``func``.
+            kwargs: Keyword arguments for ``func``.
+
+        Returns:
+            The result of ``func``.
+        """
+        ref = _FunctionRef(func)
+        owned: List[Any] = []
+        try:
+            shared_args = tuple(_share(a, self._threshold, owned) for a in args)
+            shared_kwargs = {
+                k: _share(v, self._threshold, owned) for k, v in kwargs.items()
+            }
+            future = self._executor.submit(
+                _call_in_worker, ref, shared_args, shared_kwargs, self._threshold
+            )
+        except BaseException:
+            _release(owned)
+            raise
+
+        future.add_done_callback(lambda _: _release(owned))
+        try:
+            result = await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            # A running call cannot be cancelled, so its result is discarded
+            future.add_done_callback(_discard_result)
+            raise
+
+        if isinstance(result, _SharedBytes):
+            return cast(TReturn, result.load(True))
+        return cast(TReturn, result)
+
+
+def _release(owned: List[Any]) -> None:
+    for shm in owned:
+        shm.close()
+        shm.unlink()
+
+
+def dispatch_process(
+    pool: ProcessLoopPool,
+) -> Callable[[TAsyncCallable], TAsyncCallable]:
+    """A decorator to dispatch an async function to worker processes of a pool.
+
+    The decorated function must be defined at the top level of a module. Workers
+    look it up by name and call the original function.
+
+    Example:
+        >>> pool = asyncx.ProcessLoopPool(4)
+        >>> @asyncx.dispatch_process(pool)
+        ... async def parse(payload: bytes) -> int:
+        ...     return len(json.loads(payload))
+
+    Args:
+        pool: A :class:`ProcessLoopPool` to run the function.
+    """
+
+    def deco(func: TAsyncCallable) -> TAsyncCallable:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            return await pool.run(func, *args, **kwargs)
+
+        setattr(wrapper, _DISPATCHED, True)
+        return cast(TAsyncCallable, wrapper)
+
+    return deco
@@ -0,0 +1,216 @@
+import abc
+import asyncio
+import collections
+import functools
+import threading
+import time
+from typing import Any, Callable, Deque, Optional, cast
+
+from ._types import TAsyncCallable
+
+
+class RateLimiter(abc.ABC):
+    """A base class of thread-safe rate limiters.
+
+    A limiter can be shared among event loops, for example the loops of
+    :class:`EventLoopThread` objects, to bound the total rate of calls.
+    """
+
+    @abc.abstractmethod
+    def try_acquire(self, tokens: int = 1) -> bool:
+        """Acquire ``tokens`` without waiting.
+
+        Returns:
+            ``True`` if the tokens are acquired, otherwise ``False``.
+        """
+
+    @abc.abstractmethod
+    async def acquire(self, tokens: int = 1) -> None:
+        """Wait until ``tokens`` are acquired without blocking the running event loop."""
+
+
+class TokenBucket(RateLimiter):
+    """A token bucket that refills ``rate`` tokens per second up to ``burst`` tokens.
+
+    Waiters reserve tokens in arrival order and sleep until the reserved tokens are
+    refilled, so waiting callers are paced evenly at ``rate`` without retrying.
+    A waiter cancelled while sleeping gives its tokens back.
+
+    Example:
+        >>> bucket = asyncx.TokenBucket(rate=100.0, burst=10)
+        >>> await bucket.acquire()
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None) -> None:
+        """Creates a new full bucket.
+
+        Args:
+            rate:
+                Tokens refilled per second.
+            burst:
+                The capacity of the bucket. If :obj:`None` is specified, ``1`` is used
+                so that calls are evenly spaced.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst is not None and burst < 1:
+            raise ValueError("burst must be positive")
+
+        self._rate = rate
+        self._burst = float(burst if burst is not None else 1)
+
+        self._lock = threading.Lock()
+        # It becomes negative while tokens are reserved in advance
+        self._tokens = self._burst
+        self._updated = time.monotonic()
+
+    @property
+    def rate(self) -> float:
+        """Tokens refilled per second."""
+        return self._rate
+
+    @property
+    def burst(self) -> int:
+        """The capacity of the bucket."""
+        return int(self._burst)
+
+    def try_acquire(self, tokens: int = 1) -> bool:
+        with self._lock:
+            self._refill()
+            if self._tokens < tokens:
+                return False
+            self._tokens -= tokens
+            return True
+
+    async def acquire(self, tokens: int = 1) -> None:
+        if tokens > self._burst:
+            raise ValueError("tokens must not exceed burst")
+
+        with self._lock:
+            self._refill()
+            self._tokens -= tokens
+            delay = -self._tokens / self._rate
+
+        if delay <= 0:
+            return
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            with self._lock:
+                self._refill()
+                self._tokens = min(self._tokens + tokens, self._burst)
+            raise
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self._tokens + (now - self._updated) * self._rate, self._burst
+        )
+        self._updated = now
+
+
+class SlidingWindow(RateLimiter):
+    """A limiter that allows at most ``limit`` tokens in any ``period`` seconds.
+
+    Unlike :class:`TokenBucket`, a whole ``limit`` can be spent at once, and
+    the limit is never exceeded in any window of ``period`` seconds.
+
+    Example:
+        >>> window = asyncx.SlidingWindow(limit=100, period=60.0)
+        >>> await window.acquire()
+    """
+
+    def __init__(self, limit: int, period: float) -> None:
+        """Creates a new empty window.
+
+        Args:
+            limit:
+                The maximum number of tokens in a window.
+            period:
+                The length of a window in seconds.
+        """
+        if limit < 1:
+            raise ValueError("limit must be positive")
+        if period <= 0:
+            raise ValueError("period must be positive")
+
+        self._limit = limit
+        self._period = period
+
+        self._lock = threading.Lock()
+        # Timestamps of acquired tokens in the current window
+        self._stamps: Deque[float] = collections.deque()
+
+    @property
+    def limit(self) -> int:
+        """The maximum number of tokens in a window."""
+        return self._limit
+
+    @property
+    def period(self) -> float:
+        """The length of a window in seconds."""
+        return self._period
+
+    def try_acquire(self, tokens: int = 1) -> bool:
+        return self._try_acquire(tokens) <= 0
+
+    async def acquire(self, tokens: int = 1) -> None:
+        if tokens > self._limit:
+            raise ValueError("tokens must not exceed limit")
+
+        while True:
+            delay = self._try_acquire(tokens)
+            if delay <= 0:
+                return
+            await asyncio.sleep(delay)
+
+    def _try_acquire(self, tokens: int) -> float:
+        """Acquire ``tokens`` and return ``0``, or return seconds to wait."""
+        with self._lock:
+            # Read the clock under the lock so that stamps are in order and never stale
+            now = time.monotonic()
+            stamps = self._stamps
+            while len(stamps) > 0 and stamps[0] <= now - self._period:
+                stamps.popleft()
+
+            excess = len(stamps) + tokens - self._limit
+            if excess > 0:
+                # Wait for enough tokens to leave the window
+                return stamps[excess - 1] + self._period - now
+            stamps.extend([now] * tokens)
+            return 0.0
+
+
+def rate_limited(
+    limiter: RateLimiter,
+    *,
+    tokens: int = 1,
+) -> Callable[[TAsyncCallable], TAsyncCallable]:
+    """A decorator to acquire tokens from a rate limiter before each call.
+
+    As limiters are thread-safe, the decorator can be combined with
+    :func:`dispatch` to share a limit among event loops.
+
+    Example:
+        >>> limiter = asyncx.TokenBucket(rate=50.0)
+        >>> @asyncx.dispatch(thread.get_loop)
+        ... @asyncx.rate_limited(limiter)
+        ... async def call_api(request: bytes) -> bytes:
+        ...     return await client.post(request)
+
+    Args:
+        limiter:
+            A rate limiter such as :class:`TokenBucket` or :class:`SlidingWindow`.
+        tokens:
+            The number of tokens acquired for each call.
+    """
+
+    def deco(func: TAsyncCallable) -> TAsyncCallable:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            await limiter.acquire(tokens)
+            return await func(*args, **kwargs)
+
+        return cast(TAsyncCallable, wrapper)
+
+    return deco
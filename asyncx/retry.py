@@ -0,0 +1,168 @@
+import asyncio
+import functools
+import random
+import threading
+from typing import Any, Callable, Optional, Tuple, Type, cast
+
+from ._types import TAsyncCallable
+
+
+class RetryBudget:
+    """A thread-safe budget that bounds retries to a ratio of requests.
+
+    Each request deposits ``ratio`` tokens and each retry withdraws one token.
+    While the budget is empty, failures are not retried, so retries add at most
+    ``ratio`` times the load of requests even when every request fails. The budget
+    starts full so that failures of the first requests can be retried.
+
+    Example:
+        >>> budget = asyncx.RetryBudget(ratio=0.1)
+        >>> @asyncx.retry(budget=budget)
+        ... async def fetch() -> bytes:
+        ...     return await client.get()
+    """
+
+    def __init__(self, ratio: float = 0.1, *, capacity: float = 10.0) -> None:
+        """Creates a new full budget.
+
+        Args:
+            ratio:
+                Tokens deposited by each request, i.e. the ratio of retries
+                to requests allowed in the long run.
+            capacity:
+                The maximum number of tokens, which bounds a burst of retries.
+        """
+        if ratio < 0:
+            raise ValueError("ratio must not be negative")
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        self._ratio = ratio
+        self._capacity = capacity
+
+        self._lock = threading.Lock()
+        self._tokens = capacity
+
+    @property
+    def tokens(self) -> float:
+        """The number of tokens in the budget."""
+        with self._lock:
+            return self._tokens
+
+    def deposit(self) -> None:
+        """Record a request."""
+        with self._lock:
+            self._tokens = min(self._tokens + self._ratio, self._capacity)
+
+    def try_withdraw(self) -> bool:
+        """Withdraw a token for a retry.
+
+        Returns:
+            ``True`` if the retry is allowed, otherwise ``False``.
+        """
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+def retry(
+    *,
+    attempts: int = 3,
+    retry_on: Tuple[Type[BaseException], ...] = (Exception,),
+    backoff: float = 0.1,
+    multiplier: float = 2.0,
+    max_backoff: float = 10.0,
+    jitter: bool = True,
+    attempt_timeout: Optional[float] = None,
+    timeout: Optional[float] = None,
+    budget: Optional[RetryBudget] = None,
+) -> Callable[[TAsyncCallable], TAsyncCallable]:
+    """A decorator to retry an async function with exponential backoff.
+
+    The ``n``-th retry sleeps ``backoff * multiplier ** (n - 1)`` seconds, capped by
+    ``max_backoff``. With ``jitter``, a random duration between zero and that
+    backoff is used instead, which spreads retries of many callers over time.
+
+    A failure is not retried when ``attempts`` are exhausted, when ``budget`` is
+    empty, or when the next attempt would start after the ``timeout`` deadline.
+    In these cases the exception of the last attempt is raised. Cancellation of
+    the caller is never retried.
+
+    Example:
+        >>> @asyncx.retry(attempts=5, attempt_timeout=1.0, timeout=3.0)
+        ... async def fetch() -> bytes:
+        ...     return await client.get()
+
+    Args:
+        attempts:
+            The maximum number of attempts including the first one.
+        retry_on:
+            Exception types to retry. Other exceptions are raised immediately.
+        backoff:
+            Seconds to sleep before the first retry.
+        multiplier:
+            The factor by which the backoff grows for each retry.
+        max_backoff:
+            The maximum backoff in seconds.
+        jitter:
+            If ``False`` is specified, the backoff is used as is.
+        attempt_timeout:
+            Seconds to wait for each attempt. An attempt that times out raises
+            :class:`asyncio.TimeoutError`, which is retried if it matches
+            ``retry_on``.
+        timeout:
+            Seconds to wait for all attempts including backoff. If it expires
+            during an attempt, the attempt is cancelled and
+            :class:`asyncio.TimeoutError` is raised.
+        budget:
+            A :class:`RetryBudget` object shared among calls to limit retries.
+    """
+    if attempts < 1:
+        raise ValueError("attempts must be positive")
+
+    def deco(func: TAsyncCallable) -> TAsyncCallable:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            loop = asyncio.get_running_loop()
+            deadline = None if timeout is None else loop.time() + timeout
+            if budget is not None:
+                budget.deposit()
+
+            for attempt in range(attempts):
+                wait: Optional[float] = attempt_timeout
+                if deadline is not None:
+                    remaining = deadline - loop.time()
+                    if wait is None or remaining < wait:
+                        wait = remaining
+
+                try:
+                    if wait is None:
+                        return await func(*args, **kwargs)
+                    return await asyncio.wait_for(func(*args, **kwargs), wait)
+                except asyncio.CancelledError:
+                    # It is a subclass of Exception before Python 3.8
+                    raise
+                except retry_on:
+                    if attempt + 1 >= attempts:
+                        raise
+                    if deadline is not None and loop.time() >= deadline:
+                        raise
+
+                    delay = min(backoff * multiplier**attempt, max_backoff)
+                    if jitter:
+                        delay = random.uniform(0.0, delay)
+                    if deadline is not None and loop.time() + delay >= deadline:
+                        raise
+                    if budget is not None and not budget.try_withdraw():
+                        raise
+
+                # Sleep outside the except clause not to chain exceptions
+                await asyncio.sleep(delay)
+
+            raise AssertionError("unreachable")
+
+        return cast(TAsyncCallable, wrapper)
+
+    return deco
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import threading
+import weakref
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    MutableMapping,
+    Optional,
+    TypeVar,
+    cast,
+)
+
+from ._types import TAsyncCallable
+
+TReturn = TypeVar("TReturn")
+
+
+class _Call:
+    __slots__ = ("future", "waiters", "expiry")
+
+    def __init__(self, future: asyncio.Future[Any]) -> None:
+        self.future = future
+        self.waiters = 0
+        self.expiry: Optional[asyncio.TimerHandle] = None
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one shared call.
+
+    The first caller with a key starts the call, and the other callers with the key
+    await the same shielded future until it is done. A caller being cancelled does
+    not cancel the shared call unless no other caller is waiting for it. The result
+    can be kept for ``ttl`` seconds to be returned to later callers, while failures
+    are never kept.
+
+    Calls are shared only among callers running on the same event loop, and
+    the object can be used from multiple event loops at the same time.
+
+    Example:
+        >>> flight = asyncx.SingleFlight()
+        >>> async def get(key: str) -> bytes:
+        ...     return await flight.do(key, lambda: backend.get(key))
+        ...
+        >>> await asyncio.gather(*[get("foo") for _ in range(100)])  # 1 backend call
+    """
+
+    def __init__(self, *, ttl: Optional[float] = None) -> None:
+        """Creates a new object.
+
+        Args:
+            ttl:
+                Seconds to keep the result of a successful call. If :obj:`None`
+                is specified, the result is dropped as soon as the call is done.
+        """
+        if ttl is not None and ttl < 0:
+            raise ValueError("ttl must not be negative")
+
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._calls: MutableMapping[
+            asyncio.AbstractEventLoop, Dict[Hashable, _Call]
+        ] = weakref.WeakKeyDictionary()
+
+    async def do(
+        self, key: Hashable, factory: Callable[[], Awaitable[TReturn]]
+    ) -> TReturn:
+        """Await the call with ``key``, starting it by ``factory`` if none is shared.
+
+        Args:
+            key: A hashable key to identify the call.
+            factory:
+                A callable that creates an awaitable. It is called only if there is
+                no call with ``key`` in flight or kept.
+
+        Returns:
+            The result of the shared call.
+        """
+        calls = self._get_calls(asyncio.get_running_loop())
+        call = calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(factory()))
+            calls[key] = call
+            call.future.add_done_callback(
+                functools.partial(self._on_done, calls, key, call)
+            )
+
+        call.waiters += 1
+        try:
+            return cast(TReturn, await asyncio.shield(call.future))
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.future.done():
+                # Every waiter has gone, so nobody needs the result
+                if calls.get(key) is call:
+                    del calls[key]
+                call.future.cancel()
+
+    def forget(self, key: Hashable) -> None:
+        """Drop the call with ``key`` of the running event loop.
+
+        Callers already waiting for the call keep waiting for it, but later callers
+        start a new call.
+        """
+        calls = self._get_calls(asyncio.get_running_loop())
+        call = calls.pop(key, None)
+        if call is not None and call.expiry is not None:
+            call.expiry.cancel()
+
+    def _get_calls(self, loop: asyncio.AbstractEventLoop) -> Dict[Hashable, _Call]:
+        with self._lock:
+            calls = self._calls.get(loop)
+            if calls is None:
+                calls = {}
+                self._calls[loop] = calls
+            return calls
+
+    def _on_done(
+        self,
+        calls: Dict[Hashable, _Call],
+        key: Hashable,
+        call: _Call,
+        future: asyncio.Future[Any],
+    ) -> None:
+        if calls.get(key) is not call:
+            return
+        if self._ttl is None or future.cancelled() or future.exception() is not None:
+            del calls[key]
+        else:
+            call.expiry = future.get_loop().call_later(
+                self._ttl, self._expire, calls, key, call
+            )
+
+    def _expire(self, calls: Dict[Hashable, _Call], key: Hashable, call: _Call) -> None:
+        if calls.get(key) is call:
+            del calls[key]
+
+
+def singleflight(
+    *,
+    key: Optional[Callable[..., Hashable]] = None,
+    ttl: Optional[float] = None,
+) -> Callable[[TAsyncCallable], TAsyncCallable]:
+    """A decorator to coalesce concurrent calls of an async function.
+
+    Concurrent calls with the same arguments share one call of the function with
+    :class:`SingleFlight`.
+
+    Example:
+        >>> @asyncx.singleflight(ttl=1.0)
+        ... async def fetch(url: str) -> bytes:
+        ...     return await client.get(url)
+
+    Args:
+        key:
+            A callable that takes the arguments of a call and returns its key. If
+            :obj:`None` is specified, the arguments themselves are used as the key,
+            so they must be hashable.
+        ttl:
+            Seconds to keep the result of a successful call.
+    """
+
+    def deco(func: TAsyncCallable) -> TAsyncCallable:
+        flight = SingleFlight(ttl=ttl)
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if key is not None:
+                k = key(*args, **kwargs)
+            else:
+                k = (args, tuple(sorted(kwargs.items())))
+            return await flight.do(k, lambda: func(*args, **kwargs))
+
+        return cast(TAsyncCallable, wrapper)
+
+    return deco
@@ -1,14 +1,144 @@
 from __future__ import annotations
 
 import asyncio
+import collections
 import concurrent.futures
+import contextvars
+import os
 import threading
-from typing import Any, Coroutine, Optional, TypeVar
+from typing import (
+    Any,
+    Callable,
+    Coroutine,
+    Deque,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TypeVar,
+    cast,
+)
+
+from .admission import AdmissionController
+from .monitor import LoopMonitor
+from .tracing import _begin_hop
 
 TReturn = TypeVar("TReturn")
 TSelf = TypeVar("TSelf", bound="EventLoopThread")
 
 
+class ShutdownResult(NamedTuple):
+    """The outcome of :meth:`EventLoopThread.drain`."""
+
+    completed: int
+    """The number of tasks that finished before the deadline."""
+    cancelled: int
+    """The number of tasks that were cancelled at the deadline and finished."""
+    leaked: int
+    """The number of tasks that did not finish even after being cancelled."""
+
+
+_Submission = Tuple[
+    Coroutine[Any, Any, Any],
+    "concurrent.futures.Future[Any]",
+    Optional[contextvars.Context],
+    float,
+]
+
+
+class _SyncWaiter:
+    # A one-shot completion primitive for run_coroutine_sync(). A bare lock is
+    # cheaper than concurrent.futures.Future, which allocates a condition variable.
+    __slots__ = ("lock", "task", "abandoned", "result", "exception")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.lock.acquire()
+        self.task: Optional[asyncio.Task[Any]] = None
+        self.abandoned = False
+        self.result: Any = None
+        self.exception: Optional[BaseException] = None
+
+    def start(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        coro: Coroutine[Any, Any, Any],
+    ) -> None:
+        if self.abandoned:
+            coro.close()
+            return
+        try:
+            self.task = loop.create_task(coro)
+        except BaseException as ex:
+            coro.close()
+            self.exception = ex
+            self.lock.release()
+            return
+        self.task.add_done_callback(self._on_done)
+
+    def cancel(self) -> None:
+        self.abandoned = True
+        if self.task is not None:
+            self.task.cancel()
+
+    def _on_done(self, task: asyncio.Task[Any]) -> None:
+        if task.cancelled():
+            self.exception = concurrent.futures.CancelledError()
+        else:
+            self.exception = task.exception()
+            if self.exception is None:
+                self.result = task.result()
+        self.lock.release()
+
+
+def _start_submission(
+    loop: asyncio.AbstractEventLoop,
+    coro: Coroutine[Any, Any, Any],
+    future: concurrent.futures.Future[Any],
+    context: Optional[contextvars.Context],
+) -> None:
+    # Runs on the event loop thread, mirroring asyncio.run_coroutine_threadsafe
+    if future.cancelled():
+        coro.close()
+        # Notify waiters such as concurrent.futures.wait()
+        future.set_running_or_notify_cancel()
+        return
+
+    try:
+        if context is None:
+            task = loop.create_task(coro)
+        else:
+            task = context.run(loop.create_task, coro)
+    except BaseException as ex:
+        coro.close()
+        if future.set_running_or_notify_cancel():
+            future.set_exception(ex)
+        return
+
+    def task_done(t: asyncio.Future[Any]) -> None:
+        if t.cancelled():
+            future.cancel()
+        if not future.set_running_or_notify_cancel():
+            return
+        exc = t.exception()
+        if exc is not None:
+            future.set_exception(exc)
+        else:
+            future.set_result(t.result())
+
+    def future_done(f: concurrent.futures.Future[Any]) -> None:
+        if f.cancelled() and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(task.cancel)
+            except RuntimeError:
+                # The loop is closed concurrently
+                pass
+
+    task.add_done_callback(task_done)
+    future.add_done_callback(future_done)
+
+
 class EventLoopThread(threading.Thread):
     """An event loop thread that provides thread-safe utility functions.
 
@@ -37,6 +167,15 @@ class EventLoopThread(threading.Thread):
         loop_policy: Optional[asyncio.AbstractEventLoopPolicy] = None,
         daemon: bool = False,
         start: bool = False,
+        coalesce: bool = False,
+        *,
+        loop_factory: Optional[Callable[[], asyncio.AbstractEventLoop]] = None,
+        on_loop_ready: Optional[Callable[[asyncio.AbstractEventLoop], None]] = None,
+        monitor: Optional[LoopMonitor] = None,
+        max_in_flight: Optional[int] = None,
+        overflow: str = "block",
+        name: Optional[str] = None,
+        cpu_affinity: Optional[Iterable[int]] = None,
     ) -> None:
         """Creates a new event loop thread.
 
@@ -53,39 +192,153 @@ class EventLoopThread(threading.Thread):
                     https://docs.python.org/3/library/threading.html#threading.Thread.daemon
             start:
                 If ``True`` is specified, the thread is started immediately.
+            coalesce:
+                If ``True`` is specified, coroutines submitted by
+                :meth:`run_coroutine_concurrent` are queued and submissions arriving
+                before the event loop picks them up share a single wake-up of the loop.
+            loop_factory:
+                A callable that creates a new event loop, such as ``uvloop.new_event_loop``.
+                It is called on the new thread. ``loop_policy`` cannot be specified
+                together.
+            on_loop_ready:
+                A callable that receives the new event loop on the new thread before
+                the loop serves any coroutine. It can be used to tune the loop,
+                for example to install a task factory or to change
+                ``slow_callback_duration``. An exception raised by the callable is
+                propagated from :meth:`start`.
+            monitor:
+                A :class:`LoopMonitor` object that collects health metrics of the loop
+                and submissions to it. A monitor cannot be shared among threads.
+            max_in_flight:
+                The maximum number of submitted coroutines that are not finished yet.
+                If :obj:`None` is specified, submissions are not limited.
+            overflow:
+                The policy applied to a submission when ``max_in_flight`` coroutines are
+                in flight. One of ``"block"``, ``"await"``, ``"reject"`` or
+                ``"shed_oldest"``. See :class:`AdmissionController` for details.
+                A submission from the thread itself is rejected instead of blocking
+                in order to avoid a deadlock.
+            name:
+                The name of the thread. Refer to `threading.Thread.name`_ for
+                further details.
+
+                .. _threading.Thread.name:
+                    https://docs.python.org/3/library/threading.html#threading.Thread.name
+            cpu_affinity:
+                A set of CPUs on which the thread is allowed to run. It is applied
+                with ``os.sched_setaffinity`` on the new thread before the event loop
+                is created. Only available on platforms that support
+                ``os.sched_setaffinity`` such as Linux.
+
+        Raises:
+            ValueError:
+                If both ``loop_policy`` and ``loop_factory`` are specified,
+                ``max_in_flight`` or ``overflow`` is invalid, or ``cpu_affinity`` is
+                empty.
+            RuntimeError:
+                If ``cpu_affinity`` is specified on an unsupported platform.
         """
+        if loop_policy is not None and loop_factory is not None:
+            raise ValueError(
+                "loop_policy and loop_factory cannot be specified together"
+            )
+
+        self._cpu_affinity: Optional[Tuple[int, ...]] = None
+        if cpu_affinity is not None:
+            if not hasattr(os, "sched_setaffinity"):
+                raise RuntimeError("CPU affinity is not supported on this platform")
+            self._cpu_affinity = tuple(sorted(set(cpu_affinity)))
+            if len(self._cpu_affinity) == 0:
+                raise ValueError("cpu_affinity cannot be empty")
+
         self._loop_policy = loop_policy
+        self._loop_factory = loop_factory
+        self._on_loop_ready = on_loop_ready
+        self._monitor = monitor
+        self._admission: Optional[AdmissionController] = None
+        if max_in_flight is not None:
+            self._admission = AdmissionController(max_in_flight, overflow)
+        self._coalesce = coalesce
 
         self._lock = threading.Lock()
         self._future: concurrent.futures.Future[None] = concurrent.futures.Future()
         self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # A pair of the running loop and its bound ``call_soon_threadsafe``, published
+        # at once so that hot paths can read both with a single attribute access
+        self._running: Optional[
+            Tuple[asyncio.AbstractEventLoop, Callable[..., Any]]
+        ] = None
 
-        super().__init__(target=self._target_impl, daemon=daemon)
+        self._submission_lock = threading.Lock()
+        self._submissions: Deque[_Submission] = collections.deque()
+        self._flush_scheduled = False
+
+        super().__init__(target=self._target_impl, name=name, daemon=daemon)
 
         if start:
             self.start()
 
     def _target_impl(self) -> None:
         future = self._future
-        loop: asyncio.AbstractEventLoop
+        loop: Optional[asyncio.AbstractEventLoop] = None
         try:
-            loop_policy = self._loop_policy
-            if loop_policy is None:
-                loop_policy = asyncio.get_event_loop_policy()
-
-            loop = loop_policy.new_event_loop()
-        except Exception as ex:
+            if self._cpu_affinity is not None:
+                # pid 0 designates the calling thread on Linux
+                os.sched_setaffinity(0, self._cpu_affinity)
+
+            loop_factory = self._loop_factory
+            if loop_factory is None:
+                loop_policy = self._loop_policy
+                if loop_policy is None:
+                    loop_policy = asyncio.get_event_loop_policy()
+                loop_factory = loop_policy.new_event_loop
+
+            loop = loop_factory()
+            asyncio.set_event_loop(loop)
+            if self._on_loop_ready is not None:
+                self._on_loop_ready(loop)
+            if self._monitor is not None:
+                self._monitor.attach(loop)
+        except BaseException as ex:
+            if loop is not None:
+                asyncio.set_event_loop(None)
+                loop.close()
             future.set_exception(ex)
+            return
 
         try:
             self._loop = loop
+            self._running = (loop, loop.call_soon_threadsafe)
             future.set_result(None)
 
-            asyncio.set_event_loop(loop)
             loop.run_forever()
         finally:
+            self._running = None
             self._loop = None
 
+            with self._submission_lock:
+                dropped = list(self._submissions)
+                self._submissions.clear()
+            self._discard_submissions(dropped)
+
+            asyncio.set_event_loop(None)
+            loop.close()
+
+    @property
+    def cpu_affinity(self) -> Optional[Tuple[int, ...]]:
+        """The set of CPUs given to the constructor."""
+        return self._cpu_affinity
+
+    @property
+    def monitor(self) -> Optional[LoopMonitor]:
+        """The :class:`LoopMonitor` object given to the constructor."""
+        return self._monitor
+
+    @property
+    def admission(self) -> Optional[AdmissionController]:
+        """The :class:`AdmissionController` object if ``max_in_flight`` is specified."""
+        return self._admission
+
     def get_loop(self) -> asyncio.AbstractEventLoop:
         """Get an event loop of the running thread.
 
@@ -118,6 +371,9 @@ class EventLoopThread(threading.Thread):
             RuntimeError:
                 If the thread is already terminated.
         """
+        if self._running is not None:
+            return
+
         with self._lock:
             if self.is_alive():
                 return
@@ -151,12 +407,96 @@ class EventLoopThread(threading.Thread):
         if loop is None:
             return
 
+        self._running = None
         running_loop = loop
         assert isinstance(running_loop, asyncio.AbstractEventLoop)
-        running_loop.call_soon_threadsafe(lambda: running_loop.stop())
+        try:
+            running_loop.call_soon_threadsafe(lambda: running_loop.stop())
+        except RuntimeError:
+            # The loop is already closed by another shutdown
+            pass
         if join:
             self.join()
 
+    def drain(
+        self,
+        timeout: Optional[float] = None,
+        *,
+        cancel_timeout: Optional[float] = 1.0,
+    ) -> ShutdownResult:
+        """Gracefully shutdown the running event loop and wait for the thread to be terminated.
+
+        The method stops accepting new submissions, waits for pending tasks up to
+        ``timeout`` seconds, cancels the remaining tasks and waits for them up to
+        ``cancel_timeout`` seconds. Then it finalizes async generators, shuts down
+        the default executor, and closes the event loop.
+
+        If the event loop is not running, it returns immediately.
+
+        Example:
+            >>> thread = EventLoopThread(start=True)
+            >>> thread.run_coroutine_concurrent(asyncio.sleep(0.1))
+            >>> thread.run_coroutine_concurrent(asyncio.sleep(10))
+            >>> thread.drain(timeout=1.0)
+            ShutdownResult(completed=1, cancelled=1, leaked=0)
+
+        Args:
+            timeout:
+                Seconds to wait for pending tasks. If :obj:`None` is specified,
+                the method waits until all tasks are finished.
+            cancel_timeout:
+                Seconds to wait for the cancelled tasks. If :obj:`None` is specified,
+                the method waits until all cancelled tasks are finished.
+
+        Returns:
+            A :class:`ShutdownResult` object that reports the number of tasks.
+
+        Raises:
+            RuntimeError:
+                If the method is called by the same thread as ``self.loop``.
+        """
+        if threading.get_ident() == self.ident:
+            raise RuntimeError("Cannot drain the event loop from its own thread")
+
+        future = self.begin_drain(timeout, cancel_timeout=cancel_timeout)
+        if future is None:
+            return ShutdownResult(0, 0, 0)
+
+        result = future.result()
+        self.join()
+        return result
+
+    def begin_drain(
+        self,
+        timeout: Optional[float] = None,
+        *,
+        cancel_timeout: Optional[float] = 1.0,
+    ) -> Optional[concurrent.futures.Future[ShutdownResult]]:
+        """Start :meth:`drain` without waiting for its completion.
+
+        This is useful to drain several threads concurrently.
+
+        Returns:
+            A :class:`concurrent.future.Future` object that returns the result of
+            :meth:`drain`, or :obj:`None` if the event loop is not running or is already
+            shutting down.
+        """
+        with self._lock:
+            # Only one of concurrent callers drains the loop
+            running = self._running
+            if running is None:
+                return None
+            self._running = None
+
+        loop, _ = running
+        future = asyncio.run_coroutine_threadsafe(
+            _drain_loop(timeout, cancel_timeout),
+            loop,
+        )
+        # Stop the loop after the result is handed back to the caller
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(loop.stop))
+        return future
+
     def __enter__(self: TSelf) -> TSelf:
         """Initialize the event loop if it is not started."""
         self.start()
@@ -177,9 +517,292 @@ class EventLoopThread(threading.Thread):
         Returns:
             A :class:`concurrent.future.Future` object that returns the execution result of
             a given coroutine.
+
+        Raises:
+            OverloadedError:
+                If ``max_in_flight`` coroutines are in flight and the submission is
+                rejected by the overflow policy.
+        """
+        admission = self._admission
+        if admission is None:
+            return self._submit(coro)
+
+        if self._running is None:
+            raise RuntimeError("Thread is not running")
+        if not asyncio.iscoroutine(coro):
+            raise TypeError("A coroutine object is required")
+
+        victims = admission.acquire(blocking=threading.get_ident() != self.ident)
+        return self._submit_admitted(admission, [coro], victims)[0]
+
+    def _submit(
+        self, coro: Coroutine[Any, Any, TReturn]
+    ) -> concurrent.futures.Future[TReturn]:
+        running = self._running
+        if running is None:
+            raise RuntimeError("Thread is not running")
+
+        if not asyncio.iscoroutine(coro):
+            raise TypeError("A coroutine object is required")
+
+        loop, call_soon_threadsafe = running
+        future: concurrent.futures.Future[TReturn] = concurrent.futures.Future()
+        monitor = self._monitor
+        if self._coalesce:
+            stamp = 0.0 if monitor is None else monitor.on_submitted()
+            self._enqueue(loop, [(coro, future, contextvars.copy_context(), stamp)])
+        elif monitor is None:
+            call_soon_threadsafe(_start_submission, loop, coro, future, None)
+        else:
+            submissions: List[_Submission] = [
+                (coro, future, None, monitor.on_submitted())
+            ]
+            try:
+                call_soon_threadsafe(self._start_submissions, loop, submissions)
+            except BaseException:
+                self._discard_submissions(submissions)
+                raise
+        return future
+
+    def submit_many(
+        self, coros: Iterable[Coroutine[Any, Any, TReturn]]
+    ) -> List[concurrent.futures.Future[TReturn]]:
+        """Submit coroutines in the event loop with a single wake-up of the loop.
+
+        Example:
+            >>> with EventLoopThread() as thread:
+            ...     futures = thread.submit_many(_get_ident() for _ in range(100))
+            ...     done, _ = concurrent.futures.wait(futures)
+
+        Args:
+            coros: `Coroutine` objects to run.
+
+        Returns:
+            A list of :class:`concurrent.future.Future` objects, each of which returns the
+            execution result of the corresponding coroutine.
+
+        Raises:
+            ValueError:
+                If more than ``max_in_flight`` coroutines are given.
+            OverloadedError:
+                If ``max_in_flight`` coroutines are in flight and the submission is
+                rejected by the overflow policy.
+        """
+        admission = self._admission
+        if admission is None:
+            return self._submit_many(coros)
+
+        if self._running is None:
+            raise RuntimeError("Thread is not running")
+        coro_list = list(coros)
+        if not all(asyncio.iscoroutine(c) for c in coro_list):
+            for coro in coro_list:
+                if asyncio.iscoroutine(coro):
+                    coro.close()
+            raise TypeError("A coroutine object is required")
+        if len(coro_list) == 0:
+            return []
+
+        try:
+            victims = admission.acquire(
+                len(coro_list), blocking=threading.get_ident() != self.ident
+            )
+        except BaseException:
+            for coro in coro_list:
+                coro.close()
+            raise
+        return self._submit_admitted(admission, coro_list, victims)
+
+    def _submit_admitted(
+        self,
+        admission: AdmissionController,
+        coros: List[Coroutine[Any, Any, TReturn]],
+        victims: List[Any],
+    ) -> List[concurrent.futures.Future[TReturn]]:
+        try:
+            if len(coros) == 1:
+                futures = [self._submit(coros[0])]
+            else:
+                futures = self._submit_many(coros)
+        except BaseException:
+            admission.rollback(len(coros), victims)
+            raise
+
+        for future in futures:
+            admission.register(future)
+        for victim in victims:
+            victim.cancel()
+        return futures
+
+    def _submit_many(
+        self, coros: Iterable[Any]
+    ) -> List[concurrent.futures.Future[Any]]:
+        # Callers may pass non-coroutines in spite of the annotation of submit_many
+        running = self._running
+        if running is None:
+            raise RuntimeError("Thread is not running")
+
+        loop, _ = running
+        submissions: List[_Submission] = []
+        futures: List[concurrent.futures.Future[Any]] = []
+        for coro in coros:
+            if not asyncio.iscoroutine(coro):
+                for submission in submissions:
+                    submission[0].close()
+                raise TypeError("A coroutine object is required")
+
+            future: concurrent.futures.Future[Any] = concurrent.futures.Future()
+            submissions.append((coro, future, None, 0.0))
+            futures.append(future)
+
+        if len(submissions) == 0:
+            return futures
+
+        monitor = self._monitor
+        if monitor is not None:
+            stamp = monitor.on_submitted(len(submissions))
+            submissions = [(c, f, ctx, stamp) for c, f, ctx, _ in submissions]
+
+        if self._coalesce:
+            # The flush runs in the context of whoever scheduled it, so carry ours
+            context = contextvars.copy_context()
+            self._enqueue(loop, [(c, f, context, st) for c, f, _, st in submissions])
+            return futures
+
+        try:
+            loop.call_soon_threadsafe(self._start_submissions, loop, submissions)
+        except BaseException:
+            self._discard_submissions(submissions)
+            raise
+        return futures
+
+    def _enqueue(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        submissions: List[_Submission],
+    ) -> None:
+        with self._submission_lock:
+            self._submissions.extend(submissions)
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+
+        try:
+            loop.call_soon_threadsafe(self._flush_submissions, loop)
+        except BaseException:
+            with self._submission_lock:
+                self._flush_scheduled = False
+                dropped = list(self._submissions)
+                self._submissions.clear()
+            self._discard_submissions(dropped)
+            raise
+
+    def _flush_submissions(self, loop: asyncio.AbstractEventLoop) -> None:
+        with self._submission_lock:
+            self._flush_scheduled = False
+            submissions = list(self._submissions)
+            self._submissions.clear()
+
+        self._start_submissions(loop, submissions)
+
+    def _start_submissions(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        submissions: List[_Submission],
+    ) -> None:
+        monitor = self._monitor
+        if monitor is not None:
+            monitor.on_started([s[3] for s in submissions])
+        for coro, future, context, _ in submissions:
+            _start_submission(loop, coro, future, context)
+
+    def _discard_submissions(self, submissions: List[_Submission]) -> None:
+        if len(submissions) == 0:
+            return
+        for coro, future, _, _ in submissions:
+            coro.close()
+            if future.cancel():
+                future.set_running_or_notify_cancel()
+        if self._monitor is not None:
+            self._monitor.on_dropped(len(submissions))
+
+    def run_coroutine_sync(
+        self,
+        coro: Coroutine[Any, Any, TReturn],
+        timeout: Optional[float] = None,
+    ) -> TReturn:
+        """Run a coroutine in the event loop and block the calling thread for its result.
+
+        The method is lighter than ``run_coroutine_concurrent(coro).result()`` and
+        cancels the coroutine on the event loop if it does not finish in time.
+
+        Example:
+            >>> with EventLoopThread() as thread:
+            ...     thread.run_coroutine_sync(_get_ident(), timeout=1.0) == thread.ident
+            True
+
+        Args:
+            coro: A `Coroutine` object to run.
+            timeout:
+                Seconds to wait for the result. If :obj:`None` is specified,
+                the method waits until the coroutine finishes.
+
+        Returns:
+            The execution result of a given coroutine.
+
+        Raises:
+            RuntimeError:
+                If the method is called by the same thread as ``self.loop``, which would
+                otherwise deadlock.
+            concurrent.futures.TimeoutError:
+                If the coroutine does not finish within ``timeout`` seconds. The coroutine
+                is cancelled.
+            concurrent.futures.CancelledError:
+                If the coroutine is cancelled.
+            OverloadedError:
+                If ``max_in_flight`` coroutines are in flight and the submission is
+                rejected by the overflow policy.
         """
-        loop = self.loop
-        return asyncio.run_coroutine_threadsafe(coro, loop)
+        if threading.get_ident() == self.ident:
+            raise RuntimeError(
+                "run_coroutine_sync cannot be called from the event loop thread"
+            )
+
+        running = self._running
+        if running is None:
+            raise RuntimeError("Thread is not running")
+        if not asyncio.iscoroutine(coro):
+            raise TypeError("A coroutine object is required")
+
+        if self._coalesce or self._monitor is not None or self._admission is not None:
+            # Go through the regular path so that every submission is accounted
+            future = self.run_coroutine_concurrent(coro)
+            try:
+                return future.result(timeout)
+            except concurrent.futures.TimeoutError:
+                future.cancel()
+                raise
+
+        loop, call_soon_threadsafe = running
+        waiter = _SyncWaiter()
+        try:
+            call_soon_threadsafe(waiter.start, loop, coro)
+        except RuntimeError:
+            # The loop is closed after the check above
+            coro.close()
+            raise
+        # An expired timeout still cancels the scheduled coroutine below
+        if not waiter.lock.acquire(timeout=-1 if timeout is None else max(timeout, 0)):
+            try:
+                call_soon_threadsafe(waiter.cancel)
+            except RuntimeError:
+                # The loop is already closed
+                pass
+            raise concurrent.futures.TimeoutError()
+
+        if waiter.exception is not None:
+            raise waiter.exception
+        return cast(TReturn, waiter.result)
 
     def run_coroutine(
         self,
@@ -196,9 +819,99 @@ class EventLoopThread(threading.Thread):
         Returns:
             A :class:`asyncio.Future` object that returns the execution result of a given
             coroutine.
+
+        Raises:
+            OverloadedError:
+                If ``max_in_flight`` coroutines are in flight and the submission is
+                rejected by the overflow policy.
         """
-        future = self.run_coroutine_concurrent(coro)
-        return asyncio.wrap_future(future, loop=loop)
+        return self._run_coroutine(coro, coro, loop)
+
+    def _run_coroutine(
+        self,
+        coro: Coroutine[Any, Any, TReturn],
+        origin: Coroutine[Any, Any, Any],
+        loop: Optional[asyncio.AbstractEventLoop],
+    ) -> asyncio.Future[TReturn]:
+        # A hop is reported under the name of ``origin``, which ``coro`` may wrap
+        hop = _begin_hop(origin) if asyncio.iscoroutine(origin) else None
+        if hop is not None:
+            coro = hop.run(coro)
+
+        admission = self._admission
+        try:
+            if admission is None or admission.overflow != "await":
+                future = self.run_coroutine_concurrent(coro)
+                ret = asyncio.wrap_future(future, loop=loop)
+            else:
+                if self._running is None:
+                    raise RuntimeError("Thread is not running")
+                if not asyncio.iscoroutine(coro):
+                    raise TypeError("A coroutine object is required")
+                ret = asyncio.ensure_future(
+                    self._run_admitted(admission, coro), loop=loop
+                )
+        except BaseException:
+            if hop is not None:
+                coro.close()
+            raise
+
+        if hop is not None:
+            ret.add_done_callback(hop.report)
+        return ret
+
+    async def _run_admitted(
+        self,
+        admission: AdmissionController,
+        coro: Coroutine[Any, Any, TReturn],
+    ) -> TReturn:
+        try:
+            victims = await admission.acquire_async()
+            (future,) = self._submit_admitted(admission, [coro], victims)
+        except BaseException:
+            coro.close()
+            raise
+        return await asyncio.wrap_future(future)
+
+
+async def _drain_loop(
+    timeout: Optional[float],
+    cancel_timeout: Optional[float],
+) -> ShutdownResult:
+    loop = asyncio.get_running_loop()
+    current = asyncio.current_task()
+    deadline = None if timeout is None else loop.time() + timeout
+
+    def other_tasks() -> List[asyncio.Task[Any]]:
+        return [t for t in asyncio.all_tasks() if t is not current]
+
+    completed = 0
+    tasks = other_tasks()
+    while len(tasks) > 0:
+        remaining = None if deadline is None else deadline - loop.time()
+        if remaining is not None and remaining <= 0:
+            break
+        done, _ = await asyncio.wait(tasks, timeout=remaining)
+        completed += len(done)
+        # Tasks may spawn new tasks while draining
+        tasks = other_tasks()
+
+    cancelled = 0
+    leaked = 0
+    if len(tasks) > 0:
+        for task in tasks:
+            task.cancel()
+        done, pending = await asyncio.wait(tasks, timeout=cancel_timeout)
+        cancelled = len(done)
+        leaked = len(pending)
+
+    await loop.shutdown_asyncgens()
+    shutdown_default_executor = getattr(loop, "shutdown_default_executor", None)
+    if shutdown_default_executor is not None:
+        # Python 3.9+
+        await shutdown_default_executor()
+
+    return ShutdownResult(completed=completed, cancelled=cancelled, leaked=leaked)
 
 
 def run_coroutine_in_thread(
@@ -236,4 +949,4 @@ def run_coroutine_in_thread(
         finally:
             thread.shutdown(join=False)
 
-    return thread.run_coroutine(impl(), loop=loop)
+    return thread._run_coroutine(impl(), coro, loop)
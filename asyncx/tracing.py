@@ -0,0 +1,131 @@
+import time
+from typing import (
+    Any,
+    Callable,
+    Coroutine,
+    Generator,
+    NamedTuple,
+    Optional,
+    TypeVar,
+    cast,
+)
+
+TReturn = TypeVar("TReturn")
+
+
+class HopTiming(NamedTuple):
+    """Timings of a coroutine that hopped to another event loop."""
+
+    name: str
+    """The qualified name of the coroutine."""
+    queue_delay: float
+    """Seconds from the submission to the target loop starting the coroutine."""
+    execution_time: float
+    """Seconds the coroutine took on the target loop."""
+    handback_delay: float
+    """Seconds from the coroutine finishing to the caller receiving its outcome."""
+
+
+HopObserver = Callable[[HopTiming], None]
+
+_observer: Optional[HopObserver] = None
+
+
+def set_hop_observer(observer: Optional[HopObserver]) -> None:
+    """Set a callback that receives timings of every hop between event loops.
+
+    Hops made by :func:`dispatch`, :func:`dispatch_coroutine`,
+    :meth:`EventLoopThread.run_coroutine` and :func:`run_coroutine_in_thread` are
+    reported. The callback is called in the caller's event loop after each hop
+    finishes, so it must be cheap and must not raise. While no callback is set,
+    hops are not timed at all.
+
+    Example:
+        >>> asyncx.set_hop_observer(lambda t: histograms[t.name].record(t.queue_delay))
+
+    Args:
+        observer:
+            A callable that takes a :class:`HopTiming` object, or :obj:`None` to stop
+            reporting.
+    """
+    global _observer
+    _observer = observer
+
+
+class _Hop:
+    __slots__ = ("_observer", "_name", "_submitted", "_started", "_finished")
+
+    def __init__(self, observer: HopObserver, name: str) -> None:
+        self._observer = observer
+        self._name = name
+        self._submitted = time.perf_counter()
+        self._started: Optional[float] = None
+        self._finished: Optional[float] = None
+
+    def run(self, coro: Coroutine[Any, Any, TReturn]) -> Coroutine[Any, Any, TReturn]:
+        return _TimedCoroutine(self, coro)
+
+    def report(self, *args: Any) -> None:
+        """Report timings if the coroutine has run. ``args`` are ignored."""
+        if self._started is None or self._finished is None:
+            return
+        self._observer(
+            HopTiming(
+                name=self._name,
+                queue_delay=self._started - self._submitted,
+                execution_time=self._finished - self._started,
+                handback_delay=time.perf_counter() - self._finished,
+            )
+        )
+
+
+class _TimedCoroutine(Coroutine[Any, Any, TReturn]):
+    # Unlike a wrapping ``async def``, closing it before it starts closes the wrapped
+    # coroutine, so no "never awaited" warning is emitted for it
+    __slots__ = ("_hop", "_coro")
+
+    def __init__(self, hop: _Hop, coro: Coroutine[Any, Any, TReturn]) -> None:
+        self._hop = hop
+        self._coro = coro
+
+    def send(self, value: Any) -> Any:
+        hop = self._hop
+        if hop._started is None:
+            hop._started = time.perf_counter()
+        try:
+            return self._coro.send(value)
+        except BaseException:
+            # StopIteration on return, or an exception raised by the coroutine
+            hop._finished = time.perf_counter()
+            raise
+
+    def throw(self, *args: Any) -> Any:
+        if self._hop._started is None:
+            # Cancelled before it started, so the exception is raised without running
+            self._coro.close()
+        try:
+            return self._coro.throw(*args)
+        except BaseException:
+            if self._hop._started is not None:
+                self._hop._finished = time.perf_counter()
+            raise
+
+    def close(self) -> None:
+        self._coro.close()
+
+    def __next__(self) -> Any:
+        return self.send(None)
+
+    def __iter__(self) -> "_TimedCoroutine[TReturn]":
+        return self
+
+    def __await__(self) -> Generator[Any, None, TReturn]:
+        # It implements the generator protocol, though it is not a Generator subclass
+        return cast(Generator[Any, None, TReturn], self)
+
+
+def _begin_hop(coro: Coroutine[Any, Any, Any]) -> Optional[_Hop]:
+    observer = _observer
+    if observer is None:
+        return None
+    return _Hop(observer, getattr(coro, "__qualname__", type(coro).__qualname__))
@@ -0,0 +1,109 @@
+"""Microbenchmarks of waiting on already finished awaitables, e.g. cache hits.
+
+Each case reports the time per call, the number of tasks created and
+the number of event loop iterations per call.
+
+Usage:
+    pip install -e . && python benchmarks/bench_coroutine.py [--n N] [--width W]
+"""
+import argparse
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, List
+
+import asyncx
+
+
+class _Counter:
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.tasks = 0
+        self.iterations = 0
+        self._loop = loop
+        self._factory = loop.get_task_factory()
+        loop.set_task_factory(self._create_task)
+        loop.call_soon(self._tick)
+
+    def _create_task(
+        self, loop: asyncio.AbstractEventLoop, coro: Any, **kwargs: Any
+    ) -> "asyncio.Future[Any]":
+        self.tasks += 1
+        if self._factory is not None:
+            return self._factory(loop, coro, **kwargs)
+        return asyncio.Task(coro, loop=loop, **kwargs)
+
+    def _tick(self) -> None:
+        self.iterations += 1
+        self._loop.call_soon(self._tick)
+
+
+async def _bench(
+    name: str,
+    make: Callable[[], Awaitable[Any]],
+    counter: _Counter,
+    n: int,
+) -> None:
+    tasks = counter.tasks
+    iterations = counter.iterations
+    begin = time.perf_counter()
+    for _ in range(n):
+        await make()
+    elapsed = time.perf_counter() - begin
+
+    print(
+        f"{name:<44} {elapsed / n * 1e6:8.3f} us/op"
+        f"  tasks {(counter.tasks - tasks) / n:5.2f}/op"
+        f"  loop iterations {(counter.iterations - iterations) / n:5.2f}/op"
+    )
+
+
+async def _main(n: int, width: int) -> None:
+    counter = _Counter(asyncio.get_running_loop())
+
+    def cached() -> List["asyncio.Future[int]"]:
+        return [asyncx.resolved(i) for i in range(width)]
+
+    async def raw_wait_all() -> None:
+        await asyncio.wait(cached())
+
+    async def raw_wait_any() -> None:
+        await asyncio.wait(cached(), return_when=asyncio.FIRST_COMPLETED)
+
+    async def gather_just() -> None:
+        await asyncio.gather(*[asyncx.just(i) for i in range(width)])
+
+    async def await_just() -> None:
+        await asyncx.just(0)
+
+    async def await_resolved() -> None:
+        await asyncx.resolved(0)
+
+    await _bench("await just(x)", await_just, counter, n)
+    await _bench("await resolved(x)", await_resolved, counter, n)
+    await _bench(f"asyncio.gather(just(x) * {width})", gather_just, counter, n)
+    await _bench(f"asyncio.wait(resolved * {width})", raw_wait_all, counter, n)
+    await _bench(
+        f"asyncx.wait_all(resolved * {width})",
+        lambda: asyncx.wait_all(*cached()),
+        counter,
+        n,
+    )
+    await _bench(f"asyncio.wait(FIRST_COMPLETED, {width})", raw_wait_any, counter, n)
+    await _bench(
+        f"asyncx.wait_any(resolved * {width})",
+        lambda: asyncx.wait_any(*cached()),
+        counter,
+        n,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=20000)
+    parser.add_argument("--width", type=int, default=8)
+    args = parser.parse_args()
+
+    asyncio.run(_main(args.n, args.width))
+
+
+if __name__ == "__main__":
+    main()
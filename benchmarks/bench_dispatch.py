@@ -0,0 +1,89 @@
+"""Microbenchmarks of the per-call overhead of :func:`asyncx.dispatch`.
+
+Usage:
+    pip install -e . && python benchmarks/bench_dispatch.py [--n N] [--repeat R]
+"""
+import argparse
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, List
+
+import asyncx
+
+
+async def _noop() -> None:
+    pass
+
+
+async def _bench(
+    name: str,
+    call: Callable[[], Awaitable[Any]],
+    n: int,
+    repeat: int,
+) -> None:
+    times: List[float] = []
+    for _ in range(repeat):
+        begin = time.perf_counter()
+        for _ in range(n):
+            await call()
+        times.append(time.perf_counter() - begin)
+
+    print(f"{name:<44} {min(times) / n * 1e6:8.3f} us/op")
+
+
+async def _main(thread: asyncx.EventLoopThread, n: int, repeat: int) -> None:
+    loop = asyncio.get_running_loop()
+
+    await _bench("plain call", _noop, n, repeat)
+    await _bench(
+        "dispatch_coroutine (same loop)",
+        lambda: asyncx.dispatch_coroutine(_noop(), loop),
+        n,
+        repeat,
+    )
+    await _bench(
+        "dispatch(selector) (same loop)",
+        asyncx.dispatch(asyncio.get_running_loop)(_noop),
+        n,
+        repeat,
+    )
+    await _bench(
+        "dispatch(selector, cache=True) (same loop)",
+        asyncx.dispatch(asyncio.get_running_loop, cache=True)(_noop),
+        n,
+        repeat,
+    )
+
+    n_cross = max(n // 10, 1)
+    await _bench(
+        "dispatch_coroutine (cross loop)",
+        lambda: asyncx.dispatch_coroutine(_noop(), thread.loop),
+        n_cross,
+        repeat,
+    )
+    await _bench(
+        "dispatch(selector) (cross loop)",
+        asyncx.dispatch(thread.get_loop)(_noop),
+        n_cross,
+        repeat,
+    )
+    await _bench(
+        "dispatch(selector, cache=True) (cross loop)",
+        asyncx.dispatch(thread.get_loop, cache=True)(_noop),
+        n_cross,
+        repeat,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with asyncx.EventLoopThread() as thread:
+        asyncio.run(_main(thread, args.n, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Microbenchmarks of the per-submission overhead of :class:`asyncx.EventLoopThread`.
+
+Usage:
+    pip install -e . && python benchmarks/bench_thread.py [--n N] [--repeat R]
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import time
+from typing import Any, Callable, Coroutine, List
+
+import asyncx
+
+
+async def _noop() -> None:
+    pass
+
+
+def _bench(
+    name: str,
+    submit: Callable[[Coroutine[Any, Any, None]], "concurrent.futures.Future[None]"],
+    n: int,
+    repeat: int,
+) -> None:
+    submit_times: List[float] = []
+    total_times: List[float] = []
+    for _ in range(repeat):
+        coros = [_noop() for _ in range(n)]
+        begin = time.perf_counter()
+        futures = [submit(c) for c in coros]
+        submitted = time.perf_counter()
+        concurrent.futures.wait(futures)
+        end = time.perf_counter()
+        submit_times.append(submitted - begin)
+        total_times.append(end - begin)
+
+    submit_us = min(submit_times) / n * 1e6
+    total_us = min(total_times) / n * 1e6
+    print(f"{name:<40} submit {submit_us:8.3f} us/op  round-trip {total_us:8.3f} us/op")
+
+
+def _bench_sync(
+    name: str,
+    run: Callable[[Coroutine[Any, Any, None]], None],
+    n: int,
+    repeat: int,
+) -> None:
+    times: List[float] = []
+    for _ in range(repeat):
+        coros = [_noop() for _ in range(n)]
+        begin = time.perf_counter()
+        for c in coros:
+            run(c)
+        times.append(time.perf_counter() - begin)
+
+    print(f"{name:<40} blocking round-trip {min(times) / n * 1e6:8.3f} us/op")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with asyncx.EventLoopThread() as thread:
+        loop = thread.loop
+        _bench(
+            "asyncio.run_coroutine_threadsafe",
+            lambda c: asyncio.run_coroutine_threadsafe(c, loop),
+            args.n,
+            args.repeat,
+        )
+        _bench(
+            "EventLoopThread.run_coroutine_concurrent",
+            thread.run_coroutine_concurrent,
+            args.n,
+            args.repeat,
+        )
+
+        _bench_sync(
+            "run_coroutine_concurrent(coro).result()",
+            lambda c: thread.run_coroutine_concurrent(c).result(),
+            args.n,
+            args.repeat,
+        )
+        _bench_sync(
+            "EventLoopThread.run_coroutine_sync",
+            thread.run_coroutine_sync,
+            args.n,
+            args.repeat,
+        )
+
+    with asyncx.EventLoopThread(coalesce=True) as thread:
+        _bench(
+            "EventLoopThread(coalesce=True)",
+            thread.run_coroutine_concurrent,
+            args.n,
+            args.repeat,
+        )
+
+
+if __name__ == "__main__":
+    main()
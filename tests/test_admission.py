@@ -0,0 +1,175 @@
+import asyncio
+import concurrent.futures
+import threading
+import time
+from typing import List
+
+import pytest
+
+import asyncx
+
+
+async def _wait_event(event: threading.Event) -> None:
+    while not event.is_set():
+        await asyncio.sleep(0.001)
+
+
+def test_admission_controller_invalid() -> None:
+    with pytest.raises(ValueError):
+        asyncx.AdmissionController(0)
+    with pytest.raises(ValueError):
+        asyncx.AdmissionController(1, "unknown")
+    with pytest.raises(ValueError):
+        asyncx.EventLoopThread(max_in_flight=1, overflow="unknown")
+
+
+def test_max_in_flight_reject() -> None:
+    release = threading.Event()
+    with asyncx.EventLoopThread(max_in_flight=2, overflow="reject") as thread:
+        admission = thread.admission
+        assert admission is not None
+
+        futures = [
+            thread.run_coroutine_concurrent(_wait_event(release)) for _ in range(2)
+        ]
+        assert admission.in_flight == 2
+
+        coro = _wait_event(release)
+        with pytest.raises(asyncx.OverloadedError):
+            thread.run_coroutine_concurrent(coro)
+        coro.close()
+
+        coros = [_wait_event(release) for _ in range(2)]
+        with pytest.raises(asyncx.OverloadedError):
+            thread.submit_many(coros)
+        for c in coros:
+            c.close()
+
+        release.set()
+        concurrent.futures.wait(futures)
+        assert admission.in_flight == 0
+        assert len(thread.submit_many(_wait_event(release) for _ in range(2))) == 2
+
+
+def test_max_in_flight_block() -> None:
+    release = threading.Event()
+    with asyncx.EventLoopThread(max_in_flight=1, overflow="block") as thread:
+        first = thread.run_coroutine_concurrent(_wait_event(release))
+
+        def release_later() -> None:
+            time.sleep(0.05)
+            release.set()
+
+        threading.Thread(target=release_later).start()
+        begin = time.monotonic()
+        second = thread.run_coroutine_concurrent(_wait_event(release))
+        assert time.monotonic() - begin >= 0.04
+        assert first.done()
+        second.result()
+
+        admission = thread.admission
+        assert admission is not None
+        assert admission.in_flight == 0
+
+
+def test_max_in_flight_block_same_thread() -> None:
+    release = threading.Event()
+    with asyncx.EventLoopThread(max_in_flight=1, overflow="block") as thread:
+
+        async def submit_from_loop() -> None:
+            coro = _wait_event(release)
+            try:
+                thread.run_coroutine_concurrent(coro)
+            finally:
+                coro.close()
+
+        with pytest.raises(asyncx.OverloadedError):
+            thread.run_coroutine_concurrent(submit_from_loop()).result()
+
+
+def test_max_in_flight_shed_oldest() -> None:
+    release = threading.Event()
+    with asyncx.EventLoopThread(max_in_flight=2, overflow="shed_oldest") as thread:
+        futures = [
+            thread.run_coroutine_concurrent(_wait_event(release)) for _ in range(4)
+        ]
+        time.sleep(0.01)
+        assert futures[0].cancelled()
+        assert futures[1].cancelled()
+        assert not futures[2].done()
+        assert not futures[3].done()
+
+        admission = thread.admission
+        assert admission is not None
+        assert admission.in_flight == 2
+
+        release.set()
+        concurrent.futures.wait(futures)
+        assert admission.in_flight == 0
+
+
+@pytest.mark.parametrize("overflow", ["block", "await", "reject", "shed_oldest"])
+def test_max_in_flight_oversized_batch(overflow: str) -> None:
+    release = threading.Event()
+    release.set()
+    with asyncx.EventLoopThread(max_in_flight=2, overflow=overflow) as thread:
+        with pytest.raises(ValueError):
+            thread.submit_many([_wait_event(release) for _ in range(3)])
+
+        admission = thread.admission
+        assert admission is not None
+        assert admission.in_flight == 0
+        futures = thread.submit_many([_wait_event(release) for _ in range(2)])
+        concurrent.futures.wait(futures)
+
+
+def test_admission_controller_batch() -> None:
+    admission = asyncx.AdmissionController(3)
+    admission.acquire(2)
+
+    def acquire_batch() -> None:
+        admission.acquire(2)
+
+    producer = threading.Thread(target=acquire_batch)
+    producer.start()
+    time.sleep(0.01)
+    # The waiting batch does not hold the free slot
+    assert admission.in_flight == 2
+    assert admission.waiting == 1
+
+    admission.release()
+    producer.join(timeout=1.0)
+    assert not producer.is_alive()
+    assert admission.in_flight == 3
+    assert admission.waiting == 0
+
+
+@pytest.mark.asyncio
+async def test_max_in_flight_await() -> None:
+    release = threading.Event()
+    order: List[int] = []
+
+    async def job(i: int) -> int:
+        await _wait_event(release)
+        order.append(i)
+        return i
+
+    with asyncx.EventLoopThread(max_in_flight=2, overflow="await") as thread:
+        admission = thread.admission
+        assert admission is not None
+
+        futures = [thread.run_coroutine(job(i)) for i in range(5)]
+        await asyncio.sleep(0.01)
+        assert admission.in_flight == 2
+        assert admission.waiting == 3
+
+        # A cancelled waiter passes its slot on
+        futures[2].cancel()
+        release.set()
+        results = await asyncio.gather(*futures, return_exceptions=True)
+        assert results[:2] == [0, 1]
+        assert isinstance(results[2], asyncio.CancelledError)
+        assert results[3:] == [3, 4]
+        assert sorted(order) == [0, 1, 3, 4]
+        assert admission.in_flight == 0
+        assert admission.waiting == 0
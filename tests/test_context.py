@@ -60,3 +60,154 @@ async def test_acontext_overload() -> None:
     assert task_context.cancelled()
     assert future_context.cancelled()
     assert ret == []
+
+
+def _raise_key_error() -> None:
+    # Not a raise statement, so that mypy does not consider what follows unreachable
+    raise KeyError("foo")
+
+
+@pytest.mark.asyncio
+async def test_task_scope() -> None:
+    async def fake(val: int) -> int:
+        await asyncio.sleep(val * 0.01)
+        return val
+
+    async with asyncx.TaskScope() as scope:
+        tasks = [scope.spawn(fake(v)) for v in [3, 1, 2]]
+
+    # The scope waits for all tasks
+    assert [t.result() for t in tasks] == [3, 1, 2]
+    # Finished tasks are dropped from the scope
+    assert scope.tasks == []
+
+    async with asyncx.TaskScope() as scope:
+        for _ in range(100):
+            scope.spawn(asyncio.sleep(0))
+        await asyncio.sleep(0.01)
+        assert scope.tasks == []
+        last = scope.spawn(fake(1))
+        assert scope.tasks == [last]
+
+    with pytest.raises(RuntimeError):
+        scope.spawn(fake(1))
+    with pytest.raises(RuntimeError):
+        async with scope:
+            pass
+
+
+@pytest.mark.asyncio
+async def test_task_scope_cancel() -> None:
+    cleaned: List[int] = []
+
+    async def fake(val: int) -> int:
+        try:
+            await asyncio.sleep(1.0)
+        finally:
+            # Cleanup that takes some time
+            await asyncio.shield(asyncio.sleep(0.01))
+            cleaned.append(val)
+        return val
+
+    with pytest.raises(KeyError):
+        async with asyncx.TaskScope() as scope:
+            tasks = [scope.spawn(fake(v)) for v in range(3)]
+            await asyncio.sleep(0.01)
+            _raise_key_error()
+
+    # Cancellation is awaited
+    assert all(t.cancelled() for t in tasks)
+    assert sorted(cleaned) == [0, 1, 2]
+
+    cleaned.clear()
+
+    async def run() -> None:
+        async with asyncx.TaskScope() as scope:
+            scope.spawn(fake(1))
+
+    task = asyncio.create_task(run())
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert cleaned == [1]
+
+
+@pytest.mark.asyncio
+async def test_task_scope_cancel_timeout() -> None:
+    async def stubborn() -> None:
+        try:
+            await asyncio.sleep(1.0)
+        finally:
+            await asyncio.shield(asyncio.sleep(0.2))
+
+    with pytest.raises(KeyError):
+        async with asyncx.TaskScope(cancel_timeout=0.01) as scope:
+            task = scope.spawn(stubborn())
+            await asyncio.sleep(0.01)
+            _raise_key_error()
+
+    # The task is still cleaning up after the deadline
+    assert not task.done()
+    await asyncio.wait([task])
+
+
+async def fake_value(val: int) -> int:
+    await asyncio.sleep(val * 0.01)
+    return val
+
+
+@pytest.mark.asyncio
+async def test_task_scope_error() -> None:
+    async def fail(val: int) -> int:
+        await asyncio.sleep(val * 0.01)
+        raise ValueError(val)
+
+    with pytest.raises(asyncx.TaskScopeError) as e:
+        async with asyncx.TaskScope() as scope:
+            slow: asyncio.Task[None] = scope.spawn(asyncio.sleep(1.0))
+            scope.spawn(fail(1))
+
+    assert [str(exc) for exc in e.value.exceptions] == ["1"]
+    assert slow.cancelled()
+
+    with pytest.raises(asyncx.TaskScopeError) as e:
+        async with asyncx.TaskScope(cancel_on_error=False) as scope:
+            ok = scope.spawn(fake_value(3))
+            scope.spawn(fail(2))
+            scope.spawn(fail(1))
+
+    assert [str(exc) for exc in e.value.exceptions] == ["1", "2"]
+    assert scope.exceptions == e.value.exceptions
+    assert ok.result() == 3
+
+
+@pytest.mark.asyncio
+async def test_task_scope_limit() -> None:
+    running = 0
+    max_running = 0
+
+    async def fake(val: int) -> int:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return val
+
+    async with asyncx.TaskScope(limit=2) as scope:
+        tasks = [scope.spawn(fake(v)) for v in range(6)]
+
+    assert [t.result() for t in tasks] == list(range(6))
+    assert max_running == 2
+
+    # Tasks waiting for the limit are cancelled without being started
+    with pytest.raises(KeyError):
+        async with asyncx.TaskScope(limit=1) as scope:
+            tasks = [scope.spawn(fake(v)) for v in range(3)]
+            await asyncio.sleep(0)
+            _raise_key_error()
+    assert all(t.cancelled() for t in tasks)
+
+    with pytest.raises(ValueError):
+        asyncx.TaskScope(limit=0)
@@ -1,5 +1,5 @@
 import asyncio
-from typing import Awaitable, List
+from typing import AsyncIterator, Awaitable, Iterator, List
 
 import pytest
 
@@ -59,6 +59,43 @@ async def test_wait_any_coro() -> None:
     assert ret == [1, 2, 3]
 
 
+@pytest.mark.asyncio
+async def test_wait_any_cancel_pending() -> None:
+    cancelled: List[int] = []
+
+    async def fake(s: int) -> int:
+        try:
+            await asyncio.sleep(s * 0.01)
+        except asyncio.CancelledError:
+            cancelled.append(s)
+            raise
+        return s
+
+    done = await asyncx.wait_any(fake(2), fake(1), fake(3), cancel_pending=True)
+    assert await done == 1
+    # Losers are cancelled and awaited before returning
+    assert sorted(cancelled) == [2, 3]
+
+    cancelled.clear()
+    task = asyncio.create_task(asyncx.wait_any(fake(2), fake(3), cancel_pending=True))
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert sorted(cancelled) == [2, 3]
+
+
+@pytest.mark.asyncio
+async def test_wait_any_deterministic() -> None:
+    loop = asyncio.get_running_loop()
+    futures: List[asyncio.Future[int]] = [loop.create_future() for _ in range(5)]
+    for i, f in enumerate(reversed(futures)):
+        f.set_result(i)
+
+    assert await asyncx.wait_any(*futures) is futures[0]
+    assert await asyncx.wait_any(*futures[2:]) is futures[2]
+
+
 @pytest.mark.asyncio
 async def test_wait_all_empty() -> None:
     with pytest.raises(ValueError):
@@ -93,3 +130,264 @@ async def test_wait_all_coro() -> None:
     assert len(done) == 3
     assert {await t for t in done} == {1, 2, 3}
     assert ret == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_wait_all_partial_timeout() -> None:
+    cancelled: List[int] = []
+
+    async def fake(s: int) -> int:
+        try:
+            await asyncio.sleep(s * 0.01)
+        except asyncio.CancelledError:
+            cancelled.append(s)
+            raise
+        return s
+
+    coros = [fake(30), fake(1), fake(2)]
+    done, pending = await asyncx.wait_all_partial(*coros, timeout=0.1)
+    assert [await f for f in done] == [1, 2]
+    assert len(pending) == 1 and not pending[0].done()
+    pending[0].cancel()
+
+    coros = [fake(30), fake(1), fake(40)]
+    done, pending = await asyncx.wait_all_partial(
+        *coros, timeout=0.05, cancel_pending=True
+    )
+    assert [await f for f in done] == [1]
+    assert len(pending) == 2 and all(f.cancelled() for f in pending)
+    assert cancelled == [30, 30, 40]
+
+    done, pending = await asyncx.wait_all_partial(fake(2), fake(1))
+    assert [await f for f in done] == [2, 1]
+    assert pending == []
+
+
+@pytest.mark.asyncio
+async def test_wait_all_partial_first_exception() -> None:
+    async def fail() -> int:
+        await asyncio.sleep(0.01)
+        raise ValueError("fail")
+
+    slow: asyncio.Task[None] = asyncio.create_task(asyncio.sleep(1.0))
+    done, pending = await asyncx.wait_all_partial(
+        asyncx.just(1), fail(), slow, first_exception=True, cancel_pending=True
+    )
+    assert len(done) == 2
+    assert done[0].result() == 1
+    assert isinstance(done[1].exception(), ValueError)
+    assert pending == [slow] and slow.cancelled()
+
+    with pytest.raises(ValueError):
+        await asyncx.wait_all_partial()
+
+
+@pytest.mark.asyncio
+async def test_wait_all_partial_cancel() -> None:
+    slow: asyncio.Task[None] = asyncio.create_task(asyncio.sleep(1.0))
+    task = asyncio.create_task(asyncx.wait_all_partial(slow, cancel_pending=True))
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert slow.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_resolved() -> None:
+    future = asyncx.resolved(42)
+    assert future.done()
+    assert await future == 42
+
+    loop = asyncio.get_running_loop()
+    assert asyncx.resolved("foo", loop=loop).get_loop() is loop
+
+
+def test_resolved_no_loop() -> None:
+    with pytest.raises(RuntimeError):
+        asyncx.resolved(42)
+
+    loop = asyncio.new_event_loop()
+    try:
+        future = asyncx.resolved(42, loop=loop)
+        assert loop.run_until_complete(future) == 42
+    finally:
+        loop.close()
+
+
+@pytest.mark.asyncio
+async def test_done_fast_path() -> None:
+    switched = False
+
+    def on_switch() -> None:
+        nonlocal switched
+        switched = True
+
+    loop = asyncio.get_running_loop()
+    futures = [asyncx.resolved(i) for i in range(3)]
+    pending = loop.create_future()
+
+    # None of these yield to the event loop
+    loop.call_soon(on_switch)
+    assert await asyncx.wait_any(pending, *futures) is futures[0]
+    assert await asyncx.wait_all(*futures, futures[0]) == futures
+    done, rest = await asyncx.wait_all_partial(*futures)
+    assert done == futures and rest == []
+    assert not switched
+
+    done, rest = await asyncx.wait_all_partial(*futures, pending, timeout=0)
+    assert done == futures and rest == [pending]
+
+    assert await asyncx.wait_any(pending, futures[1], cancel_pending=True) is futures[1]
+    assert pending.cancelled()
+
+
+async def _sleep_and_return(s: int) -> int:
+    await asyncio.sleep(s * 0.01)
+    return s
+
+
+@pytest.mark.asyncio
+async def test_as_completed() -> None:
+    tasks = [asyncio.create_task(_sleep_and_return(s)) for s in [3, 1, 2]]
+    ret = [await f async for f in asyncx.as_completed(*tasks, _sleep_and_return(0))]
+    assert ret == [0, 1, 2, 3]
+
+    with pytest.raises(ValueError):
+        async for _ in asyncx.as_completed():
+            pass
+
+
+@pytest.mark.asyncio
+async def test_as_completed_done_futures() -> None:
+    loop = asyncio.get_running_loop()
+    future: asyncio.Future[int] = loop.create_future()
+    future.set_result(42)
+    ret = [await f async for f in asyncx.as_completed(future, future)]
+    assert ret == [42]
+
+
+@pytest.mark.asyncio
+async def test_as_completed_early_exit() -> None:
+    tasks = [asyncio.create_task(_sleep_and_return(s)) for s in [1, 5, 10]]
+    iterator = asyncx.as_completed(*tasks)
+    async for f in iterator:
+        assert await f == 1
+        break
+    await iterator.aclose()
+
+    await asyncio.sleep(0)
+    assert not tasks[0].cancelled()
+    assert tasks[1].cancelled()
+    assert tasks[2].cancelled()
+
+
+@pytest.mark.asyncio
+async def test_as_completed_timeout() -> None:
+    tasks = [asyncio.create_task(_sleep_and_return(s)) for s in [1, 20]]
+    ret: List[int] = []
+    with pytest.raises(asyncio.TimeoutError):
+        async for f in asyncx.as_completed(*tasks, timeout=0.05):
+            ret.append(await f)
+    assert ret == [1]
+    await asyncio.sleep(0)
+    assert tasks[1].cancelled()
+
+    tasks = [asyncio.create_task(_sleep_and_return(s)) for s in [1, 3, 20]]
+    ret = []
+    with pytest.raises(asyncio.TimeoutError):
+        async for f in asyncx.as_completed(*tasks, item_timeout=0.05):
+            ret.append(await f)
+    assert ret == [1, 3]
+    await asyncio.sleep(0)
+    assert tasks[2].cancelled()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("ordered", [True, False])
+async def test_amap(ordered: bool) -> None:
+    running = 0
+    max_running = 0
+
+    async def double(x: int) -> int:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        # Later inputs finish earlier
+        await asyncio.sleep((10 - x) * 0.002)
+        running -= 1
+        return x * 2
+
+    ret = [x async for x in asyncx.amap(double, range(10), limit=3, ordered=ordered)]
+    if ordered:
+        assert ret == [x * 2 for x in range(10)]
+    else:
+        assert sorted(ret) == [x * 2 for x in range(10)]
+        assert ret != [x * 2 for x in range(10)]
+    assert max_running == 3
+
+    async def agen() -> AsyncIterator[int]:
+        for i in range(5):
+            await asyncio.sleep(0)
+            yield i
+
+    ret = [x async for x in asyncx.amap(double, agen(), limit=2, ordered=ordered)]
+    assert sorted(ret) == [0, 2, 4, 6, 8]
+
+    assert [x async for x in asyncx.amap(double, [], limit=2, ordered=ordered)] == []
+
+    with pytest.raises(ValueError):
+        async for _ in asyncx.amap(double, range(3), limit=0, ordered=ordered):
+            pass
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("ordered", [True, False])
+async def test_amap_lazy_and_cancel(ordered: bool) -> None:
+    pulled: List[int] = []
+    started: List[int] = []
+    cancelled: List[int] = []
+
+    def inputs() -> Iterator[int]:
+        for i in range(1000):
+            pulled.append(i)
+            yield i
+
+    async def func(x: int) -> int:
+        started.append(x)
+        try:
+            await asyncio.sleep(0.01 if x == 0 else 1.0)
+        except asyncio.CancelledError:
+            cancelled.append(x)
+            raise
+        return x
+
+    iterator = asyncx.amap(func, inputs(), limit=4, ordered=ordered)
+    async for x in iterator:
+        assert x == 0
+        break
+    await iterator.aclose()
+    await asyncio.sleep(0)
+
+    assert len(pulled) <= 5
+    assert sorted(cancelled) == sorted(started[1:])
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("ordered", [True, False])
+async def test_amap_exception(ordered: bool) -> None:
+    cancelled: List[int] = []
+
+    async def func(x: int) -> int:
+        try:
+            await asyncio.sleep(0.01 if x == 1 else 1.0)
+        except asyncio.CancelledError:
+            cancelled.append(x)
+            raise
+        raise ValueError(x)
+
+    with pytest.raises(ValueError):
+        async for _ in asyncx.amap(func, range(1, 4), limit=3, ordered=ordered):
+            pass
+    await asyncio.sleep(0)
+    assert sorted(cancelled) == [2, 3]
@@ -1,6 +1,7 @@
 import asyncio
 import threading
-from typing import Tuple
+import time
+from typing import List, Optional, Tuple
 
 import pytest
 
@@ -81,3 +82,199 @@ async def test_dispatch_coroutine() -> None:
 
         assert base == await coro1()
         assert base == await coro2()
+
+
+@pytest.mark.asyncio
+async def test_dispatch_cache() -> None:
+    selected: List[asyncio.AbstractEventLoop] = []
+
+    def selector(thread: asyncx.EventLoopThread) -> asyncio.AbstractEventLoop:
+        loop = thread.get_loop()
+        selected.append(loop)
+        return loop
+
+    thread = asyncx.EventLoopThread(start=True)
+
+    @asyncx.dispatch(lambda: selector(thread), cache=True)
+    async def func() -> int:
+        return threading.get_ident()
+
+    with thread:
+        dispatched = [await func() for _ in range(3)]
+    assert len(set(dispatched)) == 1
+    assert dispatched[0] != threading.get_ident()
+    assert len(selected) == 1
+
+    # The cache is invalidated as the loop is closed
+    thread = asyncx.EventLoopThread(start=True)
+    with thread:
+        assert await func() != threading.get_ident()
+    assert len(selected) == 2
+    assert selected[0] is not selected[1]
+
+
+@pytest.mark.asyncio
+async def test_dispatch_balanced() -> None:
+    release = asyncio.Event()
+
+    async def block() -> int:
+        # The event belongs to the caller's loop
+        await asyncx.dispatch_coroutine(release.wait(), caller_loop)
+        return threading.get_ident()
+
+    caller_loop = asyncio.get_running_loop()
+    with asyncx.EventLoopThread() as t1, asyncx.EventLoopThread() as t2:
+        balancer = asyncx.LoopBalancer([t1.get_loop, t2.loop])
+        func = asyncx.dispatch_balanced(balancer)(block)
+
+        tasks = [asyncio.create_task(func()) for _ in range(4)]
+        await asyncio.sleep(0.05)
+        assert balancer.loads == [2, 2]
+
+        release.set()
+        idents = await asyncio.gather(*tasks)
+        assert set(idents) == {t1.ident, t2.ident}
+        assert balancer.loads == [0, 0]
+
+        # Calls with the same key go to the same loop
+        def value_key(value: int) -> int:
+            return value
+
+        keyed = asyncx.dispatch_balanced(
+            asyncx.LoopBalancer(
+                [t1.loop, t2.loop], placement=asyncx.ConsistentHashPlacement()
+            ),
+            key=value_key,
+        )(_get_ident_with)
+        for value in range(4):
+            assert len({await keyed(value) for _ in range(3)}) == 1
+
+    with pytest.raises(ValueError):
+        asyncx.LoopBalancer([])
+
+
+async def _get_ident_with(value: int) -> int:
+    return threading.get_ident()
+
+
+@pytest.mark.asyncio
+async def test_dispatch_deadline() -> None:
+    async def get_deadline() -> Optional[float]:
+        return asyncx.current_deadline()
+
+    with asyncx.EventLoopThread() as t1, asyncx.EventLoopThread() as t2:
+        assert await asyncx.dispatch_coroutine(get_deadline(), t1.loop) is None
+
+        begin = time.monotonic()
+        deadline = await asyncx.dispatch_coroutine(get_deadline(), t1.loop, timeout=1.0)
+        assert deadline is not None
+        assert begin + 1.0 <= deadline < time.monotonic() + 1.0
+
+        # The deadline is forwarded to further hops, and a shorter timeout wins
+        @asyncx.dispatch(t2.get_loop)
+        async def hop2() -> Optional[float]:
+            return asyncx.current_deadline()
+
+        @asyncx.dispatch(t1.get_loop, timeout=1.0)
+        async def hop1(timeout: Optional[float]) -> Tuple[float, Optional[float]]:
+            outer = asyncx.current_deadline()
+            assert outer is not None
+            inner = await asyncx.dispatch_coroutine(hop2(), t2.loop, timeout=timeout)
+            return outer, inner
+
+        outer, inner = await hop1(None)
+        assert outer == inner
+        outer, inner = await hop1(0.5)
+        assert inner is not None and inner < outer
+
+        # The same loop is also run under the deadline without leaking it
+        assert await asyncx.dispatch_coroutine(
+            get_deadline(), asyncio.get_running_loop(), timeout=1.0
+        )
+        assert asyncx.current_deadline() is None
+
+
+@pytest.mark.asyncio
+async def test_dispatch_timeout() -> None:
+    cancelled = threading.Event()
+
+    async def slow() -> None:
+        try:
+            await asyncio.sleep(1.0)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with asyncx.EventLoopThread() as thread:
+        begin = time.monotonic()
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncx.dispatch_coroutine(slow(), thread.loop, timeout=0.05)
+        assert time.monotonic() - begin < 0.5
+        # The remote coroutine is cancelled as well
+        assert cancelled.wait(0.5)
+
+        cancelled.clear()
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncx.dispatch(thread.loop, timeout=0.05)(slow)()
+        assert cancelled.wait(0.5)
+
+        # The remote side times out by itself even if the caller is blocked
+        cancelled.clear()
+        future = asyncio.run_coroutine_threadsafe(
+            asyncx.dispatch_coroutine(slow(), thread.loop, timeout=0.05),
+            thread.loop,
+        )
+        assert cancelled.wait(0.5)
+        with pytest.raises(asyncio.TimeoutError):
+            future.result(0.5)
+
+        cancelled.clear()
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncx.dispatch_coroutine(
+                slow(), asyncio.get_running_loop(), timeout=0.05
+            )
+        assert cancelled.is_set()
+
+
+@pytest.mark.asyncio
+async def test_dispatch_cancel() -> None:
+    started = threading.Event()
+    cancelled = threading.Event()
+
+    async def slow() -> None:
+        started.set()
+        try:
+            await asyncio.sleep(1.0)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with asyncx.EventLoopThread() as thread:
+        for timeout in [None, 1.0]:
+            started.clear()
+            cancelled.clear()
+            task = asyncio.create_task(
+                asyncx.dispatch_coroutine(slow(), thread.loop, timeout=timeout)
+            )
+            await asyncio.get_running_loop().run_in_executor(None, started.wait)
+
+            # Cancellation of the caller reaches the remote coroutine
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            assert cancelled.wait(0.5)
+
+        # Cancellation of the remote coroutine reaches the caller
+        async def cancel_self() -> None:
+            task = asyncio.current_task()
+            assert task is not None
+            asyncio.get_running_loop().call_later(0.01, task.cancel)
+            await asyncio.sleep(1.0)
+
+        for timeout in [None, 1.0]:
+            begin = time.monotonic()
+            with pytest.raises(asyncio.CancelledError):
+                await asyncx.dispatch_coroutine(
+                    cancel_self(), thread.loop, timeout=timeout
+                )
+            assert time.monotonic() - begin < 0.5
@@ -0,0 +1,117 @@
+import asyncio
+from typing import List
+
+import pytest
+
+import asyncx
+
+
+def test_latency_tracker() -> None:
+    tracker = asyncx.LatencyTracker(
+        percentile=50.0, initial=1.0, window=10, min_samples=3, refresh=1
+    )
+    assert tracker.delay() == 1.0
+    tracker.record(0.1)
+    tracker.record(0.3)
+    assert tracker.delay() == 1.0
+    tracker.record(0.2)
+    assert tracker.delay() == 0.2
+
+    for _ in range(10):
+        tracker.record(0.5)
+    assert tracker.delay() == 0.5
+
+    with pytest.raises(ValueError):
+        asyncx.LatencyTracker(percentile=101.0)
+
+
+@pytest.mark.asyncio
+async def test_hedge_primary_wins() -> None:
+    calls: List[int] = []
+
+    async def query() -> int:
+        calls.append(len(calls))
+        await asyncio.sleep(0.01)
+        return len(calls)
+
+    assert await asyncx.hedge(query, delay=0.1) == 1
+    assert calls == [0]
+
+
+@pytest.mark.asyncio
+async def test_hedge_backup_wins() -> None:
+    latencies = [1.0, 0.01]
+    cancelled: List[int] = []
+
+    async def query() -> int:
+        index = 2 - len(latencies)
+        latency = latencies.pop(0)
+        try:
+            await asyncio.sleep(latency)
+        except asyncio.CancelledError:
+            cancelled.append(index)
+            raise
+        return index
+
+    tracker = asyncx.LatencyTracker(initial=0.02)
+    assert await asyncx.hedge(query, delay=tracker) == 1
+    # The loser is cancelled and awaited
+    assert cancelled == [0]
+
+
+@pytest.mark.asyncio
+async def test_hedge_failure() -> None:
+    calls = 0
+
+    async def query() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        if calls == 1:
+            raise ValueError("first")
+        return calls
+
+    # A failed attempt starts the next one immediately
+    assert await asyncx.hedge(query, delay=10.0, max_attempts=2) == 2
+
+    async def fail() -> int:
+        raise KeyError("fail")
+
+    with pytest.raises(KeyError):
+        await asyncx.hedge(fail, delay=0.01, max_attempts=3)
+
+    with pytest.raises(ValueError):
+        await asyncx.hedge(fail, delay=0.01, max_attempts=0)
+
+
+@pytest.mark.asyncio
+async def test_hedge_cancel() -> None:
+    cancelled: List[int] = []
+
+    async def query() -> int:
+        try:
+            await asyncio.sleep(1.0)
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+        return 1
+
+    task = asyncio.create_task(asyncx.hedge(query, delay=0.01, max_attempts=3))
+    await asyncio.sleep(0.05)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert cancelled == [1, 1, 1]
+
+
+@pytest.mark.asyncio
+async def test_hedged() -> None:
+    latencies = [1.0, 0.01]
+
+    @asyncx.hedged(delay=0.02)
+    async def query(value: str) -> str:
+        await asyncio.sleep(latencies.pop(0))
+        return value
+
+    assert await query("foo") == "foo"
+    assert latencies == []
@@ -0,0 +1,160 @@
+import asyncio
+from typing import List
+
+import pytest
+
+import asyncx
+
+
+@pytest.mark.asyncio
+async def test_memoize() -> None:
+    calls: List[int] = []
+
+    cache = asyncx.AsyncCache()
+
+    @asyncx.memoize(cache)
+    async def fetch(value: int, scale: int = 1) -> int:
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        return value * scale
+
+    ret = await asyncio.gather(fetch(1), fetch(1), fetch(2))
+    assert list(ret) == [1, 1, 2]
+    assert await fetch(1) == 1
+    assert await fetch(1, scale=3) == 3
+    assert calls == [1, 2, 1]
+    assert cache.stats() == asyncx.CacheStats(hits=1, misses=4, evictions=0, size=3)
+
+    cache.invalidate(((1,), ()))
+    assert await fetch(1) == 1
+    cache.clear()
+    assert len(cache) == 0
+    assert calls == [1, 2, 1, 1]
+
+
+@pytest.mark.asyncio
+async def test_memoize_failure() -> None:
+    count = 0
+
+    @asyncx.memoize(key=lambda value: "key")
+    async def fail(value: int) -> int:
+        nonlocal count
+        count += 1
+        raise ValueError(value)
+
+    for i in range(2):
+        with pytest.raises(ValueError):
+            await fail(i)
+    assert count == 2
+
+
+@pytest.mark.asyncio
+async def test_memoize_cancel() -> None:
+    join = asyncio.Event()
+    calls: List[int] = []
+
+    @asyncx.memoize()
+    async def fetch(value: int) -> int:
+        calls.append(value)
+        await join.wait()
+        return value
+
+    task1 = asyncio.create_task(fetch(1))
+    task2 = asyncio.create_task(fetch(1))
+    await asyncio.sleep(0.01)
+    task1.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task1
+
+    # The computation survives the cancellation of one awaiter
+    join.set()
+    assert await task2 == 1
+    assert await fetch(1) == 1
+    assert calls == [1]
+
+
+@pytest.mark.asyncio
+async def test_async_cache_lru() -> None:
+    cache = asyncx.AsyncCache(maxsize=2)
+    for key in ["a", "b", "a", "c"]:
+        await cache.get_or_compute(key, lambda: asyncx.just(0))
+
+    # "b" is the least recently used
+    assert cache.stats() == asyncx.CacheStats(hits=1, misses=3, evictions=1, size=2)
+    await cache.get_or_compute("a", lambda: asyncx.just(1))
+    assert await cache.get_or_compute("b", lambda: asyncx.just(1)) == 1
+
+
+@pytest.mark.asyncio
+async def test_async_cache_lfu() -> None:
+    cache = asyncx.AsyncCache(maxsize=2, policy="lfu")
+    for key in ["a", "a", "b", "b", "b", "c"]:
+        await cache.get_or_compute(key, lambda: asyncx.just(0))
+
+    # "a" is the least frequently used
+    assert cache.stats().evictions == 1
+    assert await cache.get_or_compute("b", lambda: asyncx.just(1)) == 0
+    assert await cache.get_or_compute("a", lambda: asyncx.just(1)) == 1
+
+    with pytest.raises(ValueError):
+        asyncx.AsyncCache(policy="fifo")
+    with pytest.raises(ValueError):
+        asyncx.AsyncCache(maxsize=0)
+
+
+@pytest.mark.asyncio
+async def test_async_cache_lfu_invalidate() -> None:
+    cache = asyncx.AsyncCache(maxsize=3, policy="lfu")
+    for key in ["a", "b", "b", "c", "c", "c"]:
+        await cache.get_or_compute(key, lambda: asyncx.just(0))
+
+    # The least frequently used key is dropped, so "b" is the next one to evict
+    cache.invalidate("a")
+    for key in ["d", "d", "d", "d", "e"]:
+        await cache.get_or_compute(key, lambda: asyncx.just(0))
+    assert cache.stats().evictions == 1
+    assert await cache.get_or_compute("b", lambda: asyncx.just(1)) == 1
+    assert await cache.get_or_compute("c", lambda: asyncx.just(1)) == 0
+
+
+@pytest.mark.asyncio
+async def test_async_cache_ttl() -> None:
+    cache = asyncx.AsyncCache(ttl=0.05)
+    assert await cache.get_or_compute("a", lambda: asyncx.just(1)) == 1
+    assert await cache.get_or_compute("a", lambda: asyncx.just(2)) == 1
+    await asyncio.sleep(0.1)
+    assert await cache.get_or_compute("a", lambda: asyncx.just(3)) == 3
+
+
+@pytest.mark.asyncio
+async def test_async_cache_stale_while_revalidate() -> None:
+    join = asyncio.Event()
+
+    async def compute(value: int) -> int:
+        await join.wait()
+        return value
+
+    cache = asyncx.AsyncCache(ttl=0.05, stale_while_revalidate=10.0)
+    join.set()
+    assert await cache.get_or_compute("a", lambda: compute(1)) == 1
+    await asyncio.sleep(0.1)
+
+    # The stale entry is served while a refresh runs in the background
+    join.clear()
+    assert await cache.get_or_compute("a", lambda: compute(2)) == 1
+    assert await cache.get_or_compute("a", lambda: compute(3)) == 1
+    join.set()
+    await asyncio.sleep(0.01)
+    assert await cache.get_or_compute("a", lambda: compute(4)) == 2
+    assert cache.stats().misses == 1
+
+    # A failed refresh keeps the stale entry
+    async def fail() -> int:
+        raise ValueError("fail")
+
+    await asyncio.sleep(0.1)
+    assert await cache.get_or_compute("a", fail) == 2
+    await asyncio.sleep(0.01)
+    assert await cache.get_or_compute("a", lambda: compute(5)) == 2
+    await asyncio.sleep(0.01)
+    assert await cache.get_or_compute("a", fail) == 5
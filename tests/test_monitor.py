@@ -0,0 +1,82 @@
+import asyncio
+import time
+
+import pytest
+
+import asyncx
+
+
+def test_latency_histogram() -> None:
+    histogram = asyncx.LatencyHistogram([0.001, 0.01, 0.1])
+    assert histogram.percentile(50) == 0.0
+    assert histogram.mean == 0.0
+
+    for value in [0.0005, 0.005, 0.005, 0.05, 1.0]:
+        histogram.record(value)
+
+    assert histogram.counts == [1, 2, 1, 1]
+    assert histogram.count == 5
+    assert histogram.max == 1.0
+    assert histogram.mean == pytest.approx(1.0605 / 5)
+    assert histogram.percentile(20) == 0.001
+    assert histogram.percentile(50) == 0.01
+    assert histogram.percentile(80) == 0.1
+    assert histogram.percentile(100) == 1.0
+
+    copied = histogram.copy()
+    histogram.record(0.0)
+    assert copied.count == 5
+    assert histogram.count == 6
+
+
+async def _sleep(delay: float) -> None:
+    await asyncio.sleep(delay)
+
+
+@pytest.mark.asyncio
+async def test_loop_monitor() -> None:
+    monitor = asyncx.LoopMonitor(interval=0.01, slow_callback_duration=0.05)
+
+    async def block() -> None:
+        # Block the event loop so that a probe is delayed
+        time.sleep(0.1)
+
+    async def sleep() -> None:
+        await asyncio.sleep(0.1)
+
+    with asyncx.EventLoopThread(monitor=monitor) as thread:
+        assert thread.monitor is monitor
+        stats = monitor.snapshot()
+        assert stats.queued == 0
+        assert stats.start_latency.count == 0
+
+        sleeping = [thread.run_coroutine(sleep()) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        assert monitor.snapshot().tasks == 3
+        await asyncio.gather(*sleeping)
+
+        await thread.run_coroutine(block())
+        await asyncio.sleep(0.05)
+        futures = thread.submit_many(sleep() for _ in range(2))
+        await asyncio.gather(*(asyncio.wrap_future(f) for f in futures))
+
+        stats = monitor.snapshot()
+        assert stats.queued == 0
+        assert stats.start_latency.count == 6
+        assert stats.slow_callbacks >= 1
+        assert stats.max_lag >= 0.05
+
+
+@pytest.mark.asyncio
+async def test_loop_monitor_coalesce() -> None:
+    monitor = asyncx.LoopMonitor()
+    with asyncx.EventLoopThread(coalesce=True, monitor=monitor) as thread:
+        await asyncio.gather(*(thread.run_coroutine(_sleep(0.01)) for _ in range(5)))
+        stats = monitor.snapshot()
+        assert stats.queued == 0
+        assert stats.start_latency.count == 5
+
+
+def test_loop_monitor_invalid_interval() -> None:
+    with pytest.raises(ValueError):
+        asyncx.LoopMonitor(interval=0)
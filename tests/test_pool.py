@@ -0,0 +1,270 @@
+import asyncio
+import os
+import threading
+import time
+from typing import Iterator
+
+import pytest
+
+import asyncx
+
+
+async def _get_ident(delay: float = 0.01) -> int:
+    # await 0.01 seconds to test event loop
+    await asyncio.sleep(delay)
+    return threading.get_ident()
+
+
+async def _sleep(delay: float) -> None:
+    await asyncio.sleep(delay)
+
+
+@pytest.fixture
+def event_loop_thread_pool() -> Iterator[asyncx.EventLoopThreadPool]:
+    pool = asyncx.EventLoopThreadPool(3)
+    try:
+        yield pool
+    finally:
+        pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_event_loop_thread_pool(
+    event_loop_thread_pool: asyncx.EventLoopThreadPool,
+) -> None:
+    assert len(event_loop_thread_pool) == 3
+    assert all(not t.is_alive() for t in event_loop_thread_pool)
+
+    event_loop_thread_pool.start()
+    assert all(t.is_alive() for t in event_loop_thread_pool)
+
+    main = await _get_ident()
+    subs = await asyncio.gather(
+        *(event_loop_thread_pool.run_coroutine(_get_ident()) for _ in range(6))
+    )
+    assert main not in subs
+    assert set(subs) == {t.ident for t in event_loop_thread_pool}
+    assert event_loop_thread_pool.loads == (0, 0, 0)
+
+    event_loop_thread_pool.shutdown()
+    assert all(not t.is_alive() for t in event_loop_thread_pool)
+
+    coro = _get_ident()
+    with pytest.raises(RuntimeError):
+        event_loop_thread_pool.run_coroutine(coro)
+    coro.close()
+    assert event_loop_thread_pool.loads == (0, 0, 0)
+
+
+def test_event_loop_thread_pool_invalid_size() -> None:
+    with pytest.raises(ValueError):
+        asyncx.EventLoopThreadPool(0)
+
+
+@pytest.mark.asyncio
+async def test_least_pending_placement() -> None:
+    release = threading.Event()
+
+    async def block() -> int:
+        while not release.is_set():
+            await asyncio.sleep(0.001)
+        return threading.get_ident()
+
+    placement = asyncx.LeastPendingPlacement()
+    with asyncx.EventLoopThreadPool(3, placement=placement) as pool:
+        futures = [pool.run_coroutine_concurrent(block()) for _ in range(3)]
+        assert pool.loads == (1, 1, 1)
+
+        release.set()
+        idents = [f.result() for f in futures]
+        assert len(set(idents)) == 3
+        assert pool.loads == (0, 0, 0)
+
+
+@pytest.mark.asyncio
+async def test_key_hash_placement() -> None:
+    placement = asyncx.KeyHashPlacement()
+    with asyncx.EventLoopThreadPool(4, placement=placement) as pool:
+        for key in ["foo", "bar", 42]:
+            idents = await asyncio.gather(
+                *(pool.run_coroutine(_get_ident(), key=key) for _ in range(4))
+            )
+            assert len(set(idents)) == 1
+            assert idents[0] == pool.select_thread(key).ident
+
+
+def test_round_robin_placement() -> None:
+    placement = asyncx.RoundRobinPlacement()
+    assert [placement.select([0, 0, 0], None) for _ in range(4)] == [0, 1, 2, 0]
+
+
+def test_power_of_two_choices_placement() -> None:
+    placement = asyncx.PowerOfTwoChoicesPlacement(seed=0)
+    assert placement.select([5], None) == 0
+    # The most loaded target is never selected
+    assert all(placement.select([1, 9, 1], None) != 1 for _ in range(20))
+    assert {placement.select([0, 0, 0, 0], None) for _ in range(50)} == {0, 1, 2, 3}
+
+
+def test_consistent_hash_placement() -> None:
+    placement = asyncx.ConsistentHashPlacement()
+    keys = [f"key-{i}" for i in range(1000)]
+    before = [placement.select([0] * 4, k) for k in keys]
+    assert before == [placement.select([9, 0, 0, 0], k) for k in keys]
+    assert set(before) == {0, 1, 2, 3}
+
+    # Only keys moving to the new target change
+    after = [placement.select([0] * 5, k) for k in keys]
+    moved = [(b, a) for b, a in zip(before, after) if b != a]
+    assert all(a == 4 for _, a in moved)
+    assert 100 < len(moved) < 300
+
+    assert placement.select([0, 0], None) == 0
+    assert placement.select([0, 0], None) == 1
+    with pytest.raises(ValueError):
+        asyncx.ConsistentHashPlacement(replicas=0)
+
+
+@pytest.mark.asyncio
+async def test_event_loop_thread_cache() -> None:
+    cache = asyncx.EventLoopThreadCache(max_threads=2, idle_timeout=0.05)
+    try:
+        assert len(cache) == 0
+        main = await _get_ident()
+        first = await cache.run_coroutine(_get_ident())
+        assert first != main
+        assert len(cache) == 1
+
+        # An idle thread is reused
+        assert await cache.run_coroutine(_get_ident()) == first
+        assert len(cache) == 1
+
+        # Threads grow up to max_threads while busy
+        subs = await asyncio.gather(
+            *(cache.run_coroutine(_get_ident()) for _ in range(4))
+        )
+        assert main not in subs
+        assert len(set(subs)) == 2
+        assert len(cache) == 2
+
+        # Idle threads are reaped
+        threads = cache.threads
+        await asyncio.sleep(0.3)
+        assert len(cache) == 0
+        assert all(not t.is_alive() for t in threads)
+
+        assert await cache.run_coroutine(_get_ident()) != main
+    finally:
+        cache.shutdown()
+
+    coro = _get_ident()
+    with pytest.raises(RuntimeError):
+        cache.run_coroutine(coro)
+    coro.close()
+
+
+@pytest.mark.asyncio
+async def test_event_loop_thread_cache_nested() -> None:
+    cache = asyncx.EventLoopThreadCache(max_threads=1)
+
+    async def nested() -> int:
+        sub = await cache.run_coroutine(_get_ident())
+        assert sub != threading.get_ident()
+        return sub
+
+    try:
+        assert await cache.run_coroutine(nested()) != await _get_ident()
+    finally:
+        cache.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_event_loop_thread_cache_reap_timer() -> None:
+    cache = asyncx.EventLoopThreadCache(max_threads=1, idle_timeout=0.2)
+
+    async def count_timers() -> int:
+        return len(getattr(asyncio.get_running_loop(), "_scheduled"))
+
+    try:
+        for _ in range(100):
+            await cache.run_coroutine(_get_ident(0.0))
+        # One timer per thread is rescheduled instead of one per call
+        assert await cache.run_coroutine(count_timers()) <= 1
+
+        thread = cache.threads[0]
+        await asyncio.sleep(0.1)
+        await cache.run_coroutine(_get_ident(0.0))
+        await asyncio.sleep(0.15)
+        # The timer is pushed back by the last use
+        assert cache.threads == (thread,)
+        await asyncio.sleep(0.4)
+        assert len(cache) == 0
+    finally:
+        cache.shutdown()
+
+
+def test_event_loop_thread_cache_slow_start() -> None:
+    cache = asyncx.EventLoopThreadCache(
+        max_threads=1, on_loop_ready=lambda _: time.sleep(0.3)
+    )
+    try:
+        first = threading.Thread(
+            target=lambda: cache.run_coroutine_concurrent(_get_ident()).result(),
+            daemon=True,
+        )
+        first.start()
+        time.sleep(0.05)
+
+        # A starting thread neither blocks the cache nor is exceeded by max_threads
+        start = time.monotonic()
+        assert len(cache) == 0
+        assert time.monotonic() - start < 0.1
+        second = cache.run_coroutine_concurrent(_get_ident())
+        first.join()
+        assert second.result() == cache.threads[0].ident
+        assert len(cache) == 1
+    finally:
+        cache.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_run_coroutine_in_cached_thread() -> None:
+    main, sub1 = await asyncio.gather(
+        _get_ident(),
+        asyncx.run_coroutine_in_cached_thread(_get_ident()),
+    )
+    sub2 = await asyncx.run_coroutine_in_cached_thread(_get_ident())
+    assert main != sub1
+    assert sub1 == sub2
+
+
+def test_event_loop_thread_pool_drain() -> None:
+    pool = asyncx.EventLoopThreadPool(2, start=True)
+    quick = [pool.run_coroutine_concurrent(_sleep(0.01)) for _ in range(4)]
+    slow = pool.run_coroutine_concurrent(_sleep(10))
+    results = pool.drain(timeout=0.1)
+    assert len(results) == 2
+    assert sum(r.completed for r in results) == 4
+    assert sum(r.cancelled for r in results) == 1
+    assert sum(r.leaked for r in results) == 0
+    assert all(f.result() is None for f in quick)
+    assert slow.cancelled()
+    assert all(not t.is_alive() for t in pool)
+
+
+@pytest.mark.skipif(
+    not hasattr(os, "sched_getaffinity"), reason="CPU affinity is not supported"
+)
+def test_event_loop_thread_pool_name_and_affinity() -> None:
+    cpus = sorted(os.sched_getaffinity(0))
+    pool = asyncx.EventLoopThreadPool(
+        3,
+        thread_name_prefix="worker",
+        cpu_affinity=[[cpu] for cpu in cpus[:2]],
+    )
+    assert [t.name for t in pool] == ["worker-0", "worker-1", "worker-2"]
+    expected = [(cpus[i % min(2, len(cpus))],) for i in range(3)]
+    assert [t.cpu_affinity for t in pool] == expected
+
+    with pytest.raises(ValueError):
+        asyncx.EventLoopThreadPool(2, cpu_affinity=[])
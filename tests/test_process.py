@@ -0,0 +1,90 @@
+import asyncio
+import os
+from typing import Generator, Optional
+
+import pytest
+
+import asyncx
+
+_warmed_up: Optional[str] = None
+
+
+async def warm_up(value: str) -> None:
+    global _warmed_up
+    await asyncio.sleep(0)
+    _warmed_up = value
+
+
+async def get_state() -> Optional[str]:
+    return _warmed_up
+
+
+async def get_pid() -> int:
+    await asyncio.sleep(0)
+    return os.getpid()
+
+
+async def reverse(data: bytes, *, suffix: bytes = b"") -> bytes:
+    await asyncio.sleep(0)
+    return data[::-1] + suffix
+
+
+async def fail(message: str) -> None:
+    raise ValueError(message)
+
+
+@pytest.fixture
+def pool() -> Generator[asyncx.ProcessLoopPool, None, None]:
+    with asyncx.ProcessLoopPool(
+        2, initializer=warm_up, initargs=("ready",), shared_memory_threshold=1024
+    ) as pool:
+        yield pool
+
+
+@pytest.mark.asyncio
+async def test_process_loop_pool(pool: asyncx.ProcessLoopPool) -> None:
+    assert await pool.run(get_pid) != os.getpid()
+    assert await pool.run(get_state) == "ready"
+    assert await pool.run(reverse, b"abc", suffix=b"!") == b"cba!"
+
+    with pytest.raises(ValueError, match="foo"):
+        await pool.run(fail, "foo")
+
+
+@pytest.mark.asyncio
+async def test_process_loop_pool_shared_memory(pool: asyncx.ProcessLoopPool) -> None:
+    data = os.urandom(1 << 16)
+    results = await asyncio.gather(
+        pool.run(reverse, data),
+        pool.run(reverse, bytearray(data), suffix=memoryview(data)),
+    )
+    assert list(results) == [data[::-1], data[::-1] + data]
+
+
+@pytest.mark.asyncio
+async def test_process_loop_pool_local_function(pool: asyncx.ProcessLoopPool) -> None:
+    async def local() -> None:
+        pass
+
+    with pytest.raises(ValueError, match="top level"):
+        await pool.run(local)
+
+
+_pool = asyncx.ProcessLoopPool(1, shared_memory_threshold=None)
+
+
+@asyncx.dispatch_process(_pool)
+async def dispatched(data: bytes) -> int:
+    await asyncio.sleep(0)
+    return os.getpid()
+
+
+def teardown_module() -> None:
+    _pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_dispatch_process() -> None:
+    pid = await dispatched(b"foo")
+    assert pid != os.getpid()
+    assert await dispatched(b"bar") == pid
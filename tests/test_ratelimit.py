@@ -0,0 +1,106 @@
+import asyncio
+import time
+from typing import List
+
+import pytest
+
+import asyncx
+
+
+def test_token_bucket_try_acquire() -> None:
+    bucket = asyncx.TokenBucket(rate=10.0, burst=3)
+    assert [bucket.try_acquire() for _ in range(4)] == [True, True, True, False]
+    time.sleep(0.12)
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+
+    with pytest.raises(ValueError):
+        asyncx.TokenBucket(rate=0.0)
+    with pytest.raises(ValueError):
+        asyncx.TokenBucket(rate=1.0, burst=0)
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_acquire() -> None:
+    bucket = asyncx.TokenBucket(rate=100.0, burst=2)
+    begin = time.monotonic()
+    await asyncio.gather(*[bucket.acquire() for _ in range(7)])
+    elapsed = time.monotonic() - begin
+    # 2 tokens in the bucket and 5 tokens paced at 10ms
+    assert 0.045 <= elapsed < 0.2
+
+    with pytest.raises(ValueError):
+        await bucket.acquire(3)
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_cancel() -> None:
+    bucket = asyncx.TokenBucket(rate=10.0)
+    await bucket.acquire()
+    task = asyncio.create_task(bucket.acquire())
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    # The reservation of the cancelled waiter is given back
+    await asyncio.sleep(0.1)
+    assert bucket.try_acquire()
+
+
+def test_sliding_window_try_acquire() -> None:
+    window = asyncx.SlidingWindow(limit=3, period=0.1)
+    assert window.try_acquire(2)
+    assert not window.try_acquire(2)
+    assert window.try_acquire()
+    assert not window.try_acquire()
+    time.sleep(0.11)
+    assert window.try_acquire(3)
+
+    with pytest.raises(ValueError):
+        asyncx.SlidingWindow(limit=0, period=1.0)
+    with pytest.raises(ValueError):
+        asyncx.SlidingWindow(limit=1, period=0.0)
+
+
+@pytest.mark.asyncio
+async def test_sliding_window_acquire() -> None:
+    window = asyncx.SlidingWindow(limit=3, period=0.05)
+    stamps: List[float] = []
+
+    async def run() -> None:
+        await window.acquire()
+        stamps.append(time.monotonic())
+
+    await asyncio.gather(*[run() for _ in range(7)])
+    stamps.sort()
+    # No window of the period has more than the limit. The stamps are taken after
+    # acquire() returns, so allow for the delay of resuming each caller.
+    for i in range(len(stamps) - 3):
+        assert stamps[i + 3] - stamps[i] >= 0.04
+
+    with pytest.raises(ValueError):
+        await window.acquire(4)
+
+
+def test_rate_limited_threads() -> None:
+    bucket = asyncx.TokenBucket(rate=100.0)
+    calls: List[float] = []
+
+    async def call() -> None:
+        calls.append(time.monotonic())
+
+    with asyncx.EventLoopThread() as thread1, asyncx.EventLoopThread() as thread2:
+        call1 = asyncx.dispatch(thread1.get_loop)(asyncx.rate_limited(bucket)(call))
+        call2 = asyncx.dispatch(thread2.get_loop)(asyncx.rate_limited(bucket)(call))
+
+        async def run() -> None:
+            await asyncio.gather(*[c() for c in [call1, call2] * 5])
+
+        begin = time.monotonic()
+        asyncio.run(run())
+        elapsed = time.monotonic() - begin
+
+    # The limit is shared by the both threads
+    assert len(calls) == 10
+    assert elapsed >= 0.085
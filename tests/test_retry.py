@@ -0,0 +1,131 @@
+import asyncio
+import time
+from typing import List
+
+import pytest
+
+import asyncx
+
+
+@pytest.mark.asyncio
+async def test_retry() -> None:
+    calls: List[float] = []
+
+    @asyncx.retry(attempts=4, backoff=0.01, jitter=False)
+    async def flaky(succeed_at: int) -> int:
+        calls.append(time.monotonic())
+        if len(calls) < succeed_at:
+            raise ValueError(len(calls))
+        return len(calls)
+
+    assert await flaky(3) == 3
+    # Exponential backoff of 10ms and 20ms
+    assert calls[1] - calls[0] >= 0.009
+    assert calls[2] - calls[1] >= 0.019
+
+    calls.clear()
+    with pytest.raises(ValueError, match="4"):
+        await flaky(10)
+    assert len(calls) == 4
+
+    with pytest.raises(ValueError):
+        asyncx.retry(attempts=0)
+
+
+@pytest.mark.asyncio
+async def test_retry_on() -> None:
+    calls = 0
+
+    @asyncx.retry(retry_on=(KeyError,), backoff=0.0)
+    async def fail(exc: Exception) -> None:
+        nonlocal calls
+        calls += 1
+        raise exc
+
+    with pytest.raises(KeyError):
+        await fail(KeyError("foo"))
+    assert calls == 3
+
+    with pytest.raises(ValueError):
+        await fail(ValueError("foo"))
+    assert calls == 4
+
+
+@pytest.mark.asyncio
+async def test_retry_timeout() -> None:
+    calls = 0
+
+    @asyncx.retry(attempts=3, backoff=0.0, attempt_timeout=0.02)
+    async def slow_then_fast() -> int:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await asyncio.sleep(1.0)
+        return calls
+
+    assert await slow_then_fast() == 2
+
+    @asyncx.retry(attempts=100, backoff=0.01, jitter=False, timeout=0.05)
+    async def slow() -> None:
+        await asyncio.sleep(1.0)
+
+    begin = time.monotonic()
+    with pytest.raises(asyncio.TimeoutError):
+        await slow()
+    assert time.monotonic() - begin < 0.5
+
+    @asyncx.retry(attempts=100, backoff=0.02, jitter=False, timeout=0.05)
+    async def fail() -> None:
+        raise KeyError("foo")
+
+    # A retry that would start after the deadline is not made
+    with pytest.raises(KeyError):
+        await fail()
+
+
+@pytest.mark.asyncio
+async def test_retry_cancel() -> None:
+    calls = 0
+
+    @asyncx.retry(backoff=0.0)
+    async def slow() -> None:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(1.0)
+
+    task = asyncio.create_task(slow())
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_retry_budget() -> None:
+    budget = asyncx.RetryBudget(ratio=0.5, capacity=2.0)
+    calls = 0
+
+    @asyncx.retry(attempts=3, backoff=0.0, budget=budget)
+    async def fail() -> None:
+        nonlocal calls
+        calls += 1
+        raise KeyError("foo")
+
+    # 2 tokens allow 2 retries of the first request
+    with pytest.raises(KeyError):
+        await fail()
+    assert calls == 3
+    assert budget.tokens == 0.0
+
+    # Each request deposits 0.5 tokens, so every other request is retried once
+    calls = 0
+    for _ in range(4):
+        with pytest.raises(KeyError):
+            await fail()
+    assert calls == 6
+
+    with pytest.raises(ValueError):
+        asyncx.RetryBudget(ratio=-1.0)
+    with pytest.raises(ValueError):
+        asyncx.RetryBudget(capacity=0.5)
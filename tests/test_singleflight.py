@@ -0,0 +1,152 @@
+import asyncio
+import functools
+import threading
+from typing import List
+
+import pytest
+
+import asyncx
+
+
+@pytest.mark.asyncio
+async def test_single_flight() -> None:
+    calls: List[str] = []
+    join = asyncio.Event()
+
+    async def fetch(key: str) -> str:
+        calls.append(key)
+        await join.wait()
+        return key.upper()
+
+    flight = asyncx.SingleFlight()
+    tasks = [
+        asyncio.create_task(flight.do(k, functools.partial(fetch, k)))
+        for k in ["foo", "foo", "bar", "foo"]
+    ]
+    await asyncio.sleep(0.01)
+    join.set()
+    assert await asyncio.gather(*tasks) == ["FOO", "FOO", "BAR", "FOO"]
+    assert calls == ["foo", "bar"]
+
+    # Without TTL the result is not kept
+    assert await flight.do("foo", lambda: fetch("foo")) == "FOO"
+    assert calls == ["foo", "bar", "foo"]
+
+
+@pytest.mark.asyncio
+async def test_single_flight_cancel() -> None:
+    cancelled = asyncio.Event()
+    join = asyncio.Event()
+
+    async def fetch() -> int:
+        try:
+            await join.wait()
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return 42
+
+    flight = asyncx.SingleFlight()
+    task1 = asyncio.create_task(flight.do("key", fetch))
+    task2 = asyncio.create_task(flight.do("key", fetch))
+    await asyncio.sleep(0.01)
+
+    # Cancelling one of the waiters does not cancel the shared call
+    task1.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task1
+    join.set()
+    assert await task2 == 42
+    assert not cancelled.is_set()
+
+    # The shared call is cancelled when every waiter has gone
+    join.clear()
+    task3 = asyncio.create_task(flight.do("key", fetch))
+    await asyncio.sleep(0.01)
+    task3.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task3
+    await asyncio.wait_for(cancelled.wait(), 1.0)
+
+    # A later caller starts a new call
+    join.set()
+    assert await flight.do("key", fetch) == 42
+
+
+@pytest.mark.asyncio
+async def test_single_flight_ttl() -> None:
+    count = 0
+
+    async def fetch() -> int:
+        nonlocal count
+        count += 1
+        await asyncio.sleep(0)
+        return count
+
+    async def fail() -> int:
+        nonlocal count
+        count += 1
+        raise ValueError(count)
+
+    flight = asyncx.SingleFlight(ttl=0.05)
+    assert await flight.do("key", fetch) == 1
+    assert await flight.do("key", fetch) == 1
+    await asyncio.sleep(0.1)
+    assert await flight.do("key", fetch) == 2
+
+    flight.forget("key")
+    assert await flight.do("key", fetch) == 3
+
+    # Failures are not kept
+    with pytest.raises(ValueError):
+        await flight.do("error", fail)
+    with pytest.raises(ValueError):
+        await flight.do("error", fail)
+    assert count == 5
+
+    with pytest.raises(ValueError):
+        asyncx.SingleFlight(ttl=-1.0)
+
+
+def test_single_flight_loops() -> None:
+    flight = asyncx.SingleFlight(ttl=10.0)
+    results: List[threading.Thread] = []
+
+    async def fetch() -> threading.Thread:
+        return threading.current_thread()
+
+    with asyncx.EventLoopThread() as thread1, asyncx.EventLoopThread() as thread2:
+        for thread in [thread1, thread2, thread1]:
+            results.append(
+                thread.run_coroutine_concurrent(flight.do("key", fetch)).result()
+            )
+
+    # Calls are not shared among event loops
+    assert results == [thread1, thread2, thread1]
+
+
+@pytest.mark.asyncio
+async def test_singleflight() -> None:
+    calls: List[int] = []
+
+    @asyncx.singleflight()
+    async def fetch(value: int, scale: int = 1) -> int:
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        return value * scale
+
+    ret = await asyncio.gather(fetch(1), fetch(1), fetch(2), fetch(1, scale=2))
+    assert list(ret) == [1, 1, 2, 2]
+    assert calls == [1, 2, 1]
+
+    def value_key(value: int, scale: int = 1) -> int:
+        return value
+
+    @asyncx.singleflight(key=value_key, ttl=1.0)
+    async def fetch2(value: int, scale: int = 1) -> int:
+        calls.append(value)
+        return value * scale
+
+    assert await fetch2(3) == 3
+    assert await fetch2(3, scale=2) == 3
+    assert calls == [1, 2, 1, 3]
@@ -1,6 +1,10 @@
 import asyncio
+import concurrent.futures
+import inspect
+import os
 import threading
-from typing import Iterator
+import time
+from typing import Any, AsyncIterator, Iterator, List, Optional, Set, Tuple
 
 import pytest
 
@@ -13,6 +17,10 @@ async def _get_ident() -> int:
     return threading.get_ident()
 
 
+async def _sleep(delay: float) -> None:
+    await asyncio.sleep(delay)
+
+
 @pytest.fixture
 def event_loop_thread() -> Iterator[asyncx.EventLoopThread]:
     thread = asyncx.EventLoopThread()
@@ -83,3 +91,306 @@ async def test_run_coroutine_in_thread() -> None:
         asyncx.run_coroutine_in_thread(_get_ident()),
     )
     assert main != sub
+
+
+@pytest.mark.asyncio
+async def test_submit_many(event_loop_thread: asyncx.EventLoopThread) -> None:
+    event_loop_thread.start()
+    assert event_loop_thread.submit_many([]) == []
+
+    futures = event_loop_thread.submit_many(_get_ident() for _ in range(10))
+    assert len(futures) == 10
+    idents = [await asyncio.wrap_future(f) for f in futures]
+    assert set(idents) == {event_loop_thread.ident}
+
+    async def fail() -> None:
+        raise ValueError("fail")
+
+    futures_fail = event_loop_thread.submit_many([fail()])
+    with pytest.raises(ValueError):
+        await asyncio.wrap_future(futures_fail[0])
+
+    coro = _get_ident()
+    with pytest.raises(TypeError):
+        event_loop_thread.submit_many([coro, 1])  # type: ignore
+    assert inspect.getcoroutinestate(coro) == inspect.CORO_CLOSED
+
+
+@pytest.mark.asyncio
+async def test_submit_many_cancel(event_loop_thread: asyncx.EventLoopThread) -> None:
+    event_loop_thread.start()
+    started = threading.Event()
+
+    async def block() -> None:
+        started.set()
+        await asyncio.sleep(10)
+
+    (future,) = event_loop_thread.submit_many([block()])
+    started.wait()
+    future.cancel()
+    await asyncio.sleep(0.01)
+    assert future.cancelled()
+    assert len(asyncio.all_tasks(event_loop_thread.loop)) == 0
+
+
+@pytest.mark.asyncio
+async def test_event_loop_thread_coalesce() -> None:
+    with asyncx.EventLoopThread(coalesce=True) as thread:
+        loop = thread.loop
+        wakeups = 0
+        original = loop.call_soon_threadsafe
+
+        def counting_call_soon_threadsafe(*args: Any, **kwargs: Any) -> Any:
+            nonlocal wakeups
+            wakeups += 1
+            return original(*args, **kwargs)
+
+        # Block the loop so that all submissions arrive within one iteration
+        blocker = threading.Event()
+        thread.run_coroutine_concurrent(_wait_event(blocker))
+        await asyncio.sleep(0.01)
+
+        loop.call_soon_threadsafe = counting_call_soon_threadsafe  # type: ignore
+        futures = [thread.run_coroutine_concurrent(_get_ident()) for _ in range(10)]
+        futures += thread.submit_many(_get_ident() for _ in range(10))
+        blocker.set()
+
+        idents = [await asyncio.wrap_future(f) for f in futures]
+        assert set(idents) == {thread.ident}
+        assert wakeups == 1
+
+
+async def _wait_event(event: threading.Event) -> None:
+    event.wait()
+
+
+class _CustomEventLoop(asyncio.SelectorEventLoop):
+    pass
+
+
+@pytest.mark.asyncio
+async def test_event_loop_thread_loop_factory() -> None:
+    ready: List[Tuple[asyncio.AbstractEventLoop, int]] = []
+
+    def on_loop_ready(loop: asyncio.AbstractEventLoop) -> None:
+        loop.slow_callback_duration = 1.0
+        ready.append((loop, threading.get_ident()))
+
+    with asyncx.EventLoopThread(
+        loop_factory=_CustomEventLoop,
+        on_loop_ready=on_loop_ready,
+    ) as thread:
+        assert isinstance(thread.loop, _CustomEventLoop)
+        assert ready == [(thread.loop, thread.ident)]
+        assert thread.loop.slow_callback_duration == 1.0
+        assert await thread.run_coroutine(_get_ident()) == thread.ident
+
+
+def test_event_loop_thread_loop_factory_error() -> None:
+    with pytest.raises(ValueError):
+        asyncx.EventLoopThread(
+            loop_policy=asyncio.get_event_loop_policy(),
+            loop_factory=asyncio.new_event_loop,
+        )
+
+    def on_loop_ready(loop: asyncio.AbstractEventLoop) -> None:
+        raise KeyError("on_loop_ready")
+
+    thread = asyncx.EventLoopThread(on_loop_ready=on_loop_ready)
+    with pytest.raises(KeyError):
+        thread.start()
+    thread.join()
+    with pytest.raises(RuntimeError):
+        thread.get_loop()
+    with pytest.raises(RuntimeError):
+        thread.start()
+
+
+def test_event_loop_thread_drain() -> None:
+    finalized: List[str] = []
+
+    async def agen() -> AsyncIterator[int]:
+        try:
+            yield 1
+            await asyncio.sleep(10)
+        finally:
+            finalized.append("agen")
+
+    async def use_agen() -> None:
+        g = agen()
+        await g.__anext__()
+        finalized.append("used")
+
+    async def stubborn() -> None:
+        try:
+            await asyncio.sleep(10)
+        finally:
+            # Cleanup that outlives cancel_timeout
+            await asyncio.shield(asyncio.sleep(1.0))
+
+    thread = asyncx.EventLoopThread(start=True)
+    loop = thread.loop
+    quick = thread.run_coroutine_concurrent(_sleep(0.01))
+    slow = thread.run_coroutine_concurrent(_sleep(10))
+    thread.run_coroutine_concurrent(stubborn())
+    thread.run_coroutine_concurrent(use_agen()).result()
+
+    result = thread.drain(timeout=0.1, cancel_timeout=0.1)
+    assert result == asyncx.ShutdownResult(completed=1, cancelled=1, leaked=1)
+    assert quick.result() is None
+    assert slow.cancelled()
+    assert finalized == ["used", "agen"]
+    assert not thread.is_alive()
+    assert loop.is_closed()
+
+    coro = _get_ident()
+    with pytest.raises(RuntimeError):
+        thread.run_coroutine_concurrent(coro)
+    coro.close()
+
+    assert thread.drain() == asyncx.ShutdownResult(0, 0, 0)
+
+
+def test_event_loop_thread_drain_wait_all() -> None:
+    thread = asyncx.EventLoopThread(start=True)
+    futures = [thread.run_coroutine_concurrent(_get_ident()) for _ in range(5)]
+    assert thread.drain() == asyncx.ShutdownResult(completed=5, cancelled=0, leaked=0)
+    assert all(f.result() == thread.ident for f in futures)
+
+
+def test_event_loop_thread_drain_concurrent() -> None:
+    thread = asyncx.EventLoopThread(start=True)
+    barrier = threading.Barrier(4)
+    futures: List[Optional[concurrent.futures.Future[asyncx.ShutdownResult]]] = []
+
+    def begin_drain() -> None:
+        barrier.wait()
+        futures.append(thread.begin_drain())
+
+    callers = [threading.Thread(target=begin_drain) for _ in range(4)]
+    for caller in callers:
+        caller.start()
+    for caller in callers:
+        caller.join()
+
+    started = [f for f in futures if f is not None]
+    assert len(started) == 1
+    assert started[0].result(timeout=1.0) == asyncx.ShutdownResult(0, 0, 0)
+    thread.join()
+
+
+@pytest.mark.asyncio
+async def test_event_loop_thread_drain_same_thread() -> None:
+    with asyncx.EventLoopThread() as thread:
+
+        async def drain() -> None:
+            thread.drain()
+
+        with pytest.raises(RuntimeError):
+            await thread.run_coroutine(drain())
+
+
+def test_event_loop_thread_shutdown_closes_loop() -> None:
+    thread = asyncx.EventLoopThread(start=True)
+    loop = thread.loop
+    thread.shutdown()
+    assert loop.is_closed()
+    thread.shutdown()
+
+
+def test_event_loop_thread_name() -> None:
+    with asyncx.EventLoopThread(name="asyncx-test") as thread:
+        assert thread.name == "asyncx-test"
+
+        async def get_name() -> str:
+            return threading.current_thread().name
+
+        assert thread.run_coroutine_concurrent(get_name()).result() == "asyncx-test"
+
+
+@pytest.mark.skipif(
+    not hasattr(os, "sched_getaffinity"), reason="CPU affinity is not supported"
+)
+def test_event_loop_thread_cpu_affinity() -> None:
+    cpu = min(os.sched_getaffinity(0))
+
+    async def get_affinity() -> Set[int]:
+        return os.sched_getaffinity(0)
+
+    with asyncx.EventLoopThread(cpu_affinity=[cpu, cpu]) as thread:
+        assert thread.cpu_affinity == (cpu,)
+        assert thread.run_coroutine_concurrent(get_affinity()).result() == {cpu}
+
+    # The affinity of the caller is not changed
+    assert len(os.sched_getaffinity(0)) >= 1
+
+    with pytest.raises(ValueError):
+        asyncx.EventLoopThread(cpu_affinity=[])
+
+
+@pytest.mark.parametrize("coalesce", [False, True])
+def test_run_coroutine_sync(coalesce: bool) -> None:
+    with asyncx.EventLoopThread(coalesce=coalesce) as thread:
+        assert thread.run_coroutine_sync(_get_ident()) == thread.ident
+        assert thread.run_coroutine_sync(_get_ident(), timeout=1.0) == thread.ident
+
+        async def fail() -> None:
+            raise ValueError("fail")
+
+        with pytest.raises(ValueError):
+            thread.run_coroutine_sync(fail())
+
+        cancelled: List[bool] = []
+
+        async def block() -> None:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        with pytest.raises(concurrent.futures.TimeoutError):
+            thread.run_coroutine_sync(block(), timeout=0.05)
+        time.sleep(0.05)
+        assert cancelled == [True]
+        assert thread.run_coroutine_sync(_count_tasks()) == 1
+
+        finished: List[bool] = []
+
+        async def work() -> None:
+            await asyncio.sleep(0.01)
+            finished.append(True)
+
+        with pytest.raises(concurrent.futures.TimeoutError):
+            thread.run_coroutine_sync(work(), timeout=-0.01)
+        time.sleep(0.05)
+        assert finished == []
+        assert thread.run_coroutine_sync(_count_tasks()) == 1
+
+        async def cancel_self() -> None:
+            task = asyncio.current_task()
+            assert task is not None
+            task.cancel()
+            await asyncio.sleep(0)
+
+        with pytest.raises(concurrent.futures.CancelledError):
+            thread.run_coroutine_sync(cancel_self())
+
+        async def call_from_loop() -> None:
+            coro = _get_ident()
+            try:
+                thread.run_coroutine_sync(coro)
+            finally:
+                coro.close()
+
+        with pytest.raises(RuntimeError):
+            thread.run_coroutine_sync(call_from_loop())
+
+    coro = _get_ident()
+    with pytest.raises(RuntimeError):
+        thread.run_coroutine_sync(coro)
+    coro.close()
+
+
+async def _count_tasks() -> int:
+    return len(asyncio.all_tasks())
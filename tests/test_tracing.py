@@ -0,0 +1,118 @@
+import asyncio
+import contextvars
+import threading
+from typing import Iterator, List
+
+import pytest
+
+import asyncx
+
+request_id: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "request_id", default=""
+)
+
+
+async def _get_request_id() -> str:
+    return request_id.get()
+
+
+@pytest.mark.asyncio
+async def test_context_propagation() -> None:
+    request_id.set("foo")
+    with asyncx.EventLoopThread() as thread:
+        assert await asyncx.dispatch_coroutine(_get_request_id(), thread.loop) == "foo"
+        assert await asyncx.dispatch(thread.get_loop)(_get_request_id)() == "foo"
+        assert (
+            await asyncx.dispatch(thread.get_loop, timeout=1.0)(_get_request_id)()
+            == "foo"
+        )
+        assert await thread.run_coroutine(_get_request_id()) == "foo"
+        assert thread.run_coroutine_sync(_get_request_id()) == "foo"
+    assert await asyncx.run_coroutine_in_thread(_get_request_id()) == "foo"
+
+    # Changes on the target loop do not leak back to the caller
+    async def set_request_id() -> None:
+        request_id.set("bar")
+
+    with asyncx.EventLoopThread() as thread:
+        await thread.run_coroutine(set_request_id())
+    assert request_id.get() == "foo"
+
+
+def test_context_propagation_coalesce() -> None:
+    def submit(thread: asyncx.EventLoopThread, value: str) -> List[str]:
+        request_id.set(value)
+        futures = [thread.run_coroutine_concurrent(_get_request_id())]
+        futures += thread.submit_many(_get_request_id() for _ in range(3))
+        return [f.result() for f in futures]
+
+    with asyncx.EventLoopThread(coalesce=True) as thread:
+        results: List[List[str]] = []
+        submitters = [
+            threading.Thread(target=lambda v=v: results.append(submit(thread, v)))
+            for v in ["a", "b", "c"]
+        ]
+        for t in submitters:
+            t.start()
+        for t in submitters:
+            t.join()
+
+    assert sorted(results) == [["a"] * 4, ["b"] * 4, ["c"] * 4]
+
+
+@pytest.fixture
+def timings() -> Iterator[List[asyncx.HopTiming]]:
+    ret: List[asyncx.HopTiming] = []
+    asyncx.set_hop_observer(ret.append)
+    try:
+        yield ret
+    finally:
+        asyncx.set_hop_observer(None)
+
+
+@pytest.mark.asyncio
+async def test_hop_observer(timings: List[asyncx.HopTiming]) -> None:
+    async def sleep() -> None:
+        await asyncio.sleep(0.02)
+
+    with asyncx.EventLoopThread() as thread:
+        await asyncx.dispatch_coroutine(sleep(), thread.loop)
+        await asyncx.dispatch(thread.loop, timeout=1.0)(sleep)()
+        await thread.run_coroutine(sleep())
+
+        # Hops to the same loop are not reported
+        await asyncx.dispatch_coroutine(sleep(), asyncio.get_running_loop())
+
+        # A hop that has not run is not reported. The loop is blocked so that the
+        # hop cannot start before it is cancelled
+        release = threading.Event()
+        thread.loop.call_soon_threadsafe(release.wait)
+        try:
+            future = thread.run_coroutine(sleep())
+            future.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await future
+        finally:
+            release.set()
+        await asyncio.sleep(0.01)
+
+    await asyncx.run_coroutine_in_thread(sleep())
+
+    assert len(timings) == 4
+    for timing in timings:
+        assert timing.name == "test_hop_observer.<locals>.sleep"
+        assert timing.execution_time >= 0.015
+        assert 0.0 <= timing.queue_delay < 0.1
+        assert 0.0 <= timing.handback_delay < 0.1
+
+
+@pytest.mark.asyncio
+async def test_hop_observer_failure(timings: List[asyncx.HopTiming]) -> None:
+    async def fail() -> None:
+        raise ValueError("fail")
+
+    with asyncx.EventLoopThread() as thread:
+        with pytest.raises(ValueError):
+            await asyncx.dispatch_coroutine(fail(), thread.loop)
+
+    assert len(timings) == 1